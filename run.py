@@ -5,14 +5,72 @@ import time
 import winsound
 import random
 
-from src.core import Kernel
-from src.ui import WindowManager
-from src.ai import ZobristHash, TranspositionTable, get_best_ai_move, calculate_material_advantage
-from src.chess import is_square_attacked, get_king_pos, is_move_valid, has_legal_moves
+from src.core import Kernel, FrameScheduler
+from src.ui import WindowManager, BoardView, board_layout
+from src.ai import SearchWorker, calculate_material_advantage, ROOK_HOME_SQUARES
+from src.chess import is_square_attacked, attacked_squares, get_king_pos, is_move_valid, has_legal_moves
 from src.config import load_settings, save_settings
 
 cursor = WindowManager()
 menu = WindowManager()
+board_view = BoardView()
+
+def apply_ai_move(ai_move, ai_color, all_pieces, all_pieces_map, has_moved, move_history, white_captured, black_captured):
+    ai_source, ai_dest, ai_char = ai_move[:3]
+    
+    captured_piece = None
+    is_en_passant = False
+    captured_pos = ai_dest
+    if ai_dest not in all_pieces_map and ai_char in ('♙', '♟') and ai_source[0] != ai_dest[0]:
+        captured_pos = (ai_dest[0], ai_source[1])
+        is_en_passant = True
+    if captured_pos in all_pieces_map:
+        captured_piece_char, captured_piece_color = all_pieces_map[captured_pos]
+        captured_piece = (captured_piece_char, captured_piece_color, captured_pos)
+        all_pieces[captured_piece_color][captured_piece_char].remove(captured_pos)
+        if captured_piece_color == 'white':
+            black_captured.append(captured_piece_char)
+        else:
+            white_captured.append(captured_piece_char)
+    
+    all_pieces[ai_color][ai_char].remove(ai_source)
+    all_pieces[ai_color][ai_char].append(ai_dest)
+    
+    is_castle = ai_char in ('♔', '♚') and abs(ai_source[0] - ai_dest[0]) == 2
+    if is_castle:
+        if ai_dest[0] > ai_source[0]:
+            rook_start_pos = (7, ai_source[1])
+            rook_end_pos = (5, ai_source[1])
+        else:
+            rook_start_pos = (0, ai_source[1])
+            rook_end_pos = (3, ai_source[1])
+        rook_char = '♖' if ai_color == 'white' else '♜'
+        all_pieces[ai_color][rook_char].remove(rook_start_pos)
+        all_pieces[ai_color][rook_char].append(rook_end_pos)
+    
+    if ai_char == '♔' and ai_source == (4, 7): has_moved['white_king'] = True
+    elif ai_char == '♚' and ai_source == (4, 0): has_moved['black_king'] = True
+    elif ai_char == '♖' and ai_source == (0, 7): has_moved['white_rook_a'] = True
+    elif ai_char == '♖' and ai_source == (7, 7): has_moved['white_rook_h'] = True
+    elif ai_char == '♜' and ai_source == (0, 0): has_moved['black_rook_a'] = True
+    elif ai_char == '♜' and ai_source == (7, 0): has_moved['black_rook_h'] = True
+    if ai_dest in ROOK_HOME_SQUARES: has_moved[ROOK_HOME_SQUARES[ai_dest]] = True
+    
+    move_record = {
+        'piece': (ai_char, ai_color, ai_source),
+        'target_pos': ai_dest,
+        'captured_piece': captured_piece,
+        'is_en_passant': is_en_passant,
+        'is_castle': is_castle
+    }
+    
+    if len(ai_move) > 3:
+        all_pieces[ai_color][ai_char].remove(ai_dest)
+        all_pieces[ai_color][ai_move[3]].append(ai_dest)
+        move_record['promotion'] = ai_move[3]
+    
+    move_history.append(move_record)
+    return captured_piece
 
 def main():
     MIN_COLS, MIN_ROWS = 80, 24
@@ -57,25 +115,27 @@ def main():
     is_in_check = {'white': False, 'black': False}
     current_turn = 'white'
     
-    zobrist_hash = ZobristHash()
-    transposition_table = TranspositionTable(size_mb=64)
-    
     settings = load_settings()
     colorblind_mode = settings.get('colorblind_mode', False)
     game_mode = settings.get('game_mode', 'pvp')
     ai_color = settings.get('ai_color', 'black')
+    ai_time_ms = settings.get('ai_time_ms', 1000)
+    ai_ponder = settings.get('ai_ponder', True)
+    ai_workers = settings.get('ai_workers', 1)
+    
+    search_worker = SearchWorker(tt_size_mb=64, workers=ai_workers)
+    ai_idle_turn = None
+    ai_error = None
 
     fps_selection = 1
     fps_options = [30, 60, 120, 240]
-    sleep_time = 1 / fps_options[fps_selection]
     
     initial_cols, initial_rows = columns, rows
     
-    ai_needs_first_move = (game_mode == 'vs_computer' and ai_color == 'white')
-    
     TICK_RATE = 60
     MS_PER_UPDATE = 1.0 / TICK_RATE
     lag = 0.0
+    scheduler = FrameScheduler(kernel, TICK_RATE, fps_options[fps_selection])
     previous_time = time.perf_counter()
     
     last_esc_press = 0
@@ -86,83 +146,82 @@ def main():
     TAKEBACK_COOLDOWN = 1.0
     last_cb_toggle = 0
     CB_COOLDOWN = 1.0
-    
-    game_started = False
 
     while True:
-        if not game_started and ai_needs_first_move and kernel.game_state == 'IN_GAME':
-            game_started = True
-            time.sleep(0.5)
-            
-            all_pieces_map = {}
-            for color, piece_set in all_pieces.items():
-                for char_key, positions in piece_set.items():
-                    for pos in positions:
-                        all_pieces_map[pos] = (char_key, color)
-            
-            ai_move = get_best_ai_move(all_pieces, all_pieces_map, 'white', is_in_check, zobrist_hash, transposition_table, has_moved, last_move, ai_color)
-            
-            if ai_move:
-                ai_source, ai_dest, ai_char = ai_move
-                captured_piece = None
-                if ai_dest in all_pieces_map:
-                    captured_piece_char, captured_piece_color = all_pieces_map[ai_dest]
-                    captured_piece = (captured_piece_char, captured_piece_color, ai_dest)
-                    all_pieces[captured_piece_color][captured_piece_char].remove(ai_dest)
-                    if captured_piece_color == 'white':
-                        black_captured.append(captured_piece_char)
+        input_event = scheduler.wait()
+        
+        if game_mode == 'vs_computer' and current_turn == ai_color:
+            if kernel.game_state != 'IN_GAME':
+                search_worker.cancel()
+            elif not search_worker.thinking and last_move['turn'] != ai_idle_turn:
+                search_worker.start_search(all_pieces, has_moved, last_move, is_in_check, ai_color, ai_time_ms)
+            else:
+                ai_done, ai_move = search_worker.poll()
+                if ai_done and not ai_move:
+                    ai_idle_turn = last_move['turn']
+                elif ai_done:
+                    all_pieces_map = {}
+                    for color, piece_set in all_pieces.items():
+                        for char_key, positions in piece_set.items():
+                            for pos in positions:
+                                all_pieces_map[pos] = (char_key, color)
+                    
+                    captured_piece = apply_ai_move(ai_move, ai_color, all_pieces, all_pieces_map, has_moved, move_history, white_captured, black_captured)
+                    last_move = {'piece': ai_move[2], 'start': ai_move[0], 'end': ai_move[1], 'turn': last_move['turn'] + 1}
+                    scheduler.invalidate()
+                    
+                    if captured_piece:
+                        winsound.Beep(1000, 100)
                     else:
-                        white_captured.append(captured_piece_char)
-                
-                all_pieces[ai_color][ai_char].remove(ai_source)
-                all_pieces[ai_color][ai_char].append(ai_dest)
-                
-                move_record = {
-                    'piece': (ai_char, ai_color, ai_source),
-                    'target_pos': ai_dest,
-                    'captured_piece': captured_piece,
-                    'is_en_passant': False,
-                    'is_castle': False
-                }
-                move_history.append(move_record)
-                last_move = {'piece': ai_char, 'start': ai_source, 'end': ai_dest, 'turn': 1}
-                
-                if captured_piece:
-                    winsound.Beep(1000, 100)
-                else:
-                    winsound.Beep(500, 100)
-                
-                all_pieces_map = {}
-                for color, piece_set in all_pieces.items():
-                    for char_key, positions in piece_set.items():
-                        for pos in positions:
-                            all_pieces_map[pos] = (char_key, color)
-                
-                is_in_check[ai_color] = False
-                player_color = 'black'
-                king_pos = get_king_pos(player_color, all_pieces_map)
-                if king_pos and is_square_attacked(king_pos, ai_color, all_pieces_map):
-                    is_in_check[player_color] = True
-                    if not has_legal_moves(player_color, all_pieces, all_pieces_map):
-                        kernel.game_state = 'IN_CHECKMATE'
-                        winsound.Beep(1500, 500)
+                        winsound.Beep(500, 100)
+                    
+                    all_pieces_map = {}
+                    for color, piece_set in all_pieces.items():
+                        for char_key, positions in piece_set.items():
+                            for pos in positions:
+                                all_pieces_map[pos] = (char_key, color)
+                    
+                    is_in_check[ai_color] = False
+                    player_color = 'white' if ai_color == 'black' else 'black'
+                    king_pos = get_king_pos(player_color, all_pieces_map)
+                    if king_pos and is_square_attacked(king_pos, ai_color, all_pieces_map):
+                        is_in_check[player_color] = True
+                        if not has_legal_moves(player_color, all_pieces, all_pieces_map, last_move):
+                            kernel.game_state = 'IN_CHECKMATE'
+                            winsound.Beep(1500, 500)
+                        else:
+                            winsound.Beep(1200, 200)
                     else:
-                        winsound.Beep(1200, 200)
-                else:
-                    is_in_check[player_color] = False
-                
-                current_turn = player_color
+                        is_in_check[player_color] = False
+                    
+                    current_turn = player_color
+                    if ai_ponder and kernel.game_state == 'IN_GAME':
+                        search_worker.start_ponder(all_pieces, has_moved, last_move, is_in_check, ai_color, ai_time_ms)
+        elif search_worker.pondering:
+            search_worker.poll()
+        
+        if search_worker.thinking != scheduler.busy:
+            scheduler.busy = search_worker.thinking
+            scheduler.invalidate()
+        if search_worker.last_error != ai_error:
+            ai_error = search_worker.last_error
+            scheduler.invalidate()
         
         current_time = time.perf_counter()
         elapsed = current_time - previous_time
         previous_time = current_time
         lag += elapsed
-
-        current_cols, current_rows = os.get_terminal_size()
-        if current_cols != initial_cols or current_rows != initial_rows:
-            kernel.clear_screen()
-            print("Terminal resized. Please restart the game with a stable window size.")
-            sys.exit(0)
+        if input_event:
+            lag = max(lag, MS_PER_UPDATE)
+        elif not scheduler.input_active(current_time):
+            lag = 0.0
+
+        if scheduler.resize_due():
+            current_cols, current_rows = os.get_terminal_size()
+            if current_cols != initial_cols or current_rows != initial_rows:
+                kernel.clear_screen()
+                print("Terminal resized. Please restart the game with a stable window size.")
+                sys.exit(0)
 
         while lag >= MS_PER_UPDATE:
             if kernel.game_state == 'IN_GAME':
@@ -205,14 +264,15 @@ def main():
                         if player_col == -1:
                             if (now - last_cb_toggle) > CB_COOLDOWN:
                                 colorblind_mode = not colorblind_mode
-                                save_settings(colorblind_mode, game_mode, ai_color)
+                                save_settings(colorblind_mode, game_mode, ai_color, ai_time_ms, ai_ponder, ai_workers)
                                 winsound.Beep(800, 100)
                                 last_cb_toggle = now
                         elif player_col == 8:
                            if move_history and (now - last_takeback_press) > TAKEBACK_COOLDOWN:
                                last_takeback_press = now
+                               search_worker.cancel()
                                
-                               moves_to_undo = 2 if game_mode == 'vs_computer' and len(move_history) >= 2 else 1
+                               moves_to_undo = 2 if game_mode == 'vs_computer' and current_turn != ai_color and len(move_history) >= 2 else 1
                                
                                for _ in range(moves_to_undo):
                                    if not move_history:
@@ -223,7 +283,10 @@ def main():
                                    piece_char, piece_color, original_pos = last_move_record['piece']
                                    moved_to_pos = last_move_record['target_pos']
                                    
-                                   all_pieces[piece_color][piece_char].remove(moved_to_pos)
+                                   if last_move_record.get('promotion'):
+                                       all_pieces[piece_color][last_move_record['promotion']].remove(moved_to_pos)
+                                   else:
+                                       all_pieces[piece_color][piece_char].remove(moved_to_pos)
                                    all_pieces[piece_color][piece_char].append(original_pos)
                                    
                                    if last_move_record['captured_piece']:
@@ -257,12 +320,7 @@ def main():
                                
                                winsound.Beep(600, 150)
                                
-                               if game_mode == 'vs_computer':
-                                   player_color = 'black' if ai_color == 'white' else 'white'
-                                   current_turn = player_color
-                               else:
-                                   if moves_to_undo % 2 == 1:
-                                       current_turn = 'black' if current_turn == 'white' else 'white'
+                               current_turn = 'white' if len(move_history) % 2 == 0 else 'black'
                                
                                all_pieces_map = {}
                                for color, piece_set in all_pieces.items():
@@ -321,6 +379,7 @@ def main():
                                         elif char == '♖' and source_pos == (7, 7): has_moved['white_rook_h'] = True
                                         elif char == '♜' and source_pos == (0, 0): has_moved['black_rook_a'] = True
                                         elif char == '♜' and source_pos == (7, 0): has_moved['black_rook_h'] = True
+                                        if dest_pos in ROOK_HOME_SQUARES: has_moved[ROOK_HOME_SQUARES[dest_pos]] = True
                                         
                                         all_pieces[color_name][char] = positions
                                         
@@ -377,7 +436,7 @@ def main():
                                         king_pos = get_king_pos(opponent_color, all_pieces_map)
                                         if king_pos and is_square_attacked(king_pos, color_name, all_pieces_map):
                                             is_in_check[opponent_color] = True
-                                            if not has_legal_moves(opponent_color, all_pieces, all_pieces_map):
+                                            if not has_legal_moves(opponent_color, all_pieces, all_pieces_map, last_move):
                                                 kernel.game_state = 'IN_CHECKMATE'
                                                 winsound.Beep(1500, 500)
                                             else:
@@ -387,69 +446,6 @@ def main():
                                         
                                         current_turn = 'black' if current_turn == 'white' else 'white'
                                         
-                                        if game_mode == 'vs_computer' and current_turn == ai_color and kernel.game_state == 'IN_GAME':
-                                            time.sleep(0.3)
-                                            
-                                            all_pieces_map = {}
-                                            for color, piece_set in all_pieces.items():
-                                                for char_key, positions in piece_set.items():
-                                                    for pos in positions:
-                                                        all_pieces_map[pos] = (char_key, color)
-                                            
-                                            ai_move = get_best_ai_move(all_pieces, all_pieces_map, current_turn, is_in_check, zobrist_hash, transposition_table, has_moved, last_move, ai_color)
-                                            
-                                            if ai_move:
-                                                ai_source, ai_dest, ai_char = ai_move
-                                                
-                                                captured_piece = None
-                                                if ai_dest in all_pieces_map:
-                                                    captured_piece_char, captured_piece_color = all_pieces_map[ai_dest]
-                                                    captured_piece = (captured_piece_char, captured_piece_color, ai_dest)
-                                                    all_pieces[captured_piece_color][captured_piece_char].remove(ai_dest)
-                                                    if captured_piece_color == 'white':
-                                                        black_captured.append(captured_piece_char)
-                                                    else:
-                                                        white_captured.append(captured_piece_char)
-                                                
-                                                all_pieces[ai_color][ai_char].remove(ai_source)
-                                                all_pieces[ai_color][ai_char].append(ai_dest)
-                                                
-                                                move_record = {
-                                                    'piece': (ai_char, ai_color, ai_source),
-                                                    'target_pos': ai_dest,
-                                                    'captured_piece': captured_piece,
-                                                    'is_en_passant': False,
-                                                    'is_castle': False
-                                                }
-                                                move_history.append(move_record)
-                                                last_move = {'piece': ai_char, 'start': ai_source, 'end': ai_dest, 'turn': last_move['turn'] + 1}
-                                                
-                                                if captured_piece:
-                                                    winsound.Beep(1000, 100)
-                                                else:
-                                                    winsound.Beep(500, 100)
-                                                
-                                                all_pieces_map = {}
-                                                for color, piece_set in all_pieces.items():
-                                                    for char_key, positions in piece_set.items():
-                                                        for pos in positions:
-                                                            all_pieces_map[pos] = (char_key, color)
-                                                
-                                                is_in_check[ai_color] = False
-                                                player_color = 'white' if ai_color == 'black' else 'black'
-                                                king_pos = get_king_pos(player_color, all_pieces_map)
-                                                if king_pos and is_square_attacked(king_pos, ai_color, all_pieces_map):
-                                                    is_in_check[player_color] = True
-                                                    if not has_legal_moves(player_color, all_pieces, all_pieces_map):
-                                                        kernel.game_state = 'IN_CHECKMATE'
-                                                        winsound.Beep(1500, 500)
-                                                    else:
-                                                        winsound.Beep(1200, 200)
-                                                else:
-                                                    is_in_check[player_color] = False
-                                                
-                                                current_turn = player_color
-                                        
                                         break
                                 if moved:
                                     break
@@ -472,7 +468,7 @@ def main():
                                     for pos in positions:
                                         all_pieces_map[pos] = (char, color)
                                         if (player_col, player_row) == pos:
-                                            if color == current_turn:
+                                            if color == current_turn and not (game_mode == 'vs_computer' and current_turn == ai_color):
                                                 selected_piece_char = char
                                                 selected_piece_color = color
                                             else:
@@ -557,30 +553,30 @@ def main():
                                             possible_moves.append((nx, ny))
                                             
                                 elif selected_piece_char in ('♔', '♚'):
+                                    opponent_color = 'black' if selected_piece_color == 'white' else 'white'
+                                    attacked = attacked_squares(opponent_color, all_pieces_map)
                                     directions = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
                                     for dx, dy in directions:
                                         nx, ny = col + dx, row + dy
                                         if 0 <= nx < 8 and 0 <= ny < 8:
-                                            opponent_color = 'black' if selected_piece_color == 'white' else 'white'
-                                            if not is_square_attacked((nx, ny), opponent_color, all_pieces_map):
+                                            if (nx, ny) not in attacked:
                                                 if (nx, ny) not in all_pieces_map or all_pieces_map[(nx, ny)][1] != selected_piece_color:
                                                     possible_moves.append((nx, ny))
                                     
-                                    opponent_color = 'black' if selected_piece_color == 'white' else 'white'
-                                    if not is_square_attacked((col, row), opponent_color, all_pieces_map):
+                                    if (col, row) not in attacked:
                                         if selected_piece_color == 'white' and not has_moved['white_king']:
                                             if not has_moved['white_rook_h'] and (5, 7) not in all_pieces_map and (6, 7) not in all_pieces_map:
-                                                if not is_square_attacked((5, 7), 'black', all_pieces_map) and not is_square_attacked((6, 7), 'black', all_pieces_map):
+                                                if (5, 7) not in attacked and (6, 7) not in attacked:
                                                     possible_moves.append((6, 7))
                                             if not has_moved['white_rook_a'] and (1, 7) not in all_pieces_map and (2, 7) not in all_pieces_map and (3, 7) not in all_pieces_map:
-                                                if not is_square_attacked((2, 7), 'black', all_pieces_map) and not is_square_attacked((3, 7), 'black', all_pieces_map):
+                                                if (2, 7) not in attacked and (3, 7) not in attacked:
                                                     possible_moves.append((2, 7))
                                         elif selected_piece_color == 'black' and not has_moved['black_king']:
                                             if not has_moved['black_rook_h'] and (5, 0) not in all_pieces_map and (6, 0) not in all_pieces_map:
-                                                if not is_square_attacked((5, 0), 'white', all_pieces_map) and not is_square_attacked((6, 0), 'white', all_pieces_map):
+                                                if (5, 0) not in attacked and (6, 0) not in attacked:
                                                     possible_moves.append((6, 0))
                                             if not has_moved['black_rook_a'] and (1, 0) not in all_pieces_map and (2, 0) not in all_pieces_map and (3, 0) not in all_pieces_map:
-                                                if not is_square_attacked((2, 0), 'white', all_pieces_map) and not is_square_attacked((3, 0), 'white', all_pieces_map):
+                                                if (2, 0) not in attacked and (3, 0) not in attacked:
                                                     possible_moves.append((2, 0))
                                 
                                 final_moves = []
@@ -632,7 +628,7 @@ def main():
                                 confirmation_action = 'EXIT'
                                 confirmation_selection = 1
                         elif kernel.game_state == 'IN_FPS_MENU':
-                            sleep_time = 1 / fps_options[fps_selection]
+                            scheduler.set_fps(fps_options[fps_selection])
                             kernel.game_state = 'IN_MENU'
                         elif kernel.game_state == 'IN_GAMEMODE_MENU':
                             old_game_mode = game_mode
@@ -641,7 +637,7 @@ def main():
                             if game_mode == 'vs_computer' and gamemode_selection == 1:
                                 kernel.game_state = 'IN_AI_COLOR_MENU'
                             else:
-                                save_settings(colorblind_mode, game_mode, ai_color)
+                                save_settings(colorblind_mode, game_mode, ai_color, ai_time_ms, ai_ponder, ai_workers)
                                 
                                 if old_game_mode != game_mode:
                                     kernel.game_state = 'IN_CONFIRMATION'
@@ -652,7 +648,7 @@ def main():
                         elif kernel.game_state == 'IN_AI_COLOR_MENU':
                             old_ai_color = ai_color
                             ai_color = 'black' if ai_color_selection == 0 else 'white'
-                            save_settings(colorblind_mode, game_mode, ai_color)
+                            save_settings(colorblind_mode, game_mode, ai_color, ai_time_ms, ai_ponder, ai_workers)
                             
                             kernel.game_state = 'IN_CONFIRMATION'
                             confirmation_action = 'RESTART_MODE_CHANGE'
@@ -663,6 +659,7 @@ def main():
                             pawn_char = '♙' if color_name == 'white' else '♟'
                             all_pieces[color_name][pawn_char].remove(promotion_pos)
                             all_pieces[color_name][new_piece_char].append(promotion_pos)
+                            move_history[-1]['promotion'] = new_piece_char
                             kernel.game_state = 'IN_GAME'
                         elif kernel.game_state == 'IN_CONFIRMATION':
                             if confirmation_selection == 0:
@@ -686,9 +683,8 @@ def main():
                                     move_history = []
                                     white_captured = []
                                     black_captured = []
-                                    transposition_table.clear()
-                                    ai_needs_first_move = (game_mode == 'vs_computer' and ai_color == 'white')
-                                    game_started = False
+                                    search_worker.clear_table()
+                                    ai_idle_turn = None
                                     kernel.game_state = 'IN_GAME'
                                     
                                 elif confirmation_action == 'RESTART_MODE_CHANGE':
@@ -711,9 +707,8 @@ def main():
                                    move_history = []
                                    white_captured = []
                                    black_captured = []
-                                   transposition_table.clear()
-                                   ai_needs_first_move = (game_mode == 'vs_computer' and ai_color == 'white')
-                                   game_started = False
+                                   search_worker.clear_table()
+                                   ai_idle_turn = None
                                    kernel.game_state = 'IN_GAME'
                                 elif confirmation_action == 'EXIT':
                                     sys.exit(0)
@@ -735,7 +730,13 @@ def main():
                                 all_pieces = {'white': white_pieces, 'black': black_pieces}
                                 has_moved = {'white_king': False, 'black_king': False, 'white_rook_a': False, 'white_rook_h': False, 'black_rook_a': False, 'black_rook_h': False}
                                 is_in_check = {'white': False, 'black': False}
-                                transposition_table.clear()
+                                current_turn = 'white'
+                                last_move = {'piece': None, 'start': None, 'end': None, 'turn': 0}
+                                move_history = []
+                                white_captured = []
+                                black_captured = []
+                                search_worker.clear_table()
+                                ai_idle_turn = None
                                 kernel.game_state = 'IN_GAME'
                             else:
                                 sys.exit(0)
@@ -769,24 +770,19 @@ def main():
 
             lag -= MS_PER_UPDATE
 
-        cursor.clear_buffers(kernel)
-        
         all_pieces_map = {}
         for color, piece_set in all_pieces.items():
             for char, positions in piece_set.items():
                 for pos in positions:
                     all_pieces_map[pos] = (char, color)
 
+        if not scheduler.frame_due():
+            continue
+
         grid_w, grid_h = 8, 8
-        
-        box_h = kernel.height // grid_h
-        box_w = box_h * 2
-        
+        box_w, box_h, start_x, start_y = board_layout(kernel.width, kernel.height)
         total_grid_w = grid_w * box_w
         total_grid_h = grid_h * box_h
-        
-        start_x = (kernel.width - total_grid_w) // 2
-        start_y = (kernel.height - total_grid_h) // 2
 
         if colorblind_mode:
             white = 0x00F0
@@ -810,64 +806,8 @@ def main():
         player_x = start_x + player_col * box_w + box_w / 2
         player_y = start_y + player_row * box_h + box_h / 2
     
-        for row in range(grid_h):
-            for col in range(grid_w):
-                color = white if (row + col) % 2 == 0 else grey
-                
-                king_in_check_square = False
-                if is_in_check['white'] and (col, row) == get_king_pos('white', all_pieces_map):
-                    color = red
-                    king_in_check_square = True
-                elif is_in_check['black'] and (col, row) == get_king_pos('black', all_pieces_map):
-                    color = red
-                    king_in_check_square = True
-                
-                if not king_in_check_square:
-                    if row == player_row and col == player_col:
-                        color = cursor_highlight
-                    elif (col, row) in marked_cells:
-                        color = dark_green
-                    elif (col, row) in possible_moves:
-                        color = light_yellow
-    
-    
-                draw_x = start_x + col * box_w
-                draw_y = start_y + row * box_h
-    
-                if (col, row) in possible_moves:
-                    cursor.draw_bordered_box(kernel, draw_x, draw_y, box_w, box_h, light_yellow, color, color)
-                elif (col, row) in marked_cells:
-                    cursor.draw_bordered_box(kernel, draw_x, draw_y, box_w, box_h, dark_green, color, color)
-                else:
-                    cursor.draw_filled_box(kernel, draw_x, draw_y, box_w, box_h, color, color)
-    
-        for color, piece_set in all_pieces.items():
-            for char, positions in piece_set.items():
-                for col, row in positions:
-                    draw_x = start_x + col * box_w + (box_w - 1) // 2
-                    draw_y = start_y + row * box_h + (box_h - 1) // 2
-    
-                    square_color = white if (row + col) % 2 == 0 else grey
-                    
-                    if is_in_check['white'] and (col, row) == get_king_pos('white', all_pieces_map):
-                        square_color = red
-                    elif is_in_check['black'] and (col, row) == get_king_pos('black', all_pieces_map):
-                        square_color = red
-                    elif row == player_row and col == player_col:
-                        square_color = cursor_highlight
-                    elif (col, row) in marked_cells:
-                        square_color = dark_green
-                    elif (col, row) in possible_moves:
-                        square_color = light_yellow
-                    
-                    if color == 'white':
-                        piece_color = square_color
-                    else:
-                        piece_color = 0x0000
-                        if square_color != (white if (row + col) % 2 == 0 else grey):
-                           piece_color = square_color
-    
-                    cursor.draw_text(kernel, draw_x, draw_y, char, piece_color, 0, transparent_bg=True)
+        checked_kings = [get_king_pos(color, all_pieces_map) for color in ('white', 'black') if is_in_check[color]]
+        board_view.draw(kernel, all_pieces_map, (player_col, player_row), marked_cells, possible_moves, checked_kings, (white, grey, dark_green, light_yellow, red, cursor_highlight))
     
         if player_col == -1:
             cb_button_color = cursor_highlight
@@ -913,6 +853,11 @@ def main():
         text_width = len(turn_text)
         text_x = (kernel.width - text_width) // 2
         cursor.draw_text(kernel, text_x, 1, turn_text, white, 0, transparent_bg=True)
+        status_text = "Thinking…" if search_worker.thinking else ""
+        if ai_error:
+            status_text = f"{status_text} {ai_error}".strip()
+        if status_text:
+            cursor.draw_text(kernel, (kernel.width - len(status_text)) // 2, 2, status_text, white, 0, transparent_bg=True)
         box_width = 20
         box_height = 3
         cursor.draw_filled_box(kernel, 1, 1, box_width, box_height, grey, grey)
@@ -964,7 +909,6 @@ def main():
             menu.draw_menu(kernel, checkmate_options, menu_selection, title=f"Checkmate! {winner} wins.")
             
         kernel.draw_buffer()
-        time.sleep(sleep_time)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
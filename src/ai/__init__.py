@@ -1,14 +1,23 @@
 from .zobrist import ZobristHash
+from .board import Board, ROOK_HOME_SQUARES
+from .bitboard import BitBoard
 from .transposition_table import TranspositionTable, TT_EXACT, TT_LOWER, TT_UPPER
 from .engine import get_best_ai_move
+from .worker import SearchWorker
+from .opening_book import OpeningBook
 from .evaluation import calculate_material_advantage
 
 __all__ = [
     'ZobristHash',
+    'Board',
+    'ROOK_HOME_SQUARES',
+    'BitBoard',
     'TranspositionTable',
     'TT_EXACT',
     'TT_LOWER',
     'TT_UPPER',
     'get_best_ai_move',
+    'SearchWorker',
+    'OpeningBook',
     'calculate_material_advantage'
 ]
\ No newline at end of file
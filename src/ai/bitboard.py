@@ -0,0 +1,574 @@
+from .zobrist import PIECES, CASTLING_RIGHTS
+from .evaluation import tapered_score, MIDGAME_SCORES, ENDGAME_SCORES, PHASE_WEIGHTS, MATERIAL_VALUES
+from .see import SEE_VALUES
+
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = 0, 1, 2, 3, 4, 5
+COLOR_NAMES = ('white', 'black')
+
+PIECE_INDEX = {piece: index for index, piece in enumerate(PIECES)}
+PIECE_VALUES = [1, 1, 3, 3, 3, 3, 5, 5, 9, 9, 0, 0]
+SQUARES = [(square % 8, square // 8) for square in range(64)]
+
+KING_RIGHT = [CASTLING_RIGHTS.index('white_king'), CASTLING_RIGHTS.index('black_king')]
+ROOK_RIGHTS = {
+    63: CASTLING_RIGHTS.index('white_rook_h'), 56: CASTLING_RIGHTS.index('white_rook_a'),
+    7: CASTLING_RIGHTS.index('black_rook_h'), 0: CASTLING_RIGHTS.index('black_rook_a')
+}
+
+def _on_board(col, row):
+    return 0 <= col < 8 and 0 <= row < 8
+
+def _step_table(offsets):
+    table = []
+    for square in range(64):
+        col, row = square % 8, square // 8
+        targets = 0
+        for dx, dy in offsets:
+            if _on_board(col + dx, row + dy):
+                targets |= 1 << ((row + dy) * 8 + col + dx)
+        table.append(targets)
+    return table
+
+KNIGHT_ATTACKS = _step_table([(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)])
+KING_ATTACKS = _step_table([(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)])
+PAWN_ATTACKS = [_step_table([(-1, -1), (1, -1)]), _step_table([(-1, 1), (1, 1)])]
+
+ROOK_DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+BISHOP_DIRECTIONS = [(1, 1), (-1, 1), (-1, -1), (1, -1)]
+
+def _ray_table(dx, dy):
+    table = []
+    for square in range(64):
+        col, row = square % 8, square // 8
+        ray = 0
+        for i in range(1, 8):
+            if not _on_board(col + dx * i, row + dy * i):
+                break
+            ray |= 1 << ((row + dy * i) * 8 + col + dx * i)
+        table.append(ray)
+    return table
+
+RAYS = {direction: _ray_table(*direction) for direction in ROOK_DIRECTIONS + BISHOP_DIRECTIONS}
+ROOK_RAYS = [(RAYS[d], d[1] > 0 or (d[1] == 0 and d[0] > 0)) for d in ROOK_DIRECTIONS]
+BISHOP_RAYS = [(RAYS[d], d[1] > 0 or (d[1] == 0 and d[0] > 0)) for d in BISHOP_DIRECTIONS]
+QUEEN_LINES = [0] * 64
+for _direction, _table in RAYS.items():
+    for _square in range(64):
+        QUEEN_LINES[_square] |= _table[_square]
+
+def sliding_attacks(square, occupancy, rays):
+    attacks = 0
+    for table, positive in rays:
+        ray = table[square]
+        blockers = ray & occupancy
+        if blockers:
+            if positive:
+                blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                blocker = blockers.bit_length() - 1
+            ray ^= table[blocker]
+        attacks |= ray
+    return attacks
+
+class BitBoard:
+    def __init__(self, all_pieces, side_to_move, has_moved, last_move, zobrist_hash):
+        self.bitboards = [0] * 12
+        self.occupancy = [0, 0]
+        self.squares = [-1] * 64
+        for color, piece_set in all_pieces.items():
+            color_index = COLOR_NAMES.index(color)
+            for piece_char, positions in piece_set.items():
+                piece = PIECE_INDEX[piece_char]
+                for col, row in positions:
+                    square = row * 8 + col
+                    self.bitboards[piece] |= 1 << square
+                    self.occupancy[color_index] |= 1 << square
+                    self.squares[square] = piece
+        
+        self.side = COLOR_NAMES.index(side_to_move)
+        self.rights = 0
+        for index, key in enumerate(CASTLING_RIGHTS):
+            if not has_moved.get(key, True):
+                self.rights |= 1 << index
+        
+        self.ep_square = -1
+        if last_move and last_move.get('piece') in ('♙', '♟'):
+            start = last_move.get('start')
+            end = last_move.get('end')
+            if start and end and abs(start[1] - end[1]) == 2:
+                self.ep_square = (start[1] + end[1]) // 2 * 8 + end[0]
+        
+        self.zobrist_hash = zobrist_hash
+        self.hash = self.compute_hash()
+        self.midgame, self.endgame, self.phase = self.score_pieces()
+        self.history = []
+    
+    @property
+    def side_to_move(self):
+        return COLOR_NAMES[self.side]
+    
+    def compute_hash(self):
+        zobrist = self.zobrist_hash
+        hash_value = 0
+        for square, piece in enumerate(self.squares):
+            if piece >= 0:
+                hash_value ^= zobrist.piece_keys[piece * 64 + square]
+        if self.side == BLACK:
+            hash_value ^= zobrist.side_key
+        for index in range(len(CASTLING_RIGHTS)):
+            if self.rights >> index & 1:
+                hash_value ^= zobrist.castling_keys[index]
+        if self.ep_square >= 0:
+            hash_value ^= zobrist.en_passant_keys[self.ep_square % 8]
+        return hash_value
+    
+    def is_square_attacked(self, square, by_color, occupancy=None, removed=0):
+        bitboards = self.bitboards
+        if occupancy is None:
+            occupancy = self.occupancy[0] | self.occupancy[1]
+        if KNIGHT_ATTACKS[square] & bitboards[KNIGHT * 2 + by_color] & ~removed:
+            return True
+        if PAWN_ATTACKS[1 - by_color][square] & bitboards[PAWN * 2 + by_color] & ~removed:
+            return True
+        if KING_ATTACKS[square] & bitboards[KING * 2 + by_color]:
+            return True
+        queens = bitboards[QUEEN * 2 + by_color]
+        diagonal = (bitboards[BISHOP * 2 + by_color] | queens) & ~removed
+        if diagonal and sliding_attacks(square, occupancy, BISHOP_RAYS) & diagonal:
+            return True
+        straight = (bitboards[ROOK * 2 + by_color] | queens) & ~removed
+        if straight and sliding_attacks(square, occupancy, ROOK_RAYS) & straight:
+            return True
+        return False
+    
+    def in_check(self):
+        king = self.bitboards[KING * 2 + self.side]
+        return bool(king) and self.is_square_attacked(king.bit_length() - 1, 1 - self.side)
+    
+    def has_non_pawn_material(self):
+        bitboards = self.bitboards
+        side = self.side
+        return bool(bitboards[KNIGHT * 2 + side] | bitboards[BISHOP * 2 + side] | bitboards[ROOK * 2 + side] | bitboards[QUEEN * 2 + side])
+    
+    def _leaves_king_safe(self, source, target, piece, removed=0):
+        side = piece & 1
+        occupancy = self.occupancy[0] | self.occupancy[1]
+        target_bit = 1 << target
+        new_occupancy = ((occupancy ^ (1 << source)) | target_bit) & ~removed
+        if piece >> 1 == KING:
+            king_square = target
+        else:
+            king_square = self.bitboards[KING * 2 + side].bit_length() - 1
+        return not self.is_square_attacked(king_square, 1 - side, new_occupancy, target_bit | removed)
+    
+    def piece_count(self):
+        return (self.occupancy[0] | self.occupancy[1]).bit_count()
+    
+    def piece_list(self):
+        pieces, squares = [], []
+        for square, piece in enumerate(self.squares):
+            if piece >= 0:
+                pieces.append(piece)
+                squares.append(square)
+        return pieces, squares
+    
+    def is_capture(self, move):
+        target = move[1][1] * 8 + move[1][0]
+        return self.squares[target] >= 0 or (move[2] in ('♙', '♟') and move[0][0] != move[1][0])
+    
+    def capture_value(self, move):
+        captured = self.squares[move[1][1] * 8 + move[1][0]]
+        return MATERIAL_VALUES[captured >> 1] if captured >= 0 else MATERIAL_VALUES[PAWN]
+    
+    def attackers_to(self, square, occupancy):
+        bitboards = self.bitboards
+        diagonal = bitboards[BISHOP * 2] | bitboards[BISHOP * 2 + 1] | bitboards[QUEEN * 2] | bitboards[QUEEN * 2 + 1]
+        straight = bitboards[ROOK * 2] | bitboards[ROOK * 2 + 1] | bitboards[QUEEN * 2] | bitboards[QUEEN * 2 + 1]
+        attackers = (PAWN_ATTACKS[BLACK][square] & bitboards[PAWN * 2 + WHITE]) | (PAWN_ATTACKS[WHITE][square] & bitboards[PAWN * 2 + BLACK])
+        attackers |= KNIGHT_ATTACKS[square] & (bitboards[KNIGHT * 2] | bitboards[KNIGHT * 2 + 1])
+        attackers |= KING_ATTACKS[square] & (bitboards[KING * 2] | bitboards[KING * 2 + 1])
+        attackers |= sliding_attacks(square, occupancy, BISHOP_RAYS) & diagonal
+        attackers |= sliding_attacks(square, occupancy, ROOK_RAYS) & straight
+        return attackers & occupancy
+    
+    def see(self, move):
+        source = move[0][1] * 8 + move[0][0]
+        target = move[1][1] * 8 + move[1][0]
+        piece = self.squares[source]
+        occupancy = (self.occupancy[0] | self.occupancy[1]) ^ (1 << source)
+        captured = self.squares[target]
+        if captured >= 0:
+            gain = [SEE_VALUES[captured >> 1]]
+        elif piece >> 1 == PAWN and target == self.ep_square:
+            gain = [SEE_VALUES[PAWN]]
+            occupancy ^= 1 << (target + (8 if piece & 1 == WHITE else -8))
+        else:
+            gain = [0]
+        
+        attacker_value = SEE_VALUES[piece >> 1]
+        if len(move) > 3:
+            attacker_value = SEE_VALUES[PIECE_INDEX[move[3]] >> 1]
+            gain[0] += attacker_value - SEE_VALUES[PAWN]
+        
+        bitboards = self.bitboards
+        side = 1 - (piece & 1)
+        while True:
+            attackers = self.attackers_to(target, occupancy)
+            for piece_type in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING):
+                candidates = attackers & bitboards[piece_type * 2 + side]
+                if candidates:
+                    break
+            else:
+                break
+            if piece_type == KING and self.attackers_to(target, occupancy ^ candidates) & self.occupancy[1 - side]:
+                break
+            gain.append(attacker_value - gain[-1])
+            occupancy ^= candidates & -candidates
+            attacker_value = SEE_VALUES[piece_type]
+            side = 1 - side
+        
+        for index in range(len(gain) - 1, 0, -1):
+            gain[index - 1] = -max(-gain[index - 1], gain[index])
+        return gain[0]
+    
+    def is_legal(self, move):
+        source = move[0][1] * 8 + move[0][0]
+        target = move[1][1] * 8 + move[1][0]
+        side = self.side
+        piece = PIECE_INDEX.get(move[2], -1)
+        if piece < 0 or piece & 1 != side or self.squares[source] != piece:
+            return False
+        captured = self.squares[target]
+        if captured >= 0 and captured & 1 == side:
+            return False
+        
+        piece_type = piece >> 1
+        occupancy = self.occupancy[0] | self.occupancy[1]
+        removed = 0
+        if piece_type == PAWN:
+            forward = -8 if side == WHITE else 8
+            if (target // 8 in (0, 7)) != (len(move) > 3):
+                return False
+            if len(move) > 3 and PIECE_INDEX.get(move[3], -1) not in (QUEEN * 2 + side, ROOK * 2 + side, BISHOP * 2 + side, KNIGHT * 2 + side):
+                return False
+            if target == source + forward:
+                if captured >= 0:
+                    return False
+            elif target == source + 2 * forward:
+                if source // 8 != (6 if side == WHITE else 1) or captured >= 0 or (occupancy >> (source + forward)) & 1:
+                    return False
+            elif PAWN_ATTACKS[side][source] >> target & 1:
+                if captured < 0:
+                    if target != self.ep_square:
+                        return False
+                    removed = 1 << (target - forward)
+            else:
+                return False
+        elif len(move) > 3:
+            return False
+        elif piece_type == KNIGHT:
+            if not KNIGHT_ATTACKS[source] >> target & 1:
+                return False
+        elif piece_type == BISHOP:
+            if not sliding_attacks(source, occupancy, BISHOP_RAYS) >> target & 1:
+                return False
+        elif piece_type == ROOK:
+            if not sliding_attacks(source, occupancy, ROOK_RAYS) >> target & 1:
+                return False
+        elif piece_type == QUEEN:
+            if not (sliding_attacks(source, occupancy, BISHOP_RAYS) | sliding_attacks(source, occupancy, ROOK_RAYS)) >> target & 1:
+                return False
+        elif abs(target - source) == 2:
+            castling = []
+            if not self.in_check():
+                self._add_castling_moves(castling, occupancy)
+            return any(castle[1] == move[1] for castle in castling)
+        elif not KING_ATTACKS[source] >> target & 1:
+            return False
+        
+        return self._leaves_king_safe(source, target, piece, removed)
+    
+    def _generate(self, captures, quiets):
+        side = self.side
+        enemy = 1 - side
+        bitboards = self.bitboards
+        squares = self.squares
+        other = self.occupancy[enemy]
+        occupancy = self.occupancy[side] | other
+        king = bitboards[KING * 2 + side]
+        king_square = king.bit_length() - 1
+        checked = king_square >= 0 and self.is_square_attacked(king_square, enemy, occupancy)
+        king_lines = QUEEN_LINES[king_square] if king_square >= 0 else 0
+        staged = not (captures and quiets)
+        moves = []
+        
+        def is_legal(source, target, piece, removed=0):
+            source_bit = 1 << source
+            target_bit = 1 << target
+            if piece == KING * 2 + side:
+                new_occupancy = (occupancy ^ source_bit) | target_bit
+                return not self.is_square_attacked(target, enemy, new_occupancy, target_bit)
+            if checked or removed or king_lines & source_bit:
+                new_occupancy = ((occupancy ^ source_bit) | target_bit) & ~removed
+                return not self.is_square_attacked(king_square, enemy, new_occupancy, target_bit | removed)
+            return True
+        
+        pawn = PAWN * 2 + side
+        forward = -8 if side == WHITE else 8
+        start_rank = 6 if side == WHITE else 1
+        promotion_rank = 0 if side == WHITE else 7
+        promotions = [QUEEN * 2 + side, ROOK * 2 + side, BISHOP * 2 + side, KNIGHT * 2 + side]
+        
+        pawns = bitboards[pawn]
+        while pawns:
+            low = pawns & -pawns
+            source = low.bit_length() - 1
+            pawns ^= low
+            target_row = source // 8 + forward // 8
+            
+            targets = PAWN_ATTACKS[side][source] & other
+            while targets:
+                target_bit = targets & -targets
+                target = target_bit.bit_length() - 1
+                targets ^= target_bit
+                if target_row == promotion_rank:
+                    choices = promotions if not staged else promotions[:1] if captures else promotions[1:]
+                    if not is_legal(source, target, pawn):
+                        continue
+                    victim = PIECE_VALUES[squares[target]]
+                    for promotion in choices:
+                        score = (victim + 8) * 10 - 1 if staged else (victim + PIECE_VALUES[promotion]) * 10
+                        moves.append((SQUARES[source], SQUARES[target], PIECES[pawn], PIECES[promotion], score))
+                elif captures and is_legal(source, target, pawn):
+                    victim = PIECE_VALUES[squares[target]]
+                    moves.append((SQUARES[source], SQUARES[target], PIECES[pawn], victim * 10 - 1 if staged else victim * 10))
+            
+            if captures and self.ep_square >= 0 and PAWN_ATTACKS[side][source] & (1 << self.ep_square):
+                if is_legal(source, self.ep_square, pawn, 1 << (self.ep_square - forward)):
+                    moves.append((SQUARES[source], SQUARES[self.ep_square], PIECES[pawn], 9 if staged else 10))
+            
+            target = source + forward
+            if (occupancy >> target) & 1:
+                continue
+            if target_row == promotion_rank:
+                choices = promotions if not staged else promotions[:1] if captures else promotions[1:]
+                if is_legal(source, target, pawn):
+                    for promotion in choices:
+                        score = 8 * 10 - 1 if staged and captures else PIECE_VALUES[promotion] * 10
+                        moves.append((SQUARES[source], SQUARES[target], PIECES[pawn], PIECES[promotion], score))
+                continue
+            if not quiets:
+                continue
+            if is_legal(source, target, pawn):
+                moves.append((SQUARES[source], SQUARES[target], PIECES[pawn], 0))
+            double = target + forward
+            if source // 8 == start_rank and not (occupancy >> double) & 1 and is_legal(source, double, pawn):
+                moves.append((SQUARES[source], SQUARES[double], PIECES[pawn], 0))
+        
+        for piece_type in (KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            piece = piece_type * 2 + side
+            attacker_value = PIECE_VALUES[piece] if staged else 0
+            pieces = bitboards[piece]
+            while pieces:
+                low = pieces & -pieces
+                source = low.bit_length() - 1
+                pieces ^= low
+                if piece_type == KNIGHT:
+                    attacks = KNIGHT_ATTACKS[source]
+                elif piece_type == BISHOP:
+                    attacks = sliding_attacks(source, occupancy, BISHOP_RAYS)
+                elif piece_type == ROOK:
+                    attacks = sliding_attacks(source, occupancy, ROOK_RAYS)
+                elif piece_type == QUEEN:
+                    attacks = sliding_attacks(source, occupancy, BISHOP_RAYS) | sliding_attacks(source, occupancy, ROOK_RAYS)
+                else:
+                    attacks = KING_ATTACKS[source]
+                
+                targets = attacks & other if captures else 0
+                while targets:
+                    target_bit = targets & -targets
+                    target = target_bit.bit_length() - 1
+                    targets ^= target_bit
+                    if is_legal(source, target, piece):
+                        moves.append((SQUARES[source], SQUARES[target], PIECES[piece], PIECE_VALUES[squares[target]] * 10 - attacker_value))
+                
+                targets = attacks & ~occupancy if quiets else 0
+                while targets:
+                    target_bit = targets & -targets
+                    target = target_bit.bit_length() - 1
+                    targets ^= target_bit
+                    if is_legal(source, target, piece):
+                        moves.append((SQUARES[source], SQUARES[target], PIECES[piece], 0))
+        
+        if quiets and not checked:
+            self._add_castling_moves(moves, occupancy)
+        
+        moves.sort(key=lambda move: move[-1], reverse=True)
+        return [move[:-1] for move in moves]
+    
+    def _add_castling_moves(self, moves, occupancy):
+        side = self.side
+        enemy = 1 - side
+        home = 60 if side == WHITE else 4
+        king_char = PIECES[KING * 2 + side]
+        rook = ROOK * 2 + side
+        if not self.rights >> KING_RIGHT[side] & 1 or self.squares[home] != KING * 2 + side:
+            return
+        rook_h = ROOK_RIGHTS[home + 3]
+        if self.rights >> rook_h & 1 and self.squares[home + 3] == rook:
+            if not occupancy & (0b11 << (home + 1)):
+                if not self.is_square_attacked(home + 1, enemy, occupancy) and not self.is_square_attacked(home + 2, enemy, occupancy):
+                    moves.append((SQUARES[home], SQUARES[home + 2], king_char, 1))
+        rook_a = ROOK_RIGHTS[home - 4]
+        if self.rights >> rook_a & 1 and self.squares[home - 4] == rook:
+            if not occupancy & (0b111 << (home - 3)):
+                if not self.is_square_attacked(home - 1, enemy, occupancy) and not self.is_square_attacked(home - 2, enemy, occupancy):
+                    moves.append((SQUARES[home], SQUARES[home - 2], king_char, 1))
+    
+    def generate_moves(self):
+        return self._generate(True, True)
+    
+    def generate_captures(self):
+        return self._generate(True, False)
+    
+    def generate_quiets(self):
+        return self._generate(False, True)
+    
+    def score_pieces(self):
+        midgame = endgame = phase = 0
+        for square, piece in enumerate(self.squares):
+            if piece >= 0:
+                midgame += MIDGAME_SCORES[piece * 64 + square]
+                endgame += ENDGAME_SCORES[piece * 64 + square]
+                phase += PHASE_WEIGHTS[piece >> 1]
+        return midgame, endgame, phase
+    
+    def evaluate(self, is_in_check):
+        return tapered_score(self.midgame, self.endgame, self.phase, is_in_check)
+    
+    def evaluate_full(self, is_in_check):
+        return tapered_score(*self.score_pieces(), is_in_check)
+    
+    def _move_piece(self, piece, source, target):
+        bit = (1 << source) | (1 << target)
+        self.bitboards[piece] ^= bit
+        self.occupancy[piece & 1] ^= bit
+        self.squares[source] = -1
+        self.squares[target] = piece
+    
+    def make_move(self, move):
+        pos, dest = move[0], move[1]
+        source = pos[1] * 8 + pos[0]
+        target = dest[1] * 8 + dest[0]
+        side = self.side
+        piece = self.squares[source]
+        zobrist = self.zobrist_hash
+        keys = zobrist.piece_keys
+        hash_value = self.hash
+        
+        captured_square = target
+        if piece >> 1 == PAWN and target == self.ep_square:
+            captured_square = target + (8 if side == WHITE else -8)
+        captured = self.squares[captured_square]
+        
+        self.history.append((source, target, piece, captured, captured_square, self.rights, self.ep_square, hash_value, self.midgame, self.endgame, self.phase))
+        
+        if captured >= 0:
+            bit = 1 << captured_square
+            self.bitboards[captured] ^= bit
+            self.occupancy[captured & 1] ^= bit
+            self.squares[captured_square] = -1
+            hash_value ^= keys[captured * 64 + captured_square]
+            self.midgame -= MIDGAME_SCORES[captured * 64 + captured_square]
+            self.endgame -= ENDGAME_SCORES[captured * 64 + captured_square]
+            self.phase -= PHASE_WEIGHTS[captured >> 1]
+        
+        self._move_piece(piece, source, target)
+        hash_value ^= keys[piece * 64 + source] ^ keys[piece * 64 + target]
+        self.midgame += MIDGAME_SCORES[piece * 64 + target] - MIDGAME_SCORES[piece * 64 + source]
+        self.endgame += ENDGAME_SCORES[piece * 64 + target] - ENDGAME_SCORES[piece * 64 + source]
+        
+        if len(move) > 3:
+            promoted = PIECE_INDEX[move[3]]
+            bit = 1 << target
+            self.bitboards[piece] ^= bit
+            self.bitboards[promoted] ^= bit
+            self.squares[target] = promoted
+            hash_value ^= keys[piece * 64 + target] ^ keys[promoted * 64 + target]
+            self.midgame += MIDGAME_SCORES[promoted * 64 + target] - MIDGAME_SCORES[piece * 64 + target]
+            self.endgame += ENDGAME_SCORES[promoted * 64 + target] - ENDGAME_SCORES[piece * 64 + target]
+            self.phase += PHASE_WEIGHTS[promoted >> 1]
+        
+        rights = self.rights
+        if piece >> 1 == KING:
+            rights &= ~(1 << KING_RIGHT[side])
+            if abs(target - source) == 2:
+                rook = ROOK * 2 + side
+                rook_source, rook_target = (source + 3, source + 1) if target > source else (source - 4, source - 1)
+                self._move_piece(rook, rook_source, rook_target)
+                hash_value ^= keys[rook * 64 + rook_source] ^ keys[rook * 64 + rook_target]
+                self.midgame += MIDGAME_SCORES[rook * 64 + rook_target] - MIDGAME_SCORES[rook * 64 + rook_source]
+                self.endgame += ENDGAME_SCORES[rook * 64 + rook_target] - ENDGAME_SCORES[rook * 64 + rook_source]
+        if source in ROOK_RIGHTS:
+            rights &= ~(1 << ROOK_RIGHTS[source])
+        if target in ROOK_RIGHTS:
+            rights &= ~(1 << ROOK_RIGHTS[target])
+        lost = self.rights ^ rights
+        index = 0
+        while lost:
+            if lost & 1:
+                hash_value ^= zobrist.castling_keys[index]
+            lost >>= 1
+            index += 1
+        self.rights = rights
+        
+        if self.ep_square >= 0:
+            hash_value ^= zobrist.en_passant_keys[self.ep_square % 8]
+        self.ep_square = -1
+        if piece >> 1 == PAWN and abs(target - source) == 16:
+            self.ep_square = (source + target) // 2
+            hash_value ^= zobrist.en_passant_keys[target % 8]
+        
+        self.side = 1 - side
+        self.hash = hash_value ^ zobrist.side_key
+    
+    def unmake_move(self):
+        source, target, piece, captured, captured_square, rights, ep_square, hash_value, self.midgame, self.endgame, self.phase = self.history.pop()
+        side = 1 - self.side
+        
+        moved = self.squares[target]
+        if moved != piece:
+            bit = 1 << target
+            self.bitboards[moved] ^= bit
+            self.bitboards[piece] ^= bit
+        self._move_piece(piece, target, source)
+        
+        if piece >> 1 == KING and abs(target - source) == 2:
+            rook = ROOK * 2 + side
+            rook_source, rook_target = (source + 3, source + 1) if target > source else (source - 4, source - 1)
+            self._move_piece(rook, rook_target, rook_source)
+        
+        if captured >= 0:
+            bit = 1 << captured_square
+            self.bitboards[captured] ^= bit
+            self.occupancy[captured & 1] ^= bit
+            self.squares[captured_square] = captured
+        
+        self.side = side
+        self.rights = rights
+        self.ep_square = ep_square
+        self.hash = hash_value
+    
+    def make_null_move(self):
+        self.history.append((self.ep_square, self.hash))
+        hash_value = self.hash
+        if self.ep_square >= 0:
+            hash_value ^= self.zobrist_hash.en_passant_keys[self.ep_square % 8]
+        self.ep_square = -1
+        self.side = 1 - self.side
+        self.hash = hash_value ^ self.zobrist_hash.side_key
+    
+    def unmake_null_move(self):
+        self.ep_square, self.hash = self.history.pop()
+        self.side = 1 - self.side
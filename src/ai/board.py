@@ -0,0 +1,206 @@
+import copy
+from .move_generator import generate_moves_fast, generate_captures_only, generate_quiets_only, is_move_legal
+from .evaluation import evaluate_position, score_pieces, tapered_score, MIDGAME_SCORES, ENDGAME_SCORES, PIECE_PHASES, PIECE_MATERIAL, MATERIAL_VALUES
+from .zobrist import PIECE_OFFSETS
+from .see import static_exchange
+from ..chess.attack import is_square_attacked
+
+VERIFY_HASH = False
+VERIFY_EVAL = False
+
+ROOK_HOME_SQUARES = {
+    (0, 7): 'white_rook_a', (7, 7): 'white_rook_h',
+    (0, 0): 'black_rook_a', (7, 0): 'black_rook_h'
+}
+
+PIECE_CHARS = {
+    'white': ('♙', '♘', '♗', '♖', '♕', '♔'),
+    'black': ('♟', '♞', '♝', '♜', '♛', '♚')
+}
+
+class Board:
+    def __init__(self, all_pieces, side_to_move, has_moved, last_move, zobrist_hash):
+        self.all_pieces = copy.deepcopy(all_pieces)
+        self.all_pieces_map = {}
+        for color, piece_set in self.all_pieces.items():
+            for piece_char in PIECE_CHARS[color]:
+                piece_set.setdefault(piece_char, [])
+            for piece_char, positions in piece_set.items():
+                for pos in positions:
+                    self.all_pieces_map[pos] = (piece_char, color)
+        
+        self.side_to_move = side_to_move
+        self.has_moved = dict(has_moved)
+        self.last_move = dict(last_move) if last_move else {'piece': None, 'start': None, 'end': None, 'turn': 0}
+        self.zobrist_hash = zobrist_hash
+        self.hash = self.compute_hash()
+        self.midgame, self.endgame, self.phase = score_pieces(self.all_pieces)
+        self.history = []
+    
+    def compute_hash(self):
+        return self.zobrist_hash.compute_hash(self.all_pieces, self.side_to_move, self.has_moved, self.last_move)
+    
+    def generate_moves(self):
+        return generate_moves_fast(self.all_pieces, self.all_pieces_map, self.side_to_move, self.has_moved, self.last_move)
+    
+    def generate_captures(self):
+        return generate_captures_only(self.all_pieces, self.all_pieces_map, self.side_to_move, self.last_move)
+    
+    def generate_quiets(self):
+        return generate_quiets_only(self.all_pieces, self.all_pieces_map, self.side_to_move, self.has_moved, self.last_move)
+    
+    def in_check(self):
+        color = self.side_to_move
+        kings = self.all_pieces[color][PIECE_CHARS[color][5]]
+        return bool(kings) and is_square_attacked(kings[0], 'black' if color == 'white' else 'white', self.all_pieces_map)
+    
+    def has_non_pawn_material(self):
+        pieces = self.all_pieces[self.side_to_move]
+        return any(pieces[piece_char] for piece_char in PIECE_CHARS[self.side_to_move][1:5])
+    
+    def piece_count(self):
+        return len(self.all_pieces_map)
+    
+    def piece_list(self):
+        pieces, squares = [], []
+        for (col, row), (piece_char, _) in self.all_pieces_map.items():
+            pieces.append(PIECE_OFFSETS[piece_char] >> 6)
+            squares.append(row * 8 + col)
+        return pieces, squares
+    
+    def is_capture(self, move):
+        return move[1] in self.all_pieces_map or (move[2] in ('♙', '♟') and move[0][0] != move[1][0])
+    
+    def capture_value(self, move):
+        captured = self.all_pieces_map.get(move[1])
+        return PIECE_MATERIAL[captured[0]] if captured else MATERIAL_VALUES[0]
+    
+    def see(self, move):
+        return static_exchange(self.all_pieces_map, move)
+    
+    def is_legal(self, move):
+        return is_move_legal(self.all_pieces_map, self.side_to_move, move, self.has_moved, self.last_move)
+    
+    def evaluate(self, is_in_check):
+        return tapered_score(self.midgame, self.endgame, self.phase, is_in_check)
+    
+    def evaluate_full(self, is_in_check):
+        return evaluate_position(self.all_pieces, self.all_pieces_map, is_in_check)
+    
+    def make_move(self, move):
+        pos, dest, piece_char = move[0], move[1], move[2]
+        placed_char = move[3] if len(move) > 3 else piece_char
+        color = self.side_to_move
+        opponent = 'black' if color == 'white' else 'white'
+        pieces = self.all_pieces
+        board_map = self.all_pieces_map
+        
+        captured = board_map.get(dest)
+        captured_pos = dest
+        if captured is None and piece_char in ('♙', '♟') and pos[0] != dest[0]:
+            captured_pos = (dest[0], pos[1])
+            captured = board_map[captured_pos]
+        
+        rights_lost = [key for key in (ROOK_HOME_SQUARES.get(pos), ROOK_HOME_SQUARES.get(dest)) if key and not self.has_moved[key]]
+        if piece_char in ('♔', '♚') and not self.has_moved[color + '_king']:
+            rights_lost.append(color + '_king')
+        
+        self.history.append((move, captured, captured_pos, rights_lost, self.last_move, self.hash, self.midgame, self.endgame, self.phase))
+        zobrist = self.zobrist_hash
+        keys = zobrist.piece_keys
+        hash_value = self.hash
+        
+        if captured:
+            pieces[opponent][captured[0]].remove(captured_pos)
+            del board_map[captured_pos]
+            index = PIECE_OFFSETS[captured[0]] + captured_pos[1] * 8 + captured_pos[0]
+            hash_value ^= keys[index]
+            self.midgame -= MIDGAME_SCORES[index]
+            self.endgame -= ENDGAME_SCORES[index]
+            self.phase -= PIECE_PHASES[captured[0]]
+        
+        pieces[color][piece_char].remove(pos)
+        del board_map[pos]
+        pieces[color][placed_char].append(dest)
+        board_map[dest] = (placed_char, color)
+        source_index = PIECE_OFFSETS[piece_char] + pos[1] * 8 + pos[0]
+        target_index = PIECE_OFFSETS[placed_char] + dest[1] * 8 + dest[0]
+        hash_value ^= keys[source_index] ^ keys[target_index]
+        self.midgame += MIDGAME_SCORES[target_index] - MIDGAME_SCORES[source_index]
+        self.endgame += ENDGAME_SCORES[target_index] - ENDGAME_SCORES[source_index]
+        if placed_char != piece_char:
+            self.phase += PIECE_PHASES[placed_char] - PIECE_PHASES[piece_char]
+        
+        if piece_char in ('♔', '♚') and abs(dest[0] - pos[0]) == 2:
+            rook_char = '♖' if color == 'white' else '♜'
+            rook_start, rook_end = ((7, pos[1]), (5, pos[1])) if dest[0] > pos[0] else ((0, pos[1]), (3, pos[1]))
+            pieces[color][rook_char].remove(rook_start)
+            pieces[color][rook_char].append(rook_end)
+            del board_map[rook_start]
+            board_map[rook_end] = (rook_char, color)
+            source_index = PIECE_OFFSETS[rook_char] + rook_start[1] * 8 + rook_start[0]
+            target_index = PIECE_OFFSETS[rook_char] + rook_end[1] * 8 + rook_end[0]
+            hash_value ^= keys[source_index] ^ keys[target_index]
+            self.midgame += MIDGAME_SCORES[target_index] - MIDGAME_SCORES[source_index]
+            self.endgame += ENDGAME_SCORES[target_index] - ENDGAME_SCORES[source_index]
+        
+        for key in rights_lost:
+            self.has_moved[key] = True
+            hash_value ^= zobrist.castling_key(key)
+        
+        hash_value ^= zobrist.en_passant_key(self.last_move)
+        self.last_move = {'piece': piece_char, 'start': pos, 'end': dest, 'turn': self.last_move.get('turn', 0) + 1}
+        if piece_char in ('♙', '♟') and abs(dest[1] - pos[1]) == 2:
+            hash_value ^= zobrist.en_passant_keys[dest[0]]
+        
+        self.side_to_move = opponent
+        self.hash = hash_value ^ zobrist.side_key
+        
+        if VERIFY_HASH:
+            assert self.hash == self.compute_hash(), move
+        if VERIFY_EVAL:
+            assert (self.midgame, self.endgame, self.phase) == score_pieces(self.all_pieces), move
+    
+    def unmake_move(self):
+        move, captured, captured_pos, rights_lost, last_move, hash_value, self.midgame, self.endgame, self.phase = self.history.pop()
+        pos, dest, piece_char = move[0], move[1], move[2]
+        placed_char = move[3] if len(move) > 3 else piece_char
+        opponent = self.side_to_move
+        color = 'black' if opponent == 'white' else 'white'
+        pieces = self.all_pieces
+        board_map = self.all_pieces_map
+        
+        if piece_char in ('♔', '♚') and abs(dest[0] - pos[0]) == 2:
+            rook_char = '♖' if color == 'white' else '♜'
+            rook_start, rook_end = ((7, pos[1]), (5, pos[1])) if dest[0] > pos[0] else ((0, pos[1]), (3, pos[1]))
+            pieces[color][rook_char].remove(rook_end)
+            pieces[color][rook_char].append(rook_start)
+            del board_map[rook_end]
+            board_map[rook_start] = (rook_char, color)
+        
+        pieces[color][placed_char].remove(dest)
+        del board_map[dest]
+        pieces[color][piece_char].append(pos)
+        board_map[pos] = (piece_char, color)
+        
+        if captured:
+            pieces[opponent][captured[0]].append(captured_pos)
+            board_map[captured_pos] = captured
+        
+        for key in rights_lost:
+            self.has_moved[key] = False
+        
+        self.last_move = last_move
+        self.side_to_move = color
+        self.hash = hash_value
+    
+    def make_null_move(self):
+        self.history.append((self.last_move, self.hash))
+        zobrist = self.zobrist_hash
+        self.hash ^= zobrist.en_passant_key(self.last_move) ^ zobrist.side_key
+        self.last_move = {'piece': None, 'start': None, 'end': None, 'turn': self.last_move.get('turn', 0) + 1}
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
+    
+    def unmake_null_move(self):
+        self.last_move, self.hash = self.history.pop()
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
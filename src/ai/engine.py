@@ -1,153 +1,135 @@
+import time
 import random
-from .minimax import minimax
-from ..chess.attack import is_square_attacked
-from ..chess.move_validation import is_move_valid
+from .board import Board
+from .bitboard import BitBoard
+from .minimax import aspiration_search, SearchTimeout
+from .move_picker import MoveOrdering
+from .see import static_exchange
+from .move_generator import is_move_legal
+from .tablebase import TABLEBASE_WIN, MAX_PLIES
+from ..chess.attack import attacked_squares
+from ..chess.move_validation import iter_legal_moves
 
-def get_best_ai_move(all_pieces, all_pieces_map, current_turn, is_in_check, zobrist_hash, transposition_table, has_moved, last_move, ai_color='black'):
+DEFAULT_TIME_LIMIT_MS = 1000
+MAX_SEARCH_DEPTH = 32
+
+BOARD_BACKENDS = {
+    'mailbox': Board,
+    'bitboard': BitBoard
+}
+DEFAULT_BOARD_BACKEND = 'bitboard'
+
+def iterative_deepening(all_pieces, is_in_check, zobrist_hash, transposition_table, has_moved, last_move, ai_color, time_limit_ms, max_depth=MAX_SEARCH_DEPTH, backend=DEFAULT_BOARD_BACKEND, stop=None, helpers=None, tablebases=None, stats=None):
+    start_time = time.perf_counter()
+    budget = time_limit_ms / 1000
+    deadline = start_time + budget
+    board = BOARD_BACKENDS[backend](all_pieces, ai_color, has_moved, last_move, zobrist_hash)
+    transposition_table.new_search()
+    ordering = MoveOrdering()
+    nodes_checked = [0]
+    best_move = None
+    best_depth = 0
+    score = None
+    if stats is not None:
+        stats['depth_times'] = []
+    
+    if helpers is not None:
+        helpers.start(all_pieces, has_moved, last_move, is_in_check, ai_color, time_limit_ms, transposition_table.generation, backend)
+    
+    for depth in range(1, max_depth + 1):
+        try:
+            score, pv = aspiration_search(board, depth, score, is_in_check, nodes_checked, transposition_table, deadline if best_move else None, ordering, stop, tablebases)
+        except SearchTimeout:
+            break
+        
+        if pv:
+            best_move = pv[0]
+            best_depth = depth
+        if stats is not None:
+            stats['depth_times'].append(time.perf_counter() - start_time)
+        
+        if score > TABLEBASE_WIN - 2 * MAX_PLIES:
+            break
+        
+        if time.perf_counter() - start_time >= budget / 2:
+            break
+    
+    if helpers is not None:
+        helpers.stop()
+        for depth, move in helpers.collect():
+            if depth > best_depth:
+                best_depth, best_move = depth, move
+    
+    if stats is not None:
+        stats['nodes'] = nodes_checked[0]
+        stats['depth'] = best_depth
+        stats['score'] = score
+    
+    return best_move
+
+def get_best_ai_move(all_pieces, all_pieces_map, current_turn, is_in_check, zobrist_hash, transposition_table, has_moved, last_move, ai_color='black', time_limit_ms=DEFAULT_TIME_LIMIT_MS, backend=DEFAULT_BOARD_BACKEND, stop=None, helpers=None, book=None, tablebases=None):
     piece_values = {
         '♙': 1, '♟': 1, '♘': 3, '♞': 3, '♗': 3, '♝': 3,
         '♖': 5, '♜': 5, '♕': 9, '♛': 9
     }
     
-    nodes_checked = [0]
-    max_nodes = 50000
-    depth = 4
+    if book is not None:
+        book_move = book.choose(zobrist_hash.compute_hash(all_pieces, ai_color, has_moved, last_move))
+        if book_move and is_move_legal(all_pieces_map, ai_color, book_move, has_moved, last_move):
+            return book_move
+    
+    if tablebases is not None:
+        tablebase_move = tablebases.best_move(BOARD_BACKENDS[backend](all_pieces, ai_color, has_moved, last_move, zobrist_hash))
+        if tablebase_move:
+            return tablebase_move
     
     try:
-        maximizing = (ai_color == 'black')
-        _, best_move = minimax(all_pieces, all_pieces_map, depth, -999999, 999999, maximizing, is_in_check, nodes_checked, max_nodes, zobrist_hash, transposition_table, has_moved, last_move)
+        best_move = iterative_deepening(all_pieces, is_in_check, zobrist_hash, transposition_table, has_moved, last_move, ai_color, time_limit_ms, backend=backend, stop=stop, helpers=helpers, tablebases=tablebases)
         if best_move:
             return best_move
     except Exception as e:
         print(f"Minimax error: {e}")
         pass
     
+    if stop is not None and stop.is_set():
+        return None
+    
     all_moves = []
+    opponent = 'white' if ai_color == 'black' else 'black'
+    attacked = attacked_squares(opponent, all_pieces_map)
     
-    for piece_char, positions in all_pieces[ai_color].items():
-        for pos in positions:
-            col, row = pos
-            possible_moves = []
-            
-            opponent = 'white' if ai_color == 'black' else 'black'
-            
-            if piece_char == '♟':
-                if row < 7 and (col, row + 1) not in all_pieces_map:
-                    possible_moves.append((col, row + 1))
-                if row == 1 and (col, row + 1) not in all_pieces_map and (col, row + 2) not in all_pieces_map:
-                    possible_moves.append((col, row + 2))
-                for dx in [-1, 1]:
-                    if 0 <= col + dx < 8 and (col + dx, row + 1) in all_pieces_map and all_pieces_map[(col + dx, row + 1)][1] == opponent:
-                        possible_moves.append((col + dx, row + 1))
-            
-            elif piece_char == '♙':
-                if row > 0 and (col, row - 1) not in all_pieces_map:
-                    possible_moves.append((col, row - 1))
-                if row == 6 and (col, row - 1) not in all_pieces_map and (col, row - 2) not in all_pieces_map:
-                    possible_moves.append((col, row - 2))
-                for dx in [-1, 1]:
-                    if 0 <= col + dx < 8 and (col + dx, row - 1) in all_pieces_map and all_pieces_map[(col + dx, row - 1)][1] == opponent:
-                        possible_moves.append((col + dx, row - 1))
-            
-            elif piece_char in ('♞', '♘'):
-                offsets = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
-                for dx, dy in offsets:
-                    nx, ny = col + dx, row + dy
-                    if 0 <= nx < 8 and 0 <= ny < 8:
-                        if (nx, ny) not in all_pieces_map or all_pieces_map[(nx, ny)][1] != ai_color:
-                            possible_moves.append((nx, ny))
-            
-            elif piece_char in ('♜', '♖'):
-                directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-                for dx, dy in directions:
-                    for i in range(1, 8):
-                        nx, ny = col + dx * i, row + dy * i
-                        if not (0 <= nx < 8 and 0 <= ny < 8):
-                            break
-                        if (nx, ny) in all_pieces_map:
-                            if all_pieces_map[(nx, ny)][1] != ai_color:
-                                possible_moves.append((nx, ny))
-                            break
-                        possible_moves.append((nx, ny))
-            
-            elif piece_char in ('♝', '♗'):
-                directions = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
-                for dx, dy in directions:
-                    for i in range(1, 8):
-                        nx, ny = col + dx * i, row + dy * i
-                        if not (0 <= nx < 8 and 0 <= ny < 8):
-                            break
-                        if (nx, ny) in all_pieces_map:
-                            if all_pieces_map[(nx, ny)][1] != ai_color:
-                                possible_moves.append((nx, ny))
-                            break
-                        possible_moves.append((nx, ny))
-            
-            elif piece_char in ('♛', '♕'):
-                directions = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
-                for dx, dy in directions:
-                    for i in range(1, 8):
-                        nx, ny = col + dx * i, row + dy * i
-                        if not (0 <= nx < 8 and 0 <= ny < 8):
-                            break
-                        if (nx, ny) in all_pieces_map:
-                            if all_pieces_map[(nx, ny)][1] != ai_color:
-                                possible_moves.append((nx, ny))
-                            break
-                        possible_moves.append((nx, ny))
-            
-            elif piece_char in ('♚', '♔'):
-                directions = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
-                for dx, dy in directions:
-                    nx, ny = col + dx, row + dy
-                    if 0 <= nx < 8 and 0 <= ny < 8:
-                        if (nx, ny) not in all_pieces_map or all_pieces_map[(nx, ny)][1] != ai_color:
-                            possible_moves.append((nx, ny))
-            
-            for move in possible_moves:
-                if is_move_valid(pos, move, piece_char, ai_color, all_pieces_map):
-                    score = 0
-                    
-                    piece_under_attack = is_square_attacked(pos, opponent, all_pieces_map)
-                    piece_value = piece_values.get(piece_char, 0)
-                    
-                    move_is_attacked = is_square_attacked(move, opponent, all_pieces_map)
-                    
-                    capture_value = 0
-                    if move in all_pieces_map:
-                        captured_piece = all_pieces_map[move][0]
-                        capture_value = piece_values.get(captured_piece, 0)
-                        score += capture_value * 15
-                    
-                    if move_is_attacked:
-                        if capture_value < piece_value and not piece_under_attack:
-                            score -= piece_value * 20
-                        elif capture_value > piece_value:
-                            score += (capture_value - piece_value) * 10
-                        elif capture_value == piece_value and not piece_under_attack:
-                            score += 2
-                    
-                    if piece_under_attack and not move_is_attacked:
-                        score += piece_value * 8
-                    
-                    if piece_value >= 5:
-                        if not move_is_attacked:
-                            score += 5
-                    
-                    center_squares = [(3, 3), (3, 4), (4, 3), (4, 4)]
-                    if move in center_squares and not move_is_attacked:
-                        score += 4
-                    
-                    if piece_char == '♟' and not move_is_attacked:
-                        score += move[1] * 0.8
-                    
-                    if piece_char in ('♞', '♝', '♛') and pos[1] == 0 and move[1] > 0:
-                        score += 3
-                    
-                    if piece_char in ('♞', '♝', '♜', '♛') and move == pos:
-                        score -= 5
-                    
-                    all_moves.append((pos, move, piece_char, score))
+    for pos, move, piece_char in iter_legal_moves(ai_color, all_pieces, all_pieces_map):
+        score = 0
+        
+        piece_under_attack = pos in attacked
+        piece_value = piece_values.get(piece_char, 0)
+        
+        move_is_attacked = move in attacked
+        
+        exchange = static_exchange(all_pieces_map, (pos, move, piece_char)) / 100
+        score += exchange * 15 if exchange > 0 else exchange * 20
+        
+        if piece_under_attack and not move_is_attacked:
+            score += piece_value * 8
+        
+        if piece_value >= 5:
+            if not move_is_attacked:
+                score += 5
+        
+        center_squares = [(3, 3), (3, 4), (4, 3), (4, 4)]
+        if move in center_squares and not move_is_attacked:
+            score += 4
+        
+        if piece_char == '♟' and not move_is_attacked:
+            score += move[1] * 0.8
+        
+        if piece_char in ('♞', '♝', '♛') and pos[1] == 0 and move[1] > 0:
+            score += 3
+        
+        if piece_char in ('♞', '♝', '♜', '♛') and move == pos:
+            score -= 5
+        
+        all_moves.append((pos, move, piece_char, score))
     
     if not all_moves:
         return None
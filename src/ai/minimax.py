@@ -1,117 +1,199 @@
-from .transposition_table import TT_EXACT, TT_LOWER, TT_UPPER
-from .evaluation import evaluate_position
-from .move_generator import generate_moves_fast, generate_captures_only, simulate_move
+import time
+from .transposition_table import TT_EXACT, TT_LOWER, TT_UPPER, MATE_BOUND
+from .move_picker import MoveOrdering
+from .evaluation import PIECE_MATERIAL
+from .tablebase import tablebase_score, TABLEBASE_WIN
 
-def quiescence(all_pieces, all_pieces_map, alpha, beta, maximizing, is_in_check, nodes_checked, max_nodes, max_depth=4):
+INFINITY = 999999
+MATE = TABLEBASE_WIN
+ASPIRATION_WINDOW = 50
+
+NULL_MOVE_PRUNING = True
+NULL_MOVE_MIN_DEPTH = 3
+NULL_MOVE_REDUCTION = 2
+
+LATE_MOVE_REDUCTIONS = True
+LMR_MIN_DEPTH = 3
+LMR_MIN_MOVES = 3
+LMR_REDUCTION = 1
+
+FUTILITY_PRUNING = True
+FUTILITY_MARGINS = [0, 200, 350]
+
+RAZORING = True
+RAZOR_MARGINS = [0, 300, 500]
+
+DELTA_PRUNING = True
+DELTA_MARGIN = 200
+
+SEE_PRUNING = True
+
+class SearchTimeout(Exception):
+    pass
+
+class CancelFlag:
+    def __init__(self, cancelled, request_id):
+        self.cancelled = cancelled
+        self.request_id = request_id
+    
+    def is_set(self):
+        return self.cancelled.value >= self.request_id
+
+def check_deadline(nodes_checked, deadline, stop=None):
+    if nodes_checked[0] & 1023 == 0:
+        if (deadline is not None and time.perf_counter() >= deadline) or (stop is not None and stop.is_set()):
+            raise SearchTimeout()
+
+def relative_score(board, is_in_check):
+    score = board.evaluate(is_in_check)
+    return score if board.side_to_move == 'black' else -score
+
+def quiescence(board, alpha, beta, is_in_check, nodes_checked, max_nodes, max_depth=4, deadline=None, stop=None, ply=0):
     if nodes_checked[0] >= max_nodes or max_depth <= 0:
-        return evaluate_position(all_pieces, all_pieces_map, is_in_check)
+        return relative_score(board, is_in_check)
     
     nodes_checked[0] += 1
-    stand_pat = evaluate_position(all_pieces, all_pieces_map, is_in_check)
+    check_deadline(nodes_checked, deadline, stop)
     
-    if maximizing:
-        if stand_pat >= beta:
-            return beta
-        if alpha < stand_pat:
-            alpha = stand_pat
+    evading = board.in_check()
+    if evading:
+        moves = board.generate_moves()
+        if not moves:
+            return -MATE + ply
+        best_score = -INFINITY
     else:
-        if stand_pat <= alpha:
-            return alpha
-        if beta > stand_pat:
-            beta = stand_pat
-    
-    color = 'black' if maximizing else 'white'
-    captures = generate_captures_only(all_pieces, all_pieces_map, color)
+        best_score = relative_score(board, is_in_check)
+        if best_score >= beta:
+            return best_score
+        if best_score > alpha:
+            alpha = best_score
+        moves = board.generate_captures()
     
-    for pos, dest, piece_char in captures[:5]:
-        new_pieces, new_map, _ = simulate_move(all_pieces, all_pieces_map, pos, dest, piece_char, color)
-        score = quiescence(new_pieces, new_map, alpha, beta, not maximizing, is_in_check, nodes_checked, max_nodes, max_depth - 1)
+    for move in moves:
+        if not evading and DELTA_PRUNING and len(move) == 3 and best_score + board.capture_value(move) + DELTA_MARGIN <= alpha:
+            continue
+        if not evading and SEE_PRUNING and len(move) == 3 and board.capture_value(move) < PIECE_MATERIAL[move[2]] and board.see(move) < 0:
+            continue
+        board.make_move(move)
+        score = -quiescence(board, -beta, -alpha, is_in_check, nodes_checked, max_nodes, max_depth - 1, deadline, stop, ply + 1)
+        board.unmake_move()
         
-        if maximizing:
+        if score > best_score:
+            best_score = score
             if score >= beta:
-                return beta
+                return score
             if score > alpha:
                 alpha = score
-        else:
-            if score <= alpha:
-                return alpha
-            if score < beta:
-                beta = score
     
-    return alpha if maximizing else beta
+    return best_score
 
-def minimax(all_pieces, all_pieces_map, depth, alpha, beta, maximizing, is_in_check, nodes_checked, max_nodes, zobrist_hash, transposition_table, has_moved, last_move):
-    if nodes_checked[0] >= max_nodes:
-        return quiescence(all_pieces, all_pieces_map, alpha, beta, maximizing, is_in_check, nodes_checked, max_nodes), None
+def negamax(board, depth, alpha, beta, is_in_check, nodes_checked, max_nodes, transposition_table, deadline=None, ordering=None, ply=0, stop=None, allow_null=True, tablebases=None):
+    if tablebases is not None and ply > 0 and board.piece_count() <= tablebases.max_pieces:
+        value = tablebases.probe(board)
+        if value is not None:
+            return tablebase_score(value, ply), []
     
-    side_to_move = 'black' if maximizing else 'white'
-    hash_key = zobrist_hash.compute_hash(all_pieces, side_to_move, has_moved, last_move)
+    if nodes_checked[0] >= max_nodes or depth == 0:
+        return quiescence(board, alpha, beta, is_in_check, nodes_checked, max_nodes, deadline=deadline, stop=stop, ply=ply), []
     
-    tt_score, tt_move = transposition_table.probe(hash_key, depth, alpha, beta)
-    if tt_score is not None:
-        return tt_score, tt_move
+    hash_key = board.hash
     
-    if depth == 0:
-        return quiescence(all_pieces, all_pieces_map, alpha, beta, maximizing, is_in_check, nodes_checked, max_nodes), None
+    tt_score, tt_move = transposition_table.probe(hash_key, depth, alpha, beta, ply)
+    if tt_score is not None and ply > 0:
+        return tt_score, [tt_move] if tt_move else []
     
     nodes_checked[0] += 1
+    check_deadline(nodes_checked, deadline, stop)
     
-    color = 'black' if maximizing else 'white'
-    moves = generate_moves_fast(all_pieces, all_pieces_map, color)
+    if ordering is None:
+        ordering = MoveOrdering()
     
-    if not moves:
-        return evaluate_position(all_pieces, all_pieces_map, is_in_check), None
+    in_check = board.in_check()
+    static_score = relative_score(board, is_in_check)
+    frontier = ply > 0 and beta - alpha == 1 and not in_check
     
-    best_move = tt_move
+    if RAZORING and frontier and depth < len(RAZOR_MARGINS) and static_score + RAZOR_MARGINS[depth] <= alpha:
+        score = quiescence(board, alpha, beta, is_in_check, nodes_checked, max_nodes, deadline=deadline, stop=stop, ply=ply)
+        if score <= alpha:
+            return score, []
+    
+    futile = FUTILITY_PRUNING and frontier and depth < len(FUTILITY_MARGINS) and static_score + FUTILITY_MARGINS[depth] <= alpha
+    
+    if NULL_MOVE_PRUNING and allow_null and frontier and depth >= NULL_MOVE_MIN_DEPTH:
+        if board.has_non_pawn_material() and static_score >= beta:
+            board.make_null_move()
+            score, _ = negamax(board, depth - 1 - NULL_MOVE_REDUCTION, -beta, -beta + 1, is_in_check, nodes_checked, max_nodes, transposition_table, deadline, ordering, ply + 1, stop, False, tablebases)
+            board.unmake_null_move()
+            if -score >= beta:
+                return (beta if -score > MATE_BOUND else -score), []
+    
+    best_score = -INFINITY
+    best_pv = []
     original_alpha = alpha
+    searched = 0
     
-    if maximizing:
-        max_eval = -999999
-        for move in moves[:15]:
-            pos, dest, piece_char = move
-            new_pieces, new_map, captured = simulate_move(all_pieces, all_pieces_map, pos, dest, piece_char, color)
-            
-            eval_score, _ = minimax(new_pieces, new_map, depth - 1, alpha, beta, False, is_in_check, nodes_checked, max_nodes, zobrist_hash, transposition_table, has_moved, last_move)
-            
-            if eval_score > max_eval:
-                max_eval = eval_score
-                best_move = move
-                
-            alpha = max(alpha, eval_score)
-            if beta <= alpha:
-                break
-        
-        if max_eval <= original_alpha:
-            flag = TT_UPPER
-        elif max_eval >= beta:
-            flag = TT_LOWER
+    for move in ordering.pick_moves(board, tt_move, ply):
+        quiet = len(move) == 3 and not board.is_capture(move)
+        if futile and searched > 0 and quiet:
+            best_score = max(best_score, static_score + FUTILITY_MARGINS[depth])
+            continue
+        reduction = 0
+        if LATE_MOVE_REDUCTIONS and searched >= LMR_MIN_MOVES and depth >= LMR_MIN_DEPTH and not in_check and quiet:
+            reduction = LMR_REDUCTION
+        board.make_move(move)
+        if reduction and board.in_check():
+            reduction = 0
+        if searched == 0:
+            score, child_pv = negamax(board, depth - 1, -beta, -alpha, is_in_check, nodes_checked, max_nodes, transposition_table, deadline, ordering, ply + 1, stop, True, tablebases)
+            score = -score
         else:
-            flag = TT_EXACT
-        transposition_table.store(hash_key, depth, max_eval, flag, best_move)
+            score, child_pv = negamax(board, depth - 1 - reduction, -alpha - 1, -alpha, is_in_check, nodes_checked, max_nodes, transposition_table, deadline, ordering, ply + 1, stop, True, tablebases)
+            score = -score
+            if reduction and score > alpha:
+                score, child_pv = negamax(board, depth - 1, -alpha - 1, -alpha, is_in_check, nodes_checked, max_nodes, transposition_table, deadline, ordering, ply + 1, stop, True, tablebases)
+                score = -score
+            if alpha < score < beta:
+                score, child_pv = negamax(board, depth - 1, -beta, -alpha, is_in_check, nodes_checked, max_nodes, transposition_table, deadline, ordering, ply + 1, stop, True, tablebases)
+                score = -score
+        board.unmake_move()
+        searched += 1
         
-        return max_eval, best_move
-    else:
-        min_eval = 999999
-        for move in moves[:15]:
-            pos, dest, piece_char = move
-            new_pieces, new_map, captured = simulate_move(all_pieces, all_pieces_map, pos, dest, piece_char, color)
-            
-            eval_score, _ = minimax(new_pieces, new_map, depth - 1, alpha, beta, True, is_in_check, nodes_checked, max_nodes, zobrist_hash, transposition_table, has_moved, last_move)
-            
-            if eval_score < min_eval:
-                min_eval = eval_score
-                best_move = move
-                
-            beta = min(beta, eval_score)
-            if beta <= alpha:
-                break
+        if score > best_score:
+            best_score = score
+            best_pv = [move] + child_pv
+            if score > alpha:
+                alpha = score
         
-        if min_eval <= original_alpha:
-            flag = TT_UPPER
-        elif min_eval >= beta:
-            flag = TT_LOWER
+        if alpha >= beta:
+            if not board.is_capture(move):
+                ordering.update(move, ply, depth)
+            break
+    
+    if not searched:
+        return (-MATE + ply if in_check else 0), []
+    
+    if best_score <= original_alpha:
+        flag = TT_UPPER
+    elif best_score >= beta:
+        flag = TT_LOWER
+    else:
+        flag = TT_EXACT
+    transposition_table.store(hash_key, depth, best_score, flag, best_pv[0], ply)
+    
+    return best_score, best_pv
+
+def aspiration_search(board, depth, previous_score, is_in_check, nodes_checked, transposition_table, deadline=None, ordering=None, stop=None, tablebases=None):
+    if previous_score is None or depth < 3:
+        return negamax(board, depth, -INFINITY, INFINITY, is_in_check, nodes_checked, float('inf'), transposition_table, deadline, ordering, 0, stop, True, tablebases)
+    
+    window = ASPIRATION_WINDOW
+    alpha, beta = previous_score - window, previous_score + window
+    while True:
+        score, pv = negamax(board, depth, alpha, beta, is_in_check, nodes_checked, float('inf'), transposition_table, deadline, ordering, 0, stop, True, tablebases)
+        if score <= alpha and alpha > -INFINITY:
+            alpha = max(score - window, -INFINITY)
+        elif score >= beta and beta < INFINITY:
+            beta = min(score + window, INFINITY)
         else:
-            flag = TT_EXACT
-        transposition_table.store(hash_key, depth, min_eval, flag, best_move)
-        
-        return min_eval, best_move
\ No newline at end of file
+            return score, pv
+        window *= 2
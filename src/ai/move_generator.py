@@ -1,134 +1,153 @@
-import copy
+from ..chess.attack import is_square_attacked
+from ..chess.move_validation import iter_legal_moves
 
-def simulate_move(all_pieces, all_pieces_map, pos, dest, piece_char, color):
-    new_pieces = copy.deepcopy(all_pieces)
-    new_map = dict(all_pieces_map)
-    
-    captured = None
-    if dest in new_map:
-        cap_char, cap_color = new_map[dest]
-        captured = cap_char
-        new_pieces[cap_color][cap_char].remove(dest)
+PROMOTION_PIECES = {'white': ('♕', '♖', '♗', '♘'), 'black': ('♛', '♜', '♝', '♞')}
+
+def en_passant_target(last_move):
+    if last_move and last_move.get('piece') in ('♙', '♟'):
+        start = last_move.get('start')
+        end = last_move.get('end')
+        if start and end and abs(start[1] - end[1]) == 2:
+            return (end[0], (start[1] + end[1]) // 2)
+    return None
+
+def castling_moves(color, all_pieces_map, has_moved):
+    row = 7 if color == 'white' else 0
+    opponent = 'black' if color == 'white' else 'white'
+    king_char = '♔' if color == 'white' else '♚'
+    rook_char = '♖' if color == 'white' else '♜'
+    moves = []
     
-    new_pieces[color][piece_char].remove(pos)
-    new_pieces[color][piece_char].append(dest)
+    if has_moved[color + '_king'] or all_pieces_map.get((4, row)) != (king_char, color):
+        return moves
+    if is_square_attacked((4, row), opponent, all_pieces_map):
+        return moves
     
-    del new_map[pos]
-    new_map[dest] = (piece_char, color)
+    if not has_moved[color + '_rook_h'] and all_pieces_map.get((7, row)) == (rook_char, color):
+        if (5, row) not in all_pieces_map and (6, row) not in all_pieces_map:
+            if not is_square_attacked((5, row), opponent, all_pieces_map) and not is_square_attacked((6, row), opponent, all_pieces_map):
+                moves.append(((4, row), (6, row), king_char))
+    if not has_moved[color + '_rook_a'] and all_pieces_map.get((0, row)) == (rook_char, color):
+        if (1, row) not in all_pieces_map and (2, row) not in all_pieces_map and (3, row) not in all_pieces_map:
+            if not is_square_attacked((3, row), opponent, all_pieces_map) and not is_square_attacked((2, row), opponent, all_pieces_map):
+                moves.append(((4, row), (2, row), king_char))
     
-    return new_pieces, new_map, captured
+    return moves
 
-def generate_captures_only(all_pieces, all_pieces_map, color):
-    from ..chess.move_validation import is_move_valid
+def generate_captures_only(all_pieces, all_pieces_map, color, last_move=None):
     piece_values = {'♙': 1, '♟': 1, '♘': 3, '♞': 3, '♗': 3, '♝': 3, '♖': 5, '♜': 5, '♕': 9, '♛': 9}
     captures = []
     
-    for piece_char, positions in all_pieces[color].items():
-        for pos in positions:
-            col, row = pos
-            possible = []
-            
-            if piece_char == '♟':
-                for dx in [-1, 1]:
-                    if 0 <= col + dx < 8 and row < 7:
-                        target = (col + dx, row + 1)
-                        if target in all_pieces_map and all_pieces_map[target][1] != color:
-                            possible.append(target)
-            elif piece_char == '♙':
-                for dx in [-1, 1]:
-                    if 0 <= col + dx < 8 and row > 0:
-                        target = (col + dx, row - 1)
-                        if target in all_pieces_map and all_pieces_map[target][1] != color:
-                            possible.append(target)
-            elif piece_char in ('♞', '♘'):
-                for dx, dy in [(-2,-1),(-2,1),(-1,-2),(-1,2),(1,-2),(1,2),(2,-1),(2,1)]:
-                    target = (col + dx, row + dy)
-                    if 0 <= target[0] < 8 and 0 <= target[1] < 8:
-                        if target in all_pieces_map and all_pieces_map[target][1] != color:
-                            possible.append(target)
-            elif piece_char in ('♜', '♖', '♝', '♗', '♛', '♕'):
-                if piece_char in ('♜', '♖', '♛', '♕'):
-                    dirs = [(0,1),(0,-1),(1,0),(-1,0)]
-                else:
-                    dirs = [(1,1),(1,-1),(-1,1),(-1,-1)]
-                if piece_char in ('♛', '♕'):
-                    dirs = [(0,1),(0,-1),(1,0),(-1,0),(1,1),(1,-1),(-1,1),(-1,-1)]
-                
-                for dx, dy in dirs:
-                    for i in range(1, 8):
-                        target = (col + dx*i, row + dy*i)
-                        if not (0 <= target[0] < 8 and 0 <= target[1] < 8):
-                            break
-                        if target in all_pieces_map:
-                            if all_pieces_map[target][1] != color:
-                                possible.append(target)
-                            break
-            
-            for target in possible:
-                if is_move_valid(pos, target, piece_char, color, all_pieces_map):
-                    victim_value = piece_values.get(all_pieces_map[target][0], 0)
-                    captures.append((pos, target, piece_char, victim_value))
+    for pos, target, piece_char in iter_legal_moves(color, all_pieces, all_pieces_map, last_move, captures_only=True):
+        if target not in all_pieces_map:
+            if pos[0] == target[0]:
+                captures.append((pos, target, piece_char, PROMOTION_PIECES[color][0], 8 * 10 - 1))
+            else:
+                captures.append((pos, target, piece_char, 9))
+            continue
+        attacker_value = piece_values.get(piece_char, 0)
+        victim_value = piece_values.get(all_pieces_map[target][0], 0)
+        if piece_char in ('♟', '♙') and target[1] in (0, 7):
+            captures.append((pos, target, piece_char, PROMOTION_PIECES[color][0], (victim_value + 8) * 10 - attacker_value))
+        else:
+            captures.append((pos, target, piece_char, victim_value * 10 - attacker_value))
     
-    captures.sort(key=lambda x: x[3], reverse=True)
-    return [(c[0], c[1], c[2]) for c in captures]
+    captures.sort(key=lambda x: x[-1], reverse=True)
+    return [c[:-1] for c in captures]
 
-def generate_moves_fast(all_pieces, all_pieces_map, color):
-    from ..chess.move_validation import is_move_valid
+def generate_moves_fast(all_pieces, all_pieces_map, color, has_moved=None, last_move=None):
     piece_values = {'♙': 1, '♟': 1, '♘': 3, '♞': 3, '♗': 3, '♝': 3, '♖': 5, '♜': 5, '♕': 9, '♛': 9}
     moves = []
     
-    for piece_char, positions in all_pieces[color].items():
-        for pos in positions:
-            col, row = pos
-            possible = []
-            
-            if piece_char == '♟':
-                if row < 7 and (col, row + 1) not in all_pieces_map:
-                    possible.append((col, row + 1))
-                for dx in [-1, 1]:
-                    if 0 <= col + dx < 8 and (col + dx, row + 1) in all_pieces_map and all_pieces_map[(col + dx, row + 1)][1] != color:
-                        possible.append((col + dx, row + 1))
-            elif piece_char == '♙':
-                if row > 0 and (col, row - 1) not in all_pieces_map:
-                    possible.append((col, row - 1))
-                for dx in [-1, 1]:
-                    if 0 <= col + dx < 8 and (col + dx, row - 1) in all_pieces_map and all_pieces_map[(col + dx, row - 1)][1] != color:
-                        possible.append((col + dx, row - 1))
-            elif piece_char in ('♞', '♘'):
-                for dx, dy in [(-2,-1),(-2,1),(-1,-2),(-1,2),(1,-2),(1,2),(2,-1),(2,1)]:
-                    nx, ny = col + dx, row + dy
-                    if 0 <= nx < 8 and 0 <= ny < 8 and ((nx,ny) not in all_pieces_map or all_pieces_map[(nx,ny)][1] != color):
-                        possible.append((nx, ny))
-            elif piece_char in ('♜', '♖', '♝', '♗', '♛', '♕'):
-                if piece_char in ('♜', '♖', '♛', '♕'):
-                    dirs = [(0,1),(0,-1),(1,0),(-1,0)]
-                else:
-                    dirs = [(1,1),(1,-1),(-1,1),(-1,-1)]
-                if piece_char in ('♛', '♕'):
-                    dirs = [(0,1),(0,-1),(1,0),(-1,0),(1,1),(1,-1),(-1,1),(-1,-1)]
-                
-                for dx, dy in dirs:
-                    for i in range(1, 8):
-                        nx, ny = col + dx*i, row + dy*i
-                        if not (0 <= nx < 8 and 0 <= ny < 8):
-                            break
-                        if (nx,ny) in all_pieces_map:
-                            if all_pieces_map[(nx,ny)][1] != color:
-                                possible.append((nx, ny))
-                            break
-                        possible.append((nx, ny))
-            elif piece_char in ('♚', '♔'):
-                for dx, dy in [(0,1),(0,-1),(1,0),(-1,0),(1,1),(1,-1),(-1,1),(-1,-1)]:
-                    nx, ny = col + dx, row + dy
-                    if 0 <= nx < 8 and 0 <= ny < 8 and ((nx,ny) not in all_pieces_map or all_pieces_map[(nx,ny)][1] != color):
-                        possible.append((nx, ny))
-            
-            for move_dest in possible:
-                if is_move_valid(pos, move_dest, piece_char, color, all_pieces_map):
-                    score = 0
-                    if move_dest in all_pieces_map:
-                        score = piece_values.get(all_pieces_map[move_dest][0], 0) * 10
-                    moves.append((pos, move_dest, piece_char, score))
+    for pos, move_dest, piece_char in iter_legal_moves(color, all_pieces, all_pieces_map, last_move):
+        score = 0
+        if move_dest in all_pieces_map:
+            score = piece_values.get(all_pieces_map[move_dest][0], 0) * 10
+        elif piece_char in ('♟', '♙') and pos[0] != move_dest[0]:
+            moves.append((pos, move_dest, piece_char, 10))
+            continue
+        if piece_char in ('♟', '♙') and move_dest[1] in (0, 7):
+            for promotion in PROMOTION_PIECES[color]:
+                moves.append((pos, move_dest, piece_char, promotion, score + piece_values[promotion] * 10))
+        else:
+            moves.append((pos, move_dest, piece_char, score))
+    
+    if has_moved is not None:
+        for castle in castling_moves(color, all_pieces_map, has_moved):
+            moves.append(castle + (1,))
+    
+    moves.sort(key=lambda x: x[-1], reverse=True)
+    return [m[:-1] for m in moves]
+
+def generate_quiets_only(all_pieces, all_pieces_map, color, has_moved=None, last_move=None):
+    queen = PROMOTION_PIECES[color][0]
+    quiets = []
+    for move in generate_moves_fast(all_pieces, all_pieces_map, color, has_moved, last_move):
+        pos, dest, piece_char = move[0], move[1], move[2]
+        if len(move) > 3:
+            if move[3] != queen:
+                quiets.append(move)
+        elif dest not in all_pieces_map and not (piece_char in ('♟', '♙') and pos[0] != dest[0]):
+            quiets.append(move)
+    return quiets
+
+def is_move_legal(all_pieces_map, color, move, has_moved=None, last_move=None):
+    from ..chess.move_validation import is_move_valid
+    pos, dest, piece_char = move[0], move[1], move[2]
+    if all_pieces_map.get(pos) != (piece_char, color):
+        return False
+    target = all_pieces_map.get(dest)
+    if target and target[1] == color:
+        return False
+    
+    dx, dy = dest[0] - pos[0], dest[1] - pos[1]
+    captured_pos = None
+    if piece_char in ('♟', '♙'):
+        direction = 1 if piece_char == '♟' else -1
+        if (dest[1] in (0, 7)) != (len(move) > 3):
+            return False
+        if len(move) > 3 and move[3] not in PROMOTION_PIECES[color]:
+            return False
+        if dx == 0:
+            if target:
+                return False
+            if dy == 2 * direction:
+                if pos[1] != (1 if piece_char == '♟' else 6) or (pos[0], pos[1] + direction) in all_pieces_map:
+                    return False
+            elif dy != direction:
+                return False
+        elif abs(dx) == 1 and dy == direction:
+            if not target:
+                if dest != en_passant_target(last_move):
+                    return False
+                captured_pos = (dest[0], pos[1])
+        else:
+            return False
+    elif len(move) > 3:
+        return False
+    elif piece_char in ('♞', '♘'):
+        if (abs(dx), abs(dy)) not in ((1, 2), (2, 1)):
+            return False
+    elif piece_char in ('♚', '♔'):
+        if abs(dx) == 2 and dy == 0:
+            return has_moved is not None and move in castling_moves(color, all_pieces_map, has_moved)
+        if max(abs(dx), abs(dy)) != 1:
+            return False
+    else:
+        if dx == 0 and dy == 0:
+            return False
+        straight = dx == 0 or dy == 0
+        diagonal = abs(dx) == abs(dy)
+        if piece_char in ('♜', '♖') and not straight:
+            return False
+        if piece_char in ('♝', '♗') and not diagonal:
+            return False
+        if not (straight or diagonal):
+            return False
+        step_x = (dx > 0) - (dx < 0)
+        step_y = (dy > 0) - (dy < 0)
+        for i in range(1, max(abs(dx), abs(dy))):
+            if (pos[0] + step_x * i, pos[1] + step_y * i) in all_pieces_map:
+                return False
     
-    moves.sort(key=lambda x: x[3], reverse=True)
-    return [(m[0], m[1], m[2]) for m in moves]
\ No newline at end of file
+    return is_move_valid(pos, dest, piece_char, color, all_pieces_map, captured_pos)
@@ -0,0 +1,54 @@
+MAX_PLY = 64
+
+class MoveOrdering:
+    def __init__(self, max_ply=MAX_PLY):
+        self.killers = [[None, None] for _ in range(max_ply)]
+        self.history = {}
+    
+    def clear(self):
+        for slot in self.killers:
+            slot[0] = slot[1] = None
+        self.history.clear()
+    
+    def update(self, move, ply, depth):
+        if ply < len(self.killers):
+            slot = self.killers[ply]
+            if slot[0] != move:
+                slot[1] = slot[0]
+                slot[0] = move
+        key = (move[2], move[1])
+        self.history[key] = self.history.get(key, 0) + depth * depth
+    
+    def pick_moves(self, board, tt_move, ply):
+        if tt_move is not None and board.is_legal(tt_move):
+            yield tt_move
+        else:
+            tt_move = None
+        
+        winning = []
+        losing = []
+        for move in board.generate_captures():
+            if move != tt_move:
+                exchange = board.see(move)
+                if exchange < 0:
+                    losing.append(move)
+                else:
+                    winning.append((exchange, move))
+        winning.sort(key=lambda item: item[0], reverse=True)
+        for _, move in winning:
+            yield move
+        
+        killers = self.killers[ply] if ply < len(self.killers) else (None, None)
+        for killer in killers:
+            if killer is not None and killer != tt_move and not board.is_capture(killer) and board.is_legal(killer):
+                yield killer
+        
+        history = self.history
+        quiets = board.generate_quiets()
+        quiets.sort(key=lambda move: history.get((move[2], move[1]), 0), reverse=True)
+        for move in quiets:
+            if move != tt_move and move not in killers:
+                yield move
+        
+        for move in losing:
+            yield move
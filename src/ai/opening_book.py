@@ -0,0 +1,64 @@
+import os
+import mmap
+import random
+import struct
+from .transposition_table import encode_move, decode_move
+
+BOOK_RECORD = struct.Struct('<QIH')
+MAX_WEIGHT = (1 << 16) - 1
+DEFAULT_BOOK_PATH = 'opening_book.bin'
+
+class OpeningBook:
+    def __init__(self, path=DEFAULT_BOOK_PATH):
+        self.path = path
+        self.file = None
+        self.data = None
+        self.count = 0
+        if path and os.path.exists(path) and os.path.getsize(path) >= BOOK_RECORD.size:
+            self.file = open(path, 'rb')
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.count = len(self.data) // BOOK_RECORD.size
+    
+    def probe(self, hash_key):
+        data = self.data
+        size = BOOK_RECORD.size
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if BOOK_RECORD.unpack_from(data, middle * size)[0] < hash_key:
+                low = middle + 1
+            else:
+                high = middle
+        
+        entries = []
+        while low < self.count:
+            key, code, weight = BOOK_RECORD.unpack_from(data, low * size)
+            if key != hash_key:
+                break
+            entries.append((decode_move(code), weight))
+            low += 1
+        return entries
+    
+    def choose(self, hash_key, rng=random):
+        entries = self.probe(hash_key)
+        total = sum(weight for _, weight in entries)
+        if not total:
+            return None
+        pick = rng.randrange(total)
+        for move, weight in entries:
+            pick -= weight
+            if pick < 0:
+                return move
+    
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+            self.file.close()
+            self.data = self.file = None
+            self.count = 0
+
+def write_book(path, weights):
+    scale = max(1, -(-max(weights.values(), default=0) // MAX_WEIGHT))
+    with open(path, 'wb') as f:
+        for (hash_key, move), weight in sorted(weights.items(), key=lambda item: (item[0][0], encode_move(item[0][1]))):
+            f.write(BOOK_RECORD.pack(hash_key, encode_move(move), max(1, weight // scale)))
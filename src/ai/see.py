@@ -0,0 +1,77 @@
+from .zobrist import PIECES
+from .evaluation import MATERIAL_VALUES
+from ..chess.attack import PAWN_ATTACKERS, KNIGHT_TARGETS, KING_TARGETS, ORTHOGONAL_RAYS, DIAGONAL_RAYS, PAWN_CHARS, KNIGHT_CHARS, BISHOP_CHARS, ROOK_CHARS, QUEEN_CHARS, KING_CHARS
+
+SEE_VALUES = MATERIAL_VALUES[:5] + [20000]
+PIECE_SEE_VALUES = {piece_char: SEE_VALUES[index // 2] for index, piece_char in enumerate(PIECES)}
+
+def _first_sliders(square, rays, board_map, removed):
+    found = []
+    for ray in rays[square]:
+        for check_pos in ray:
+            if check_pos in removed:
+                continue
+            piece = board_map.get(check_pos)
+            if piece:
+                found.append((check_pos, piece))
+                break
+    return found
+
+def _square_index(pos):
+    return pos[1] * 8 + pos[0]
+
+def least_valuable_attacker(square, color, board_map, removed):
+    get = board_map.get
+    for chars, targets in ((PAWN_CHARS, PAWN_ATTACKERS[color]), (KNIGHT_CHARS, KNIGHT_TARGETS)):
+        piece = (chars[color], color)
+        found = [check_pos for check_pos in targets[square] if check_pos not in removed and get(check_pos) == piece]
+        if found:
+            return min(found, key=_square_index), piece[0]
+    
+    diagonal = _first_sliders(square, DIAGONAL_RAYS, board_map, removed)
+    orthogonal = _first_sliders(square, ORTHOGONAL_RAYS, board_map, removed)
+    for piece_char, sliders in ((BISHOP_CHARS[color], diagonal), (ROOK_CHARS[color], orthogonal), (QUEEN_CHARS[color], diagonal + orthogonal)):
+        found = [check_pos for check_pos, piece in sliders if piece == (piece_char, color)]
+        if found:
+            return min(found, key=_square_index), piece_char
+    
+    piece = (KING_CHARS[color], color)
+    for check_pos in KING_TARGETS[square]:
+        if check_pos not in removed and get(check_pos) == piece:
+            return check_pos, piece[0]
+    return None
+
+def static_exchange(board_map, move):
+    pos, dest, piece_char = move[0], move[1], move[2]
+    color = board_map[pos][1]
+    removed = {pos}
+    captured = board_map.get(dest)
+    if captured:
+        gain = [PIECE_SEE_VALUES[captured[0]]]
+    elif piece_char in ('♙', '♟') and pos[0] != dest[0]:
+        gain = [SEE_VALUES[0]]
+        removed.add((dest[0], pos[1]))
+    else:
+        gain = [0]
+    
+    attacker_value = PIECE_SEE_VALUES[piece_char]
+    if len(move) > 3:
+        attacker_value = PIECE_SEE_VALUES[move[3]]
+        gain[0] += attacker_value - SEE_VALUES[0]
+    
+    side = 'black' if color == 'white' else 'white'
+    while True:
+        attacker = least_valuable_attacker(dest, side, board_map, removed)
+        if attacker is None:
+            break
+        opponent = 'black' if side == 'white' else 'white'
+        if attacker[1] == KING_CHARS[side] and least_valuable_attacker(dest, opponent, board_map, removed | {attacker[0]}) is not None:
+            break
+        gain.append(attacker_value - gain[-1])
+        removed.add(attacker[0])
+        attacker_value = PIECE_SEE_VALUES[attacker[1]]
+        side = opponent
+    
+    for index in range(len(gain) - 1, 0, -1):
+        gain[index - 1] = -max(-gain[index - 1], gain[index])
+    return gain[0]
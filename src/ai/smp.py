@@ -0,0 +1,103 @@
+import copy
+import time
+import queue
+import multiprocessing
+from .engine import BOARD_BACKENDS, DEFAULT_BOARD_BACKEND, MAX_SEARCH_DEPTH
+from .minimax import aspiration_search, SearchTimeout, CancelFlag
+from .move_picker import MoveOrdering
+from .zobrist import ZobristHash
+from .transposition_table import SharedTranspositionTable
+from .tablebase import Tablebases
+
+HELPER_ACK_TIMEOUT = 1.0
+
+def helper_main(index, table_name, size_mb, requests, results, cancelled):
+    zobrist_hash = ZobristHash()
+    transposition_table = SharedTranspositionTable(size_mb, name=table_name)
+    tablebases = Tablebases()
+    
+    while True:
+        request = requests.get()
+        if request[0] == 'quit':
+            break
+        
+        _, request_id, generation, all_pieces, has_moved, last_move, is_in_check, ai_color, time_limit_ms, backend = request
+        stop = CancelFlag(cancelled, request_id)
+        if stop.is_set():
+            results.put((request_id, None, None, None))
+            continue
+        
+        transposition_table.generation = generation
+        deadline = time.perf_counter() + time_limit_ms / 1000
+        board = BOARD_BACKENDS[backend](all_pieces, ai_color, has_moved, last_move, zobrist_hash)
+        ordering = MoveOrdering()
+        nodes_checked = [0]
+        score = None
+        error = None
+        
+        for depth in range(1 + index % 2, MAX_SEARCH_DEPTH + 1):
+            try:
+                score, pv = aspiration_search(board, depth, score, is_in_check, nodes_checked, transposition_table, deadline, ordering, stop, tablebases)
+            except SearchTimeout:
+                break
+            except Exception as e:
+                error = f"Helper {index} error: {e}"
+                break
+            if pv:
+                results.put((request_id, depth, pv[0], None))
+        results.put((request_id, None, None, error))
+    
+    tablebases.close()
+    transposition_table.close()
+
+class HelperPool:
+    def __init__(self, transposition_table, count):
+        self.requests = [multiprocessing.Queue() for _ in range(count)]
+        self.results = multiprocessing.Queue()
+        self.cancelled = multiprocessing.RawValue('i', 0)
+        self.request_id = 0
+        self.last_error = None
+        self.processes = []
+        for index, requests in enumerate(self.requests):
+            process = multiprocessing.Process(target=helper_main, args=(index + 1, transposition_table.name, transposition_table.size_mb, requests, self.results, self.cancelled), daemon=True)
+            process.start()
+            self.processes.append(process)
+    
+    def start(self, all_pieces, has_moved, last_move, is_in_check, ai_color, time_limit_ms, generation, backend=DEFAULT_BOARD_BACKEND):
+        self.stop()
+        self.request_id += 1
+        request = ('search', self.request_id, generation, copy.deepcopy(all_pieces), dict(has_moved), dict(last_move or {}), dict(is_in_check), ai_color, time_limit_ms, backend)
+        for requests in self.requests:
+            requests.put(request)
+    
+    def stop(self):
+        self.cancelled.value = self.request_id
+    
+    def collect(self):
+        completed = []
+        pending = len(self.processes)
+        while pending:
+            try:
+                request_id, depth, move, error = self.results.get(timeout=HELPER_ACK_TIMEOUT)
+            except queue.Empty:
+                break
+            if request_id != self.request_id:
+                continue
+            if error:
+                self.last_error = error
+            if depth is None:
+                pending -= 1
+            else:
+                completed.append((depth, move))
+        return completed
+    
+    def take_error(self):
+        error, self.last_error = self.last_error, None
+        return error
+    
+    def close(self):
+        self.stop()
+        for requests in self.requests:
+            requests.put(('quit',))
+        for process in self.processes:
+            process.join(timeout=1)
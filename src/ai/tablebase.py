@@ -0,0 +1,315 @@
+import os
+import mmap
+from array import array
+from .bitboard import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, BISHOP_RAYS, ROOK_RAYS, sliding_attacks, WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+
+DEFAULT_TABLEBASE_DIR = 'tablebases'
+TABLEBASE_WIN = 100000
+MAX_PLIES = 254
+
+PIECE_LETTERS = 'PNBRQK'
+PIECE_ORDER = [KING, QUEEN, ROOK, BISHOP, KNIGHT, PAWN]
+PROMOTIONS = [QUEEN, ROOK, BISHOP, KNIGHT]
+
+def material_key(pieces):
+    sides = []
+    for color in (WHITE, BLACK):
+        kinds = sorted((piece >> 1 for piece in pieces if piece & 1 == color), key=PIECE_ORDER.index)
+        sides.append(''.join(PIECE_LETTERS[kind] for kind in kinds))
+    return 'v'.join(sides)
+
+def table_pieces(key):
+    pieces = []
+    for color, letters in enumerate(key.split('v')):
+        pieces.extend(PIECE_LETTERS.index(letter) * 2 + color for letter in letters)
+    return pieces
+
+def mirrored_key(key):
+    return 'v'.join(reversed(key.split('v')))
+
+def child_keys(key):
+    pieces = table_pieces(key)
+    children = []
+    for i, piece in enumerate(pieces):
+        if piece >> 1 == KING:
+            continue
+        children.append(pieces[:i] + pieces[i + 1:])
+        if piece >> 1 == PAWN:
+            children.extend(pieces[:i] + [promotion * 2 + (piece & 1)] + pieces[i + 1:] for promotion in PROMOTIONS)
+    keys = {material_key(child) for child in children if not insufficient_material(child)}
+    return sorted(min(key, mirrored_key(key)) for key in keys)
+
+def build_order(keys):
+    order = []
+    def visit(key):
+        if key in order or mirrored_key(key) in order:
+            return
+        for child in child_keys(key):
+            visit(child)
+        order.append(key)
+    for key in keys:
+        visit(key)
+    return order
+
+def insufficient_material(pieces):
+    others = [piece >> 1 for piece in pieces if piece >> 1 != KING]
+    return not others or (len(others) == 1 and others[0] in (BISHOP, KNIGHT))
+
+def encode_position(side, squares):
+    index = side
+    for square in squares:
+        index = index << 6 | square
+    return index
+
+def decode_position(index, count):
+    return index >> (6 * count), [(index >> (6 * (count - 1 - i))) & 63 for i in range(count)]
+
+def tablebase_score(value, ply):
+    if not value:
+        return 0
+    plies = value - 1
+    if plies & 1:
+        return TABLEBASE_WIN - plies - ply
+    return -(TABLEBASE_WIN - plies - ply)
+
+def attacks(piece, square, occupancy):
+    kind = piece >> 1
+    if kind == PAWN:
+        return PAWN_ATTACKS[piece & 1][square]
+    if kind == KNIGHT:
+        return KNIGHT_ATTACKS[square]
+    if kind == KING:
+        return KING_ATTACKS[square]
+    result = 0
+    if kind != ROOK:
+        result |= sliding_attacks(square, occupancy, BISHOP_RAYS)
+    if kind != BISHOP:
+        result |= sliding_attacks(square, occupancy, ROOK_RAYS)
+    return result
+
+def is_attacked(target, color, pieces, squares, occupancy, captured=-1):
+    bit = 1 << target
+    for i, piece in enumerate(pieces):
+        if i != captured and piece & 1 == color and attacks(piece, squares[i], occupancy) & bit:
+            return True
+    return False
+
+def generate_moves(pieces, squares, side, occupancy):
+    own = 0
+    for i, piece in enumerate(pieces):
+        if piece & 1 == side:
+            own |= 1 << squares[i]
+    king = squares[pieces.index(KING * 2 + side)]
+    
+    for i, piece in enumerate(pieces):
+        if piece & 1 != side:
+            continue
+        source = squares[i]
+        kind = piece >> 1
+        if kind == PAWN:
+            forward = -8 if side == WHITE else 8
+            targets = PAWN_ATTACKS[side][source] & occupancy & ~own
+            single = source + forward
+            if not occupancy >> single & 1:
+                targets |= 1 << single
+                if source >> 3 == (6 if side == WHITE else 1) and not occupancy >> (single + forward) & 1:
+                    targets |= 1 << (single + forward)
+        else:
+            targets = attacks(piece, source, occupancy) & ~own
+        
+        while targets:
+            low = targets & -targets
+            target = low.bit_length() - 1
+            targets ^= low
+            captured = squares.index(target) if occupancy & low else -1
+            moved = list(squares)
+            moved[i] = target
+            king_square = target if kind == KING else king
+            if is_attacked(king_square, 1 - side, pieces, moved, (occupancy ^ (1 << source)) | low, captured):
+                continue
+            if kind == PAWN and target >> 3 in (0, 7):
+                for promotion in PROMOTIONS:
+                    yield i, target, captured, promotion * 2 + side
+            else:
+                yield i, target, captured, -1
+
+def predecessors(pieces, squares, side, occupancy, kings):
+    mover = 1 - side
+    for i, piece in enumerate(pieces):
+        if piece & 1 != mover:
+            continue
+        target = squares[i]
+        if piece >> 1 == PAWN:
+            forward = -8 if mover == WHITE else 8
+            origins = 0
+            origin = target - forward
+            if 8 <= origin < 56 and not occupancy >> origin & 1:
+                origins |= 1 << origin
+                double = origin - forward
+                if double >> 3 == (6 if mover == WHITE else 1) and not occupancy >> double & 1:
+                    origins |= 1 << double
+        else:
+            origins = attacks(piece, target, occupancy) & ~occupancy
+        
+        while origins:
+            low = origins & -origins
+            origin = low.bit_length() - 1
+            origins ^= low
+            moved = list(squares)
+            moved[i] = origin
+            if is_attacked(moved[kings[side]], mover, pieces, moved, occupancy ^ (1 << target) ^ low):
+                continue
+            yield encode_position(mover, moved)
+
+def generate_table(key, tablebases):
+    pieces = table_pieces(key)
+    count = len(pieces)
+    size = 2 << (6 * count)
+    kings = [pieces.index(KING * 2 + WHITE), pieces.index(KING * 2 + BLACK)]
+    values = bytearray(size)
+    resolved = bytearray(size)
+    counters = bytearray(size)
+    escapes = bytearray(size)
+    exit_losses = array('H', bytes(2 * size))
+    buckets = [[] for _ in range(MAX_PLIES + 2)]
+    
+    for index in range(size):
+        side, squares = decode_position(index, count)
+        if len(set(squares)) < count:
+            continue
+        if any(piece >> 1 == PAWN and squares[i] >> 3 in (0, 7) for i, piece in enumerate(pieces)):
+            continue
+        occupancy = 0
+        for square in squares:
+            occupancy |= 1 << square
+        if is_attacked(squares[kings[1 - side]], side, pieces, squares, occupancy):
+            continue
+        
+        moves = exits = 0
+        best_win = 0
+        for i, target, captured, promotion in generate_moves(pieces, squares, side, occupancy):
+            if captured < 0 and promotion < 0:
+                moves += 1
+                continue
+            exits += 1
+            child_pieces = list(pieces)
+            child_squares = list(squares)
+            child_squares[i] = target
+            if promotion >= 0:
+                child_pieces[i] = promotion
+            if captured >= 0:
+                del child_pieces[captured]
+                del child_squares[captured]
+            value = tablebases.probe_position(child_pieces, child_squares, 1 - side)
+            if value is None:
+                raise ValueError(f"{key} needs the {material_key(child_pieces)} table, which has not been built")
+            if not value:
+                escapes[index] = 1
+            elif (value - 1) & 1:
+                exit_losses[index] = max(exit_losses[index], value)
+            elif not best_win or value < best_win:
+                best_win = value
+        
+        counters[index] = moves
+        if best_win:
+            escapes[index] = 1
+            buckets[best_win].append(index)
+        elif not moves and not exits:
+            if is_attacked(squares[kings[side]], 1 - side, pieces, squares, occupancy):
+                buckets[0].append(index)
+            else:
+                resolved[index] = 1
+        elif not moves and not escapes[index]:
+            buckets[exit_losses[index]].append(index)
+    
+    for ply in range(MAX_PLIES + 1):
+        for index in buckets[ply]:
+            if resolved[index]:
+                continue
+            resolved[index] = 1
+            values[index] = ply + 1
+            side, squares = decode_position(index, count)
+            occupancy = 0
+            for square in squares:
+                occupancy |= 1 << square
+            for previous in predecessors(pieces, squares, side, occupancy, kings):
+                if resolved[previous]:
+                    continue
+                if not ply & 1:
+                    buckets[ply + 1].append(previous)
+                else:
+                    counters[previous] -= 1
+                    if not counters[previous] and not escapes[previous] and exit_losses[previous] <= MAX_PLIES:
+                        buckets[max(ply + 1, exit_losses[previous])].append(previous)
+    
+    return values
+
+class Tablebases:
+    def __init__(self, directory=DEFAULT_TABLEBASE_DIR):
+        self.directory = directory
+        self.tables = {}
+        self.max_pieces = 0
+        if directory and os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if name.endswith('.tb'):
+                    self.tables[name[:-3]] = None
+                    self.max_pieces = max(self.max_pieces, len(name) - 4)
+    
+    def _table(self, key):
+        table = self.tables[key]
+        if table is None:
+            with open(os.path.join(self.directory, key + '.tb'), 'rb') as f:
+                table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.tables[key] = table
+        return table
+    
+    def probe_position(self, pieces, squares, side):
+        if insufficient_material(pieces):
+            return 0
+        key = material_key(pieces)
+        if key not in self.tables:
+            pieces = [piece ^ 1 for piece in pieces]
+            key = material_key(pieces)
+            if key not in self.tables:
+                return None
+            squares = [square ^ 56 for square in squares]
+            side = 1 - side
+        order = sorted(range(len(pieces)), key=lambda i: (pieces[i] & 1, PIECE_ORDER.index(pieces[i] >> 1)))
+        return self._table(key)[encode_position(side, [squares[i] for i in order])]
+    
+    def probe(self, board):
+        pieces, squares = board.piece_list()
+        return self.probe_position(pieces, squares, WHITE if board.side_to_move == 'white' else BLACK)
+    
+    def best_move(self, board):
+        if not self.max_pieces or board.piece_count() > self.max_pieces or self.probe(board) is None:
+            return None
+        best_move = None
+        best_rank = None
+        for move in board.generate_moves():
+            board.make_move(move)
+            value = self.probe(board)
+            board.unmake_move()
+            if value is None:
+                continue
+            plies = value - 1
+            if not value:
+                rank = (1, 0)
+            elif plies & 1:
+                rank = (2, -plies)
+            else:
+                rank = (0, plies)
+            if best_rank is None or rank < best_rank:
+                best_move, best_rank = move, rank
+        return best_move
+    
+    def close(self):
+        for key, table in self.tables.items():
+            if table is not None:
+                table.close()
+                self.tables[key] = None
+
+def write_table(directory, key, values):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, key + '.tb'), 'wb') as f:
+        f.write(values)
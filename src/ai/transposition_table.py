@@ -1,41 +1,242 @@
+from array import array
+from multiprocessing import shared_memory
+from .zobrist import PIECES
+from .tablebase import TABLEBASE_WIN, MAX_PLIES
+
 TT_EXACT = 0
 TT_LOWER = 1
 TT_UPPER = 2
 
+BUCKET_SIZE = 2
+ENTRY_BYTES = 4 + 1 + 4 + 1 + 4 + 1
+SHARED_ENTRY_BYTES = 8 + 8
+
+MATE_BOUND = TABLEBASE_WIN - 2 * MAX_PLIES
+
+SCORE_OFFSET = 1 << 20
+MOVE_MASK = (1 << 21) - 1
+SCORE_SHIFT, DEPTH_SHIFT, FLAG_SHIFT, GENERATION_SHIFT = 21, 42, 50, 52
+
+PIECE_INDEX = {piece: index for index, piece in enumerate(PIECES)}
+SQUARES = [(square % 8, square // 8) for square in range(64)]
+
+def score_to_tt(score, ply):
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+def score_from_tt(score, ply):
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
+
+def encode_move(move):
+    if move is None:
+        return 0
+    pos, dest = move[0], move[1]
+    code = 1 | (pos[1] * 8 + pos[0]) << 1 | (dest[1] * 8 + dest[0]) << 7 | PIECE_INDEX[move[2]] << 13
+    if len(move) > 3:
+        code |= (PIECE_INDEX[move[3]] + 1) << 17
+    return code
+
+def decode_move(code):
+    if not code:
+        return None
+    move = (SQUARES[(code >> 1) & 63], SQUARES[(code >> 7) & 63], PIECES[(code >> 13) & 15])
+    promotion = code >> 17
+    if promotion:
+        move += (PIECES[promotion - 1],)
+    return move
+
 class TranspositionTable:
     def __init__(self, size_mb=64):
-        self.max_entries = (size_mb * 1024 * 1024) // 32
-        self.table = {}
-    
-    def store(self, hash_key, depth, score, flag, best_move=None):
-        if hash_key not in self.table or self.table[hash_key]['depth'] <= depth:
-            self.table[hash_key] = {
-                'depth': depth,
-                'score': score,
-                'flag': flag,
-                'best_move': best_move
-            }
-    
-    def probe(self, hash_key, depth, alpha, beta):
-        if hash_key not in self.table:
+        self.resize(size_mb)
+    
+    def resize(self, size_mb):
+        self.size_mb = size_mb
+        max_entries = (size_mb * 1024 * 1024) // ENTRY_BYTES
+        num_buckets = 1
+        while num_buckets * 2 * BUCKET_SIZE <= max_entries:
+            num_buckets *= 2
+        self.bucket_mask = num_buckets - 1
+        self.max_entries = num_buckets * BUCKET_SIZE
+        
+        self.checks = array('I', [0]) * self.max_entries
+        self.depths = array('b', [0]) * self.max_entries
+        self.scores = array('i', [0]) * self.max_entries
+        self.flags = array('B', [0]) * self.max_entries
+        self.moves = array('I', [0]) * self.max_entries
+        self.generations = array('B', [0]) * self.max_entries
+        self.generation = 1
+        self.probes = 0
+        self.hits = 0
+    
+    def new_search(self):
+        self.generation = self.generation % 255 + 1
+    
+    def store(self, hash_key, depth, score, flag, best_move=None, ply=0):
+        check = hash_key >> 32
+        slot = (hash_key & self.bucket_mask) * BUCKET_SIZE
+        generations = self.generations
+        
+        if generations[slot] and self.checks[slot] != check and generations[slot] == self.generation and self.depths[slot] > depth:
+            slot += 1
+        
+        if generations[slot] and self.checks[slot] == check and self.depths[slot] > depth:
+            return
+        
+        if best_move is None and self.checks[slot] == check and generations[slot]:
+            best_move_code = self.moves[slot]
+        else:
+            best_move_code = encode_move(best_move)
+        
+        self.checks[slot] = check
+        self.depths[slot] = depth
+        self.scores[slot] = score_to_tt(score, ply)
+        self.flags[slot] = flag
+        self.moves[slot] = best_move_code
+        generations[slot] = self.generation
+    
+    def probe(self, hash_key, depth, alpha, beta, ply=0):
+        check = hash_key >> 32
+        slot = (hash_key & self.bucket_mask) * BUCKET_SIZE
+        self.probes += 1
+        
+        if not (self.generations[slot] and self.checks[slot] == check):
+            slot += 1
+            if not (self.generations[slot] and self.checks[slot] == check):
+                return None, None
+        
+        self.hits += 1
+        self.generations[slot] = self.generation
+        best_move = decode_move(self.moves[slot])
+        
+        if self.depths[slot] < depth:
+            return None, best_move
+        
+        score = score_from_tt(self.scores[slot], ply)
+        flag = self.flags[slot]
+        
+        if flag == TT_EXACT:
+            return score, best_move
+        elif flag == TT_LOWER and score >= beta:
+            return score, best_move
+        elif flag == TT_UPPER and score <= alpha:
+            return score, best_move
+        
+        return None, best_move
+    
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+    
+    def fill_ratio(self):
+        return self.generations.count(self.generation) / self.max_entries
+    
+    def clear(self):
+        self.resize(self.size_mb)
+
+def pack_entry(depth, score, flag, move_code, generation):
+    return move_code | (score + SCORE_OFFSET) << SCORE_SHIFT | (depth & 255) << DEPTH_SHIFT | flag << FLAG_SHIFT | generation << GENERATION_SHIFT
+
+class SharedTranspositionTable:
+    def __init__(self, size_mb=64, name=None):
+        self.size_mb = size_mb
+        max_entries = (size_mb * 1024 * 1024) // SHARED_ENTRY_BYTES
+        num_buckets = 1
+        while num_buckets * 2 * BUCKET_SIZE <= max_entries:
+            num_buckets *= 2
+        self.bucket_mask = num_buckets - 1
+        self.max_entries = num_buckets * BUCKET_SIZE
+        
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=self.max_entries * SHARED_ENTRY_BYTES)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.name = self.memory.name
+        self.words = self.memory.buf.cast('Q')
+        self.generation = 1
+        self.probes = 0
+        self.hits = 0
+    
+    def new_search(self):
+        self.generation = self.generation % 255 + 1
+    
+    def _find(self, hash_key, slot):
+        words = self.words
+        for index in (slot, slot + 1):
+            data = words[index * 2 + 1]
+            if data and words[index * 2] ^ data == hash_key:
+                return index, data
+        return -1, 0
+    
+    def store(self, hash_key, depth, score, flag, best_move=None, ply=0):
+        words = self.words
+        slot = (hash_key & self.bucket_mask) * BUCKET_SIZE
+        index, data = self._find(hash_key, slot)
+        
+        if index < 0:
+            index = slot
+            data = words[slot * 2 + 1]
+            if data and data >> GENERATION_SHIFT == self.generation and (data >> DEPTH_SHIFT) & 255 > depth:
+                index = slot + 1
+            move_code = encode_move(best_move)
+        else:
+            if (data >> DEPTH_SHIFT) & 255 > depth:
+                return
+            move_code = encode_move(best_move) if best_move is not None else data & MOVE_MASK
+        
+        data = pack_entry(depth, score_to_tt(score, ply), flag, move_code, self.generation)
+        words[index * 2 + 1] = data
+        words[index * 2] = hash_key ^ data
+    
+    def probe(self, hash_key, depth, alpha, beta, ply=0):
+        index, data = self._find(hash_key, (hash_key & self.bucket_mask) * BUCKET_SIZE)
+        self.probes += 1
+        if index < 0:
             return None, None
         
-        entry = self.table[hash_key]
+        self.hits += 1
+        if data >> GENERATION_SHIFT != self.generation:
+            refreshed = data & ~(255 << GENERATION_SHIFT) | self.generation << GENERATION_SHIFT
+            self.words[index * 2 + 1] = refreshed
+            self.words[index * 2] = hash_key ^ refreshed
+        best_move = decode_move(data & MOVE_MASK)
         
-        if entry['depth'] < depth:
-            return None, entry['best_move']
+        if (data >> DEPTH_SHIFT) & 255 < depth:
+            return None, best_move
         
-        score = entry['score']
-        flag = entry['flag']
+        score = score_from_tt(((data >> SCORE_SHIFT) & ((1 << 21) - 1)) - SCORE_OFFSET, ply)
+        flag = (data >> FLAG_SHIFT) & 3
         
         if flag == TT_EXACT:
-            return score, entry['best_move']
+            return score, best_move
         elif flag == TT_LOWER and score >= beta:
-            return score, entry['best_move']
+            return score, best_move
         elif flag == TT_UPPER and score <= alpha:
-            return score, entry['best_move']
+            return score, best_move
         
-        return None, entry['best_move']
+        return None, best_move
+    
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+    
+    def fill_ratio(self):
+        words = self.words
+        generation = self.generation
+        return sum(1 for index in range(1, self.max_entries * 2, 2) if words[index] >> GENERATION_SHIFT == generation) / self.max_entries
     
     def clear(self):
-        self.table.clear()
\ No newline at end of file
+        self.memory.buf[:] = bytes(self.max_entries * SHARED_ENTRY_BYTES)
+        self.probes = 0
+        self.hits = 0
+    
+    def close(self):
+        self.words.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
@@ -0,0 +1,158 @@
+import copy
+import time
+import atexit
+import queue
+import multiprocessing
+from .board import Board
+from .engine import get_best_ai_move, iterative_deepening, DEFAULT_TIME_LIMIT_MS, MAX_SEARCH_DEPTH
+from .zobrist import ZobristHash
+from .transposition_table import TranspositionTable, SharedTranspositionTable
+from .minimax import CancelFlag
+from .smp import HelperPool
+from .opening_book import OpeningBook, DEFAULT_BOOK_PATH
+from .tablebase import Tablebases
+
+PREDICTION_TIME_FRACTION = 0.25
+
+def build_pieces_map(all_pieces):
+    all_pieces_map = {}
+    for color, piece_set in all_pieces.items():
+        for piece_char, positions in piece_set.items():
+            for pos in positions:
+                all_pieces_map[pos] = (piece_char, color)
+    return all_pieces_map
+
+def ponder(all_pieces, has_moved, last_move, is_in_check, ai_color, time_limit_ms, zobrist_hash, transposition_table, stop, helpers=None, tablebases=None):
+    opponent = 'white' if ai_color == 'black' else 'black'
+    board = Board(all_pieces, opponent, has_moved, last_move, zobrist_hash)
+    try:
+        _, predicted = transposition_table.probe(board.hash, MAX_SEARCH_DEPTH, -999999, 999999)
+        if predicted is None or not board.is_legal(predicted):
+            predicted = iterative_deepening(all_pieces, is_in_check, zobrist_hash, transposition_table, has_moved, last_move, opponent, time_limit_ms * PREDICTION_TIME_FRACTION, stop=stop, helpers=helpers, tablebases=tablebases)
+        if predicted is None or stop.is_set():
+            return {}, None
+        
+        board.make_move(predicted)
+        start_time = time.perf_counter()
+        move = iterative_deepening(board.all_pieces, is_in_check, zobrist_hash, transposition_table, board.has_moved, board.last_move, ai_color, float('inf'), stop=stop, helpers=helpers, tablebases=tablebases)
+    except Exception as e:
+        return {}, f"Ponder error: {e}"
+    
+    if not move:
+        return {}, None
+    return {board.hash: (move, (time.perf_counter() - start_time) * 1000)}, None
+
+def worker_main(requests, results, cancelled, tt_size_mb, workers=1, book_path=DEFAULT_BOOK_PATH):
+    zobrist_hash = ZobristHash()
+    book = OpeningBook(book_path)
+    tablebases = Tablebases()
+    helpers = None
+    if workers > 1:
+        transposition_table = SharedTranspositionTable(size_mb=tt_size_mb)
+        helpers = HelperPool(transposition_table, workers - 1)
+    else:
+        transposition_table = TranspositionTable(size_mb=tt_size_mb)
+    pondered = {}
+    
+    while True:
+        request = requests.get()
+        if request[0] == 'quit':
+            break
+        if request[0] == 'clear':
+            transposition_table.clear()
+            pondered = {}
+            continue
+        
+        kind, request_id, all_pieces, has_moved, last_move, is_in_check, ai_color, time_limit_ms = request
+        stop = CancelFlag(cancelled, request_id)
+        if stop.is_set():
+            continue
+        
+        if kind == 'ponder':
+            pondered, error = ponder(all_pieces, has_moved, last_move, is_in_check, ai_color, time_limit_ms, zobrist_hash, transposition_table, stop, helpers, tablebases)
+            if error:
+                results.put((request_id, None, error))
+            if helpers is not None and helpers.last_error:
+                results.put((request_id, None, helpers.take_error()))
+            continue
+        
+        move = None
+        hash_key = zobrist_hash.compute_hash(all_pieces, ai_color, has_moved, last_move)
+        if hash_key in pondered:
+            move, elapsed_ms = pondered[hash_key]
+            if elapsed_ms < time_limit_ms / 2:
+                move = None
+                time_limit_ms -= elapsed_ms
+        pondered = {}
+        
+        if move is None:
+            all_pieces_map = build_pieces_map(all_pieces)
+            move = get_best_ai_move(all_pieces, all_pieces_map, ai_color, is_in_check, zobrist_hash, transposition_table, has_moved, last_move, ai_color, time_limit_ms, stop=stop, helpers=helpers, book=book, tablebases=tablebases)
+        if helpers is not None and helpers.last_error:
+            results.put((request_id, None, helpers.take_error()))
+        if not stop.is_set():
+            results.put((request_id, move, None))
+    
+    book.close()
+    tablebases.close()
+    if helpers is not None:
+        helpers.close()
+        transposition_table.close()
+
+class SearchWorker:
+    def __init__(self, tt_size_mb=64, workers=1, book_path=DEFAULT_BOOK_PATH):
+        self.requests = multiprocessing.Queue()
+        self.results = multiprocessing.Queue()
+        self.cancelled = multiprocessing.RawValue('i', 0)
+        self.request_id = 0
+        self.thinking = False
+        self.pondering = False
+        self.last_error = None
+        self.process = multiprocessing.Process(target=worker_main, args=(self.requests, self.results, self.cancelled, tt_size_mb, workers, book_path))
+        self.process.start()
+        atexit.register(self.close)
+    
+    def start_search(self, all_pieces, has_moved, last_move, is_in_check, ai_color, time_limit_ms=DEFAULT_TIME_LIMIT_MS):
+        self.cancel()
+        self.request_id += 1
+        self.requests.put(('search', self.request_id, copy.deepcopy(all_pieces), dict(has_moved), dict(last_move), dict(is_in_check), ai_color, time_limit_ms))
+        self.thinking = True
+    
+    def start_ponder(self, all_pieces, has_moved, last_move, is_in_check, ai_color, time_limit_ms=DEFAULT_TIME_LIMIT_MS):
+        self.cancel()
+        self.request_id += 1
+        self.last_error = None
+        self.requests.put(('ponder', self.request_id, copy.deepcopy(all_pieces), dict(has_moved), dict(last_move), dict(is_in_check), ai_color, time_limit_ms))
+        self.pondering = True
+    
+    def poll(self):
+        while True:
+            try:
+                request_id, move, error = self.results.get_nowait()
+            except queue.Empty:
+                return False, None
+            if error:
+                self.last_error = error
+            elif self.thinking and request_id == self.request_id:
+                self.thinking = False
+                return True, move
+    
+    def cancel(self):
+        if self.thinking or self.pondering:
+            self.cancelled.value = self.request_id
+            self.thinking = False
+            self.pondering = False
+    
+    def clear_table(self):
+        self.cancel()
+        self.last_error = None
+        self.requests.put(('clear',))
+    
+    def close(self):
+        if not self.process.is_alive():
+            return
+        self.cancel()
+        self.requests.put(('quit',))
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
@@ -1,46 +1,49 @@
 import random
 
+PIECES = ['♙', '♟', '♘', '♞', '♗', '♝', '♖', '♜', '♕', '♛', '♔', '♚']
+CASTLING_RIGHTS = ['white_king', 'black_king', 'white_rook_a', 'white_rook_h', 'black_rook_a', 'black_rook_h']
+
+PIECE_OFFSETS = {piece: index * 64 for index, piece in enumerate(PIECES)}
+CASTLING_INDEX = {key: index for index, key in enumerate(CASTLING_RIGHTS)}
+
 class ZobristHash:
     def __init__(self):
-        random.seed(42)
-        self.piece_keys = {}
-        self.side_key = random.getrandbits(64)
-        self.castling_keys = {}
-        self.en_passant_keys = [random.getrandbits(64) for _ in range(8)]
-        
-        pieces = ['♙', '♟', '♘', '♞', '♗', '♝', '♖', '♜', '♕', '♛', '♔', '♚']
-        for piece in pieces:
-            self.piece_keys[piece] = {}
-            for square in range(64):
-                self.piece_keys[piece][square] = random.getrandbits(64)
-        
-        self.castling_keys['white_king'] = random.getrandbits(64)
-        self.castling_keys['black_king'] = random.getrandbits(64)
-        self.castling_keys['white_rook_a'] = random.getrandbits(64)
-        self.castling_keys['white_rook_h'] = random.getrandbits(64)
-        self.castling_keys['black_rook_a'] = random.getrandbits(64)
-        self.castling_keys['black_rook_h'] = random.getrandbits(64)
+        rng = random.Random(42)
+        self.side_key = rng.getrandbits(64)
+        self.en_passant_keys = [rng.getrandbits(64) for _ in range(8)]
+        self.piece_keys = [rng.getrandbits(64) for _ in range(len(PIECES) * 64)]
+        self.castling_keys = [rng.getrandbits(64) for _ in range(len(CASTLING_RIGHTS))]
+    
+    def piece_key(self, piece_char, pos):
+        return self.piece_keys[PIECE_OFFSETS[piece_char] + pos[1] * 8 + pos[0]]
+    
+    def castling_key(self, key):
+        return self.castling_keys[CASTLING_INDEX[key]]
+    
+    def en_passant_key(self, last_move):
+        if last_move and last_move.get('piece') in ('♙', '♟'):
+            start = last_move.get('start')
+            end = last_move.get('end')
+            if start and end and abs(start[1] - end[1]) == 2:
+                return self.en_passant_keys[end[0]]
+        return 0
     
     def compute_hash(self, all_pieces, side_to_move, has_moved, last_move=None):
         hash_value = 0
         
         for color, piece_set in all_pieces.items():
             for piece_char, positions in piece_set.items():
+                offset = PIECE_OFFSETS[piece_char]
                 for col, row in positions:
-                    square = row * 8 + col
-                    hash_value ^= self.piece_keys[piece_char][square]
+                    hash_value ^= self.piece_keys[offset + row * 8 + col]
         
         if side_to_move == 'black':
             hash_value ^= self.side_key
         
         for key, value in has_moved.items():
             if not value:
-                hash_value ^= self.castling_keys[key]
+                hash_value ^= self.castling_keys[CASTLING_INDEX[key]]
         
-        if last_move and last_move.get('piece') in ('♙', '♟'):
-            start = last_move.get('start')
-            end = last_move.get('end')
-            if start and end and abs(start[1] - end[1]) == 2:
-                hash_value ^= self.en_passant_keys[end[0]]
+        hash_value ^= self.en_passant_key(last_move)
         
-        return hash_value
\ No newline at end of file
+        return hash_value
@@ -1,9 +1,15 @@
-from .attack import is_square_attacked
-from .move_validation import get_king_pos, is_move_valid, has_legal_moves
+from .attack import is_square_attacked, attacked_squares
+from .move_validation import get_king_pos, is_move_valid, has_legal_moves, find_checks_and_pins, iter_legal_moves
+from .fen import parse_fen, START_FEN
 
 __all__ = [
     'is_square_attacked',
+    'attacked_squares',
     'get_king_pos',
     'is_move_valid',
-    'has_legal_moves'
+    'has_legal_moves',
+    'find_checks_and_pins',
+    'iter_legal_moves',
+    'parse_fen',
+    'START_FEN'
 ]
\ No newline at end of file
@@ -1,45 +1,107 @@
+SQUARES = [(col, row) for row in range(8) for col in range(8)]
+
+KNIGHT_OFFSETS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
+KING_OFFSETS = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+ORTHOGONAL_DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+DIAGONAL_DIRECTIONS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+PAWN_CHARS = {'white': '♙', 'black': '♟'}
+KNIGHT_CHARS = {'white': '♘', 'black': '♞'}
+BISHOP_CHARS = {'white': '♗', 'black': '♝'}
+ROOK_CHARS = {'white': '♖', 'black': '♜'}
+QUEEN_CHARS = {'white': '♕', 'black': '♛'}
+KING_CHARS = {'white': '♔', 'black': '♚'}
+
+def _on_board(col, row):
+    return 0 <= col < 8 and 0 <= row < 8
+
+def _targets(offsets):
+    return {(col, row): tuple((col + dx, row + dy) for dx, dy in offsets if _on_board(col + dx, row + dy)) for col, row in SQUARES}
+
+def _rays(directions):
+    table = {}
+    for col, row in SQUARES:
+        rays = []
+        for dx, dy in directions:
+            ray = []
+            x, y = col + dx, row + dy
+            while _on_board(x, y):
+                ray.append((x, y))
+                x, y = x + dx, y + dy
+            if ray:
+                rays.append(tuple(ray))
+        table[(col, row)] = tuple(rays)
+    return table
+
+KNIGHT_TARGETS = _targets(KNIGHT_OFFSETS)
+KING_TARGETS = _targets(KING_OFFSETS)
+PAWN_TARGETS = {'white': _targets([(-1, -1), (1, -1)]), 'black': _targets([(-1, 1), (1, 1)])}
+PAWN_ATTACKERS = {'white': PAWN_TARGETS['black'], 'black': PAWN_TARGETS['white']}
+ORTHOGONAL_RAYS = _rays(ORTHOGONAL_DIRECTIONS)
+DIAGONAL_RAYS = _rays(DIAGONAL_DIRECTIONS)
+
 def is_square_attacked(square, attacker_color, all_pieces_map):
-    pawn_char = '♟' if attacker_color == 'black' else '♙'
-    pawn_dir = -1 if attacker_color == 'white' else 1
-    for dx in [-1, 1]:
-        check_pos = (square[0] + dx, square[1] - pawn_dir)
-        if all_pieces_map.get(check_pos) == (pawn_char, attacker_color):
+    get = all_pieces_map.get
+    
+    piece = (PAWN_CHARS[attacker_color], attacker_color)
+    for check_pos in PAWN_ATTACKERS[attacker_color][square]:
+        if get(check_pos) == piece:
             return True
-
-    knight_char = '♞' if attacker_color == 'black' else '♘'
-    offsets = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
-    for dx, dy in offsets:
-        check_pos = (square[0] + dx, square[1] + dy)
-        if all_pieces_map.get(check_pos) == (knight_char, attacker_color):
+    
+    piece = (KNIGHT_CHARS[attacker_color], attacker_color)
+    for check_pos in KNIGHT_TARGETS[square]:
+        if get(check_pos) == piece:
             return True
     
-    sliding_pieces = {
-        'rook': (['♖', '♜'], [(0, 1), (0, -1), (1, 0), (-1, 0)]),
-        'bishop': (['♗', '♝'], [(1, 1), (1, -1), (-1, 1), (-1, -1)]),
-        'queen': (['♕', '♛'], [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)])
-    }
+    queen = (QUEEN_CHARS[attacker_color], attacker_color)
+    piece = (ROOK_CHARS[attacker_color], attacker_color)
+    for ray in ORTHOGONAL_RAYS[square]:
+        for check_pos in ray:
+            piece_at_pos = get(check_pos)
+            if piece_at_pos:
+                if piece_at_pos == piece or piece_at_pos == queen:
+                    return True
+                break
     
-    for piece_type, (chars, directions) in sliding_pieces.items():
-        attacker_char = chars[0] if attacker_color == 'white' else chars[1]
-        queen_char = '♕' if attacker_color == 'white' else '♛'
-        
-        for dx, dy in directions:
-            for i in range(1, 8):
-                check_pos = (square[0] + dx * i, square[1] + dy * i)
-                if not (0 <= check_pos[0] < 8 and 0 <= check_pos[1] < 8):
-                    break
-                piece_at_pos = all_pieces_map.get(check_pos)
-                if piece_at_pos:
-                    if piece_at_pos[1] == attacker_color and (piece_at_pos[0] == attacker_char or piece_at_pos[0] == queen_char):
-                        return True
-                    break
-
-    king_char = '♚' if attacker_color == 'black' else '♔'
-    for dx in range(-1, 2):
-        for dy in range(-1, 2):
-            if dx == 0 and dy == 0: continue
-            check_pos = (square[0] + dx, square[1] + dy)
-            if all_pieces_map.get(check_pos) == (king_char, attacker_color):
-                return True
-                
-    return False
\ No newline at end of file
+    piece = (BISHOP_CHARS[attacker_color], attacker_color)
+    for ray in DIAGONAL_RAYS[square]:
+        for check_pos in ray:
+            piece_at_pos = get(check_pos)
+            if piece_at_pos:
+                if piece_at_pos == piece or piece_at_pos == queen:
+                    return True
+                break
+    
+    piece = (KING_CHARS[attacker_color], attacker_color)
+    for check_pos in KING_TARGETS[square]:
+        if get(check_pos) == piece:
+            return True
+    
+    return False
+
+def attacked_squares(attacker_color, all_pieces_map, transparent=None):
+    attacked = set()
+    pawn_targets = PAWN_TARGETS[attacker_color]
+    
+    for pos, (piece_char, color) in all_pieces_map.items():
+        if color != attacker_color:
+            continue
+        if piece_char in ('♙', '♟'):
+            attacked.update(pawn_targets[pos])
+        elif piece_char in ('♘', '♞'):
+            attacked.update(KNIGHT_TARGETS[pos])
+        elif piece_char in ('♔', '♚'):
+            attacked.update(KING_TARGETS[pos])
+        else:
+            rays = ()
+            if piece_char not in ('♗', '♝'):
+                rays = ORTHOGONAL_RAYS[pos]
+            if piece_char not in ('♖', '♜'):
+                rays = rays + DIAGONAL_RAYS[pos]
+            for ray in rays:
+                for check_pos in ray:
+                    attacked.add(check_pos)
+                    if check_pos in all_pieces_map and check_pos != transparent:
+                        break
+    
+    return attacked
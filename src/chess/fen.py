@@ -0,0 +1,40 @@
+FEN_PIECES = {
+    'P': ('♙', 'white'), 'N': ('♘', 'white'), 'B': ('♗', 'white'), 'R': ('♖', 'white'), 'Q': ('♕', 'white'), 'K': ('♔', 'white'),
+    'p': ('♟', 'black'), 'n': ('♞', 'black'), 'b': ('♝', 'black'), 'r': ('♜', 'black'), 'q': ('♛', 'black'), 'k': ('♚', 'black')
+}
+
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+def parse_fen(fen):
+    fields = fen.split()
+    all_pieces = {'white': {}, 'black': {}}
+    for row, rank in enumerate(fields[0].split('/')):
+        col = 0
+        for symbol in rank:
+            if symbol.isdigit():
+                col += int(symbol)
+                continue
+            piece_char, color = FEN_PIECES[symbol]
+            all_pieces[color].setdefault(piece_char, []).append((col, row))
+            col += 1
+    
+    side_to_move = 'white' if len(fields) < 2 or fields[1] == 'w' else 'black'
+    rights = fields[2] if len(fields) > 2 else '-'
+    has_moved = {
+        'white_king': 'K' not in rights and 'Q' not in rights,
+        'black_king': 'k' not in rights and 'q' not in rights,
+        'white_rook_a': 'Q' not in rights,
+        'white_rook_h': 'K' not in rights,
+        'black_rook_a': 'q' not in rights,
+        'black_rook_h': 'k' not in rights
+    }
+    
+    last_move = {'piece': None, 'start': None, 'end': None, 'turn': 0}
+    if len(fields) > 3 and fields[3] != '-':
+        col, row = ord(fields[3][0]) - ord('a'), 8 - int(fields[3][1])
+        if side_to_move == 'white':
+            last_move = {'piece': '♟', 'start': (col, row - 1), 'end': (col, row + 1), 'turn': 0}
+        else:
+            last_move = {'piece': '♙', 'start': (col, row + 1), 'end': (col, row - 1), 'turn': 0}
+    
+    return all_pieces, side_to_move, has_moved, last_move
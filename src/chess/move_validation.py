@@ -1,4 +1,10 @@
-from .attack import is_square_attacked
+from .attack import (
+    is_square_attacked, attacked_squares, KNIGHT_TARGETS, KING_TARGETS, PAWN_TARGETS, PAWN_ATTACKERS,
+    ORTHOGONAL_RAYS, DIAGONAL_RAYS
+)
+
+ORTHOGONAL_SLIDERS = ('♖', '♜', '♕', '♛')
+DIAGONAL_SLIDERS = ('♗', '♝', '♕', '♛')
 
 def get_king_pos(color, all_pieces_map):
     king_char = '♔' if color == 'white' else '♚'
@@ -7,101 +13,144 @@ def get_king_pos(color, all_pieces_map):
             return pos
     return None
 
-def is_move_valid(source_pos, dest_pos, piece_char, piece_color, all_pieces_map):
+def is_move_valid(source_pos, dest_pos, piece_char, piece_color, all_pieces_map, captured_pos=None):
     temp_map = dict(all_pieces_map)
     
     temp_map[dest_pos] = (piece_char, piece_color)
     del temp_map[source_pos]
+    if captured_pos is not None:
+        del temp_map[captured_pos]
     
     king_pos = get_king_pos(piece_color, temp_map)
     if king_pos and is_square_attacked(king_pos, 'black' if piece_color == 'white' else 'white', temp_map):
         return False
-        
+    
     return True
 
-def has_legal_moves(color, all_pieces, all_pieces_map):
-    opponent_color = 'black' if color == 'white' else 'white'
+def find_checks_and_pins(king_pos, color, all_pieces_map):
+    opponent = 'black' if color == 'white' else 'white'
+    checkers = []
+    evasions = set()
+    pinned = {}
+    
+    pawn = ('♟' if opponent == 'black' else '♙', opponent)
+    for square in PAWN_ATTACKERS[opponent][king_pos]:
+        if all_pieces_map.get(square) == pawn:
+            checkers.append(square)
+            evasions.add(square)
+    knight = ('♞' if opponent == 'black' else '♘', opponent)
+    for square in KNIGHT_TARGETS[king_pos]:
+        if all_pieces_map.get(square) == knight:
+            checkers.append(square)
+            evasions.add(square)
+    
+    for rays, sliders in ((ORTHOGONAL_RAYS, ORTHOGONAL_SLIDERS), (DIAGONAL_RAYS, DIAGONAL_SLIDERS)):
+        for ray in rays[king_pos]:
+            blocker = None
+            for i, square in enumerate(ray):
+                piece = all_pieces_map.get(square)
+                if piece is None:
+                    continue
+                if piece[1] == color:
+                    if blocker is not None:
+                        break
+                    blocker = square
+                    continue
+                if piece[0] in sliders:
+                    if blocker is None:
+                        checkers.append(square)
+                        evasions.update(ray[:i + 1])
+                    else:
+                        pinned[blocker] = set(ray[:i + 1])
+                break
+    
+    return checkers, evasions, pinned
+
+def iter_legal_moves(color, all_pieces, all_pieces_map, last_move=None, captures_only=False):
+    opponent = 'black' if color == 'white' else 'white'
+    king_char = '♔' if color == 'white' else '♚'
+    king_positions = all_pieces[color].get(king_char)
+    king_pos = king_positions[0] if king_positions else None
+    
+    if king_pos is not None:
+        checkers, evasions, pinned = find_checks_and_pins(king_pos, color, all_pieces_map)
+        attacked = attacked_squares(opponent, all_pieces_map, transparent=king_pos)
+        for dest in KING_TARGETS[king_pos]:
+            target = all_pieces_map.get(dest)
+            if dest in attacked or (target and target[1] == color) or (captures_only and not target):
+                continue
+            yield (king_pos, dest, king_char)
+        if len(checkers) > 1:
+            return
+    else:
+        checkers, evasions, pinned = [], None, {}
+    
+    if not checkers:
+        evasions = None
+    
+    ep_target = None
+    if last_move and last_move.get('piece') in ('♙', '♟'):
+        start, end = last_move.get('start'), last_move.get('end')
+        if start and end and abs(start[1] - end[1]) == 2:
+            ep_target = (end[0], (start[1] + end[1]) // 2)
     
     for piece_char, positions in all_pieces[color].items():
-        for pos in list(positions):
-            col, row = pos
-            possible_moves = []
+        if piece_char == king_char:
+            continue
+        for pos in positions:
+            allowed = pinned.get(pos)
+            targets = []
             
             if piece_char in ('♙', '♟'):
-                if piece_char == '♙':
-                    if row > 0 and (col, row - 1) not in all_pieces_map:
-                        possible_moves.append((col, row - 1))
-                    if row == 6 and (col, row - 1) not in all_pieces_map and (col, row - 2) not in all_pieces_map:
-                        possible_moves.append((col, row - 2))
-                    for dx in [-1, 1]:
-                        if 0 <= col + dx < 8 and (col + dx, row - 1) in all_pieces_map and all_pieces_map[(col + dx, row - 1)][1] == 'black':
-                            possible_moves.append((col + dx, row - 1))
-                else:
-                    if row < 7 and (col, row + 1) not in all_pieces_map:
-                        possible_moves.append((col, row + 1))
-                    if row == 1 and (col, row + 1) not in all_pieces_map and (col, row + 2) not in all_pieces_map:
-                        possible_moves.append((col, row + 2))
-                    for dx in [-1, 1]:
-                        if 0 <= col + dx < 8 and (col + dx, row + 1) in all_pieces_map and all_pieces_map[(col + dx, row + 1)][1] == 'white':
-                            possible_moves.append((col + dx, row + 1))
-            
+                direction = 1 if piece_char == '♟' else -1
+                for dest in PAWN_TARGETS[color][pos]:
+                    target = all_pieces_map.get(dest)
+                    if target and target[1] == opponent:
+                        targets.append(dest)
+                    elif dest == ep_target:
+                        captured_pos = (dest[0], pos[1])
+                        temp_map = dict(all_pieces_map)
+                        del temp_map[pos]
+                        del temp_map[captured_pos]
+                        temp_map[dest] = (piece_char, color)
+                        if king_pos is None or not is_square_attacked(king_pos, opponent, temp_map):
+                            yield (pos, dest, piece_char)
+                dest = (pos[0], pos[1] + direction)
+                if (not captures_only or dest[1] in (0, 7)) and 0 <= dest[1] < 8 and dest not in all_pieces_map:
+                    targets.append(dest)
+                    if not captures_only and pos[1] == (1 if piece_char == '♟' else 6):
+                        dest = (pos[0], pos[1] + 2 * direction)
+                        if dest not in all_pieces_map:
+                            targets.append(dest)
             elif piece_char in ('♘', '♞'):
-                offsets = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
-                for dx, dy in offsets:
-                    nx, ny = col + dx, row + dy
-                    if 0 <= nx < 8 and 0 <= ny < 8:
-                        if (nx, ny) not in all_pieces_map or all_pieces_map[(nx, ny)][1] != color:
-                            possible_moves.append((nx, ny))
-            
-            elif piece_char in ('♖', '♜'):
-                directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-                for dx, dy in directions:
-                    for i in range(1, 8):
-                        nx, ny = col + dx * i, row + dy * i
-                        if not (0 <= nx < 8 and 0 <= ny < 8):
-                            break
-                        if (nx, ny) in all_pieces_map:
-                            if all_pieces_map[(nx, ny)][1] != color:
-                                possible_moves.append((nx, ny))
-                            break
-                        possible_moves.append((nx, ny))
-            
-            elif piece_char in ('♗', '♝'):
-                directions = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
-                for dx, dy in directions:
-                    for i in range(1, 8):
-                        nx, ny = col + dx * i, row + dy * i
-                        if not (0 <= nx < 8 and 0 <= ny < 8):
-                            break
-                        if (nx, ny) in all_pieces_map:
-                            if all_pieces_map[(nx, ny)][1] != color:
-                                possible_moves.append((nx, ny))
+                targets = KNIGHT_TARGETS[pos]
+            else:
+                rays = ()
+                if piece_char in ORTHOGONAL_SLIDERS:
+                    rays = ORTHOGONAL_RAYS[pos]
+                if piece_char in DIAGONAL_SLIDERS:
+                    rays = rays + DIAGONAL_RAYS[pos]
+                for ray in rays:
+                    for dest in ray:
+                        if dest in all_pieces_map:
+                            targets.append(dest)
                             break
-                        possible_moves.append((nx, ny))
+                        targets.append(dest)
             
-            elif piece_char in ('♕', '♛'):
-                directions = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
-                for dx, dy in directions:
-                    for i in range(1, 8):
-                        nx, ny = col + dx * i, row + dy * i
-                        if not (0 <= nx < 8 and 0 <= ny < 8):
-                            break
-                        if (nx, ny) in all_pieces_map:
-                            if all_pieces_map[(nx, ny)][1] != color:
-                                possible_moves.append((nx, ny))
-                            break
-                        possible_moves.append((nx, ny))
-            
-            elif piece_char in ('♔', '♚'):
-                directions = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
-                for dx, dy in directions:
-                    nx, ny = col + dx, row + dy
-                    if 0 <= nx < 8 and 0 <= ny < 8:
-                        if (nx, ny) not in all_pieces_map or all_pieces_map[(nx, ny)][1] != color:
-                            possible_moves.append((nx, ny))
-            
-            for move in possible_moves:
-                if is_move_valid(pos, move, piece_char, color, all_pieces_map):
-                    return True
-    
-    return False
\ No newline at end of file
+            for dest in targets:
+                target = all_pieces_map.get(dest)
+                if target:
+                    if target[1] == color:
+                        continue
+                elif captures_only and not (piece_char in ('♙', '♟') and dest[1] in (0, 7)):
+                    continue
+                if allowed is not None and dest not in allowed:
+                    continue
+                if evasions is not None and dest not in evasions:
+                    continue
+                yield (pos, dest, piece_char)
+
+def has_legal_moves(color, all_pieces, all_pieces_map, last_move=None):
+    for _ in iter_legal_moves(color, all_pieces, all_pieces_map, last_move):
+        return True
+    return False
@@ -8,11 +8,11 @@ def load_settings():
                 return json.load(f)
     except:
         pass
-    return {'colorblind_mode': False, 'game_mode': 'pvp', 'ai_color': 'black'}
+    return {'colorblind_mode': False, 'game_mode': 'pvp', 'ai_color': 'black', 'ai_time_ms': 1000, 'ai_ponder': True, 'ai_workers': 1}
 
-def save_settings(colorblind_mode, game_mode, ai_color='black'):
+def save_settings(colorblind_mode, game_mode, ai_color='black', ai_time_ms=1000, ai_ponder=True, ai_workers=1):
     try:
         with open('chess_settings.json', 'w') as f:
-            json.dump({'colorblind_mode': colorblind_mode, 'game_mode': game_mode, 'ai_color': ai_color}, f)
+            json.dump({'colorblind_mode': colorblind_mode, 'game_mode': game_mode, 'ai_color': ai_color, 'ai_time_ms': ai_time_ms, 'ai_ponder': ai_ponder, 'ai_workers': ai_workers}, f)
     except:
         pass
\ No newline at end of file
@@ -1,3 +1,4 @@
 from .kernel import Kernel
+from .scheduler import FrameScheduler
 
-__all__ = ['Kernel']
\ No newline at end of file
+__all__ = ['Kernel', 'FrameScheduler']
\ No newline at end of file
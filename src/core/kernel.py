@@ -1,37 +1,117 @@
 import os
+import time
 import ctypes
+from array import array
+
+SPAN_MERGE_GAP = 8
+SPAN_CHUNK = 16
+BLANK_CHAR = ord(' ')
+
+class COORD(ctypes.Structure):
+    _fields_ = [("X", ctypes.c_short), ("Y", ctypes.c_short)]
 
 class Kernel:
-    def __init__(self, width, height):
+    def __init__(self, width, height, console=True):
         self.width = width
         self.height = height
-        self.attribute_buffer = [[0x0000 for _ in range(width)] for _ in range(height)]
-        self.char_buffer = [[' ' for _ in range(width)] for _ in range(height)]
+        self.size = width * height
+        self.attribute_buffer = array('H', [0x0000]) * self.size
+        self.char_buffer = array('H', [BLANK_CHAR]) * self.size
         self.game_state = 'IN_GAME'
         self.pixel_color = 0x00F0
         self.background_color = 0x0000
-
-        self.h_stdout = ctypes.windll.kernel32.GetStdHandle(-11)
-        self.csbi = ctypes.create_string_buffer(22)
-        ctypes.windll.kernel32.GetConsoleScreenBufferInfo(self.h_stdout, self.csbi)
-
+        
+        self.presented = False
+        self.presented_attributes = array('H', [0x0000]) * self.size
+        self.presented_chars = array('H', [BLANK_CHAR]) * self.size
+        self.attribute_view = memoryview(self.attribute_buffer)
+        self.char_view = memoryview(self.char_buffer)
+        self.presented_attribute_view = memoryview(self.presented_attributes)
+        self.presented_char_view = memoryview(self.presented_chars)
+        self.attribute_address = self.attribute_buffer.buffer_info()[0]
+        self.char_address = self.char_buffer.buffer_info()[0]
+        self.written = ctypes.c_ulong(0)
+        
+        self.frames_presented = 0
+        self.frames_skipped = 0
+        self.frame_cells_written = 0
+        self.frame_spans_written = 0
+        self.total_cells_written = 0
+        
+        self.h_stdout = None
+        self.h_stdin = None
+        if console:
+            self.h_stdout = ctypes.windll.kernel32.GetStdHandle(-11)
+            self.h_stdin = ctypes.windll.kernel32.GetStdHandle(-10)
+            self.csbi = ctypes.create_string_buffer(22)
+            ctypes.windll.kernel32.GetConsoleScreenBufferInfo(self.h_stdout, self.csbi)
+    
     def clear_screen(self):
         os.system('cls')
-
-    def draw_buffer(self):
-        class COORD(ctypes.Structure):
-            _fields_ = [("X", ctypes.c_short), ("Y", ctypes.c_short)]
+        self.presented = False
+    
+    def wait_for_input(self, timeout):
+        if self.h_stdin is None:
+            time.sleep(timeout)
+            return False
+        if ctypes.windll.kernel32.WaitForSingleObject(self.h_stdin, int(timeout * 1000)) != 0:
+            return False
+        ctypes.windll.kernel32.FlushConsoleInputBuffer(self.h_stdin)
+        return True
+    
+    def changed_spans(self):
+        if not self.presented:
+            return [(0, self.size)]
         
-        coord = COORD(0, 0)
-        written = ctypes.c_ulong(0)
+        attributes, chars = self.attribute_buffer, self.char_buffer
+        presented_attributes, presented_chars = self.presented_attributes, self.presented_chars
+        if attributes == presented_attributes and chars == presented_chars:
+            return []
         
-        flat_attributes = [item for sublist in self.attribute_buffer for item in sublist]
-        attribute_buffer_c = (ctypes.c_ushort * len(flat_attributes))(*flat_attributes)
+        attribute_view, char_view = self.attribute_view, self.char_view
+        presented_attribute_view, presented_char_view = self.presented_attribute_view, self.presented_char_view
+        spans = []
+        for row_start in range(0, self.size, self.width):
+            row_end = row_start + self.width
+            if attribute_view[row_start:row_end] == presented_attribute_view[row_start:row_end] and char_view[row_start:row_end] == presented_char_view[row_start:row_end]:
+                continue
+            
+            for chunk_start in range(row_start, row_end, SPAN_CHUNK):
+                chunk_end = min(chunk_start + SPAN_CHUNK, row_end)
+                if attribute_view[chunk_start:chunk_end] == presented_attribute_view[chunk_start:chunk_end] and char_view[chunk_start:chunk_end] == presented_char_view[chunk_start:chunk_end]:
+                    continue
+                for c in range(chunk_start, chunk_end):
+                    if attributes[c] == presented_attributes[c] and chars[c] == presented_chars[c]:
+                        continue
+                    if spans and c - spans[-1][1] <= SPAN_MERGE_GAP:
+                        spans[-1] = (spans[-1][0], c + 1)
+                    else:
+                        spans.append((c, c + 1))
+        return spans
+    
+    def write_span(self, start, end):
+        if self.h_stdout is None:
+            return
+        coord = COORD(start % self.width, start // self.width)
         ctypes.windll.kernel32.WriteConsoleOutputAttribute(
-            self.h_stdout, attribute_buffer_c, len(flat_attributes), coord, ctypes.byref(written)
+            self.h_stdout, ctypes.c_void_p(self.attribute_address + start * self.attribute_buffer.itemsize), end - start, coord, ctypes.byref(self.written)
         )
-
-        flat_chars = "".join("".join(row) for row in self.char_buffer)
         ctypes.windll.kernel32.WriteConsoleOutputCharacterW(
-            self.h_stdout, flat_chars, len(flat_chars), coord, ctypes.byref(written)
-        )
\ No newline at end of file
+            self.h_stdout, ctypes.c_void_p(self.char_address + start * self.char_buffer.itemsize), end - start, coord, ctypes.byref(self.written)
+        )
+    
+    def draw_buffer(self):
+        spans = self.changed_spans()
+        self.frame_spans_written = len(spans)
+        self.frame_cells_written = sum(end - start for start, end in spans)
+        if not spans:
+            self.frames_skipped += 1
+            return
+        
+        for start, end in spans:
+            self.write_span(start, end)
+            self.presented_attribute_view[start:end] = self.attribute_view[start:end]
+            self.presented_char_view[start:end] = self.char_view[start:end]
+        self.presented = True
+        self.frames_presented += 1
+        self.total_cells_written += self.frame_cells_written
@@ -0,0 +1,63 @@
+import time
+
+RESIZE_CHECK_INTERVAL = 0.5
+INPUT_LINGER = 1.0
+
+class FrameScheduler:
+    def __init__(self, kernel, tick_rate, fps):
+        self.kernel = kernel
+        self.tick = 1.0 / tick_rate
+        self.frame_interval = 1.0 / fps
+        self.last_input = -INPUT_LINGER
+        self.last_frame = -self.frame_interval
+        self.last_resize_check = time.perf_counter()
+        self.dirty = True
+        self.busy = False
+        self.wakeups = 0
+        self.frames = 0
+    
+    def set_fps(self, fps):
+        self.frame_interval = 1.0 / fps
+    
+    def invalidate(self):
+        self.dirty = True
+    
+    def input_active(self, now=None):
+        if now is None:
+            now = time.perf_counter()
+        return now - self.last_input < INPUT_LINGER
+    
+    def timeout(self, now):
+        if self.input_active(now) or self.busy:
+            timeout = self.tick
+        else:
+            timeout = self.last_resize_check + RESIZE_CHECK_INTERVAL - now
+        if self.dirty:
+            timeout = min(timeout, self.last_frame + self.frame_interval - now)
+        return max(timeout, 0.0)
+    
+    def wait(self):
+        now = time.perf_counter()
+        got_input = self.kernel.wait_for_input(self.timeout(now))
+        self.wakeups += 1
+        if got_input:
+            self.last_input = time.perf_counter()
+        if got_input or self.input_active():
+            self.dirty = True
+        return got_input
+    
+    def resize_due(self):
+        now = time.perf_counter()
+        if now - self.last_resize_check < RESIZE_CHECK_INTERVAL:
+            return False
+        self.last_resize_check = now
+        return True
+    
+    def frame_due(self):
+        now = time.perf_counter()
+        if not self.dirty or now - self.last_frame < self.frame_interval:
+            return False
+        self.dirty = False
+        self.last_frame = now
+        self.frames += 1
+        return True
@@ -0,0 +1,120 @@
+import sys
+import time
+import random
+from ..ai.board import Board
+from ..ai.zobrist import ZobristHash
+from ..chess.attack import is_square_attacked, attacked_squares
+
+START_PIECES = {
+    'white': {'♖': [(0, 7), (7, 7)], '♘': [(1, 7), (6, 7)], '♗': [(2, 7), (5, 7)], '♕': [(3, 7)], '♔': [(4, 7)], '♙': [(i, 6) for i in range(8)]},
+    'black': {'♜': [(0, 0), (7, 0)], '♞': [(1, 0), (6, 0)], '♝': [(2, 0), (5, 0)], '♛': [(3, 0)], '♚': [(4, 0)], '♟': [(i, 1) for i in range(8)]}
+}
+START_RIGHTS = {'white_king': False, 'black_king': False, 'white_rook_a': False, 'white_rook_h': False, 'black_rook_a': False, 'black_rook_h': False}
+
+def reference_is_square_attacked(square, attacker_color, all_pieces_map):
+    pawn_char = '♟' if attacker_color == 'black' else '♙'
+    pawn_dir = -1 if attacker_color == 'white' else 1
+    for dx in [-1, 1]:
+        check_pos = (square[0] + dx, square[1] - pawn_dir)
+        if all_pieces_map.get(check_pos) == (pawn_char, attacker_color):
+            return True
+    
+    knight_char = '♞' if attacker_color == 'black' else '♘'
+    offsets = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
+    for dx, dy in offsets:
+        check_pos = (square[0] + dx, square[1] + dy)
+        if all_pieces_map.get(check_pos) == (knight_char, attacker_color):
+            return True
+    
+    sliding_pieces = {
+        'rook': (['♖', '♜'], [(0, 1), (0, -1), (1, 0), (-1, 0)]),
+        'bishop': (['♗', '♝'], [(1, 1), (1, -1), (-1, 1), (-1, -1)]),
+        'queen': (['♕', '♛'], [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)])
+    }
+    
+    for piece_type, (chars, directions) in sliding_pieces.items():
+        attacker_char = chars[0] if attacker_color == 'white' else chars[1]
+        queen_char = '♕' if attacker_color == 'white' else '♛'
+        
+        for dx, dy in directions:
+            for i in range(1, 8):
+                check_pos = (square[0] + dx * i, square[1] + dy * i)
+                if not (0 <= check_pos[0] < 8 and 0 <= check_pos[1] < 8):
+                    break
+                piece_at_pos = all_pieces_map.get(check_pos)
+                if piece_at_pos:
+                    if piece_at_pos[1] == attacker_color and (piece_at_pos[0] == attacker_char or piece_at_pos[0] == queen_char):
+                        return True
+                    break
+    
+    king_char = '♚' if attacker_color == 'black' else '♔'
+    for dx in range(-1, 2):
+        for dy in range(-1, 2):
+            if dx == 0 and dy == 0: continue
+            check_pos = (square[0] + dx, square[1] + dy)
+            if all_pieces_map.get(check_pos) == (king_char, attacker_color):
+                return True
+    
+    return False
+
+def sample_positions(count, seed=1, max_plies=60):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board(START_PIECES, 'white', START_RIGHTS, None, ZobristHash())
+        for _ in range(rng.randint(0, max_plies)):
+            moves = board.generate_moves()
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+        positions.append(dict(board.all_pieces_map))
+    return positions
+
+def time_calls(function, positions, rounds):
+    squares = [(col, row) for row in range(8) for col in range(8)]
+    calls = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for board_map in positions:
+            for color in ('white', 'black'):
+                for square in squares:
+                    function(square, color, board_map)
+                calls += 64
+    return calls / (time.perf_counter() - start)
+
+def time_maps(positions, rounds):
+    calls = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for board_map in positions:
+            attacked_squares('white', board_map)
+            attacked_squares('black', board_map)
+            calls += 2
+    return calls / (time.perf_counter() - start)
+
+def verify(positions):
+    squares = [(col, row) for row in range(8) for col in range(8)]
+    for board_map in positions:
+        for color in ('white', 'black'):
+            attacked = attacked_squares(color, board_map)
+            for square in squares:
+                expected = reference_is_square_attacked(square, color, board_map)
+                if is_square_attacked(square, color, board_map) != expected or (square in attacked) != expected:
+                    raise AssertionError(f"attack mismatch at {square} for {color}")
+
+def main(argv):
+    rounds = int(argv[0]) if argv else 20
+    positions = sample_positions(50)
+    verify(positions)
+    
+    before = time_calls(reference_is_square_attacked, positions, rounds)
+    after = time_calls(is_square_attacked, positions, rounds)
+    maps = time_maps(positions, rounds)
+    
+    print(f"positions: {len(positions)}, rounds: {rounds}")
+    print(f"is_square_attacked (ray walk):     {before:12,.0f} calls/s")
+    print(f"is_square_attacked (tables):       {after:12,.0f} calls/s  ({after / before:.2f}x)")
+    print(f"attacked_squares (64 squares/map): {maps:12,.0f} maps/s  = {maps * 64:,.0f} squares/s")
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,163 @@
+import sys
+import json
+import time
+import platform
+import argparse
+from ..ai.engine import iterative_deepening, BOARD_BACKENDS, DEFAULT_BOARD_BACKEND, MAX_SEARCH_DEPTH
+from ..ai.zobrist import ZobristHash
+from ..ai.transposition_table import TranspositionTable
+from ..chess.fen import parse_fen, START_FEN
+from .smp_bench import in_check
+from .perft import move_name
+
+BENCH_POSITIONS = [
+    START_FEN,
+    'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 10',
+    '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 11',
+    '4rrk1/pp1n3p/3q2pQ/2p1pb2/2PP4/2P3N1/P2B2PP/4RRK1 b - - 7 19',
+    'rq3rk1/ppp2ppp/1bnpb3/3N2B1/3NP3/7P/PPPQ1PP1/2KR3R w - - 7 14',
+    'r1bq1r1k/1pp1n1pp/1p1p4/4p2Q/4Pp2/1BNP4/PPP2PPP/3R1RK1 w - - 2 14',
+    'r3r1k1/2p2ppp/p1p1bn2/8/1q2P3/2NPQN2/PPP3PP/R4RK1 b - - 2 15',
+    'r1bbk1nr/pp3p1p/2n5/1N4p1/2Np1B2/8/PPP2PPP/2KR1B1R w kq - 0 13',
+    'r1bq1rk1/ppp1nppp/4n3/3p3Q/3P4/1BP1B3/PP1N2PP/R4RK1 w - - 1 16',
+    '4r1k1/r1q2ppp/ppp2n2/4P3/5Rb1/1N1BQ3/PPP3PP/R5K1 w - - 1 17',
+    '2rqkb1r/ppp2p2/2npb1p1/1N1Nn2p/2P1PP2/8/PP2B1PP/R1BQK2R b KQ - 0 11',
+    'r1bq1r1k/b1p1npp1/p2p3p/1p6/3PP3/1B2NN2/PP3PPP/R2Q1RK1 w - - 1 16',
+    '3r1rk1/p5pp/bpp1pp2/8/q1PP1P2/b3P3/P2NQRPP/1R2B1K1 b - - 6 22',
+    'r1q2rk1/2p1bppp/2Pp4/p6b/Q1PNp3/4B3/PP1R1PPP/2K4R w - - 2 18',
+    '4k2r/1pb2ppp/1p2p3/1R1p4/3P4/2r1PN2/P4PPP/1R4K1 b - - 3 22',
+    '3q2k1/pb3p1p/4pbp1/2r5/PpN2N2/1P2P2P/5PP1/Q2R2K1 b - - 4 26',
+    'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3',
+    'r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4',
+    'rnbqkb1r/pp2pppp/3p1n2/8/3NP3/8/PPP2PPP/RNBQKB1R w KQkq - 1 5',
+    'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+    'r3k2r/3nnpbp/q2pp1p1/p7/Pp1PPPP1/4BNN1/1P5P/R2Q1RK1 w kq - 0 16',
+    '4rrk1/1p1nq3/p7/2p1P1pp/3P2bp/3Q1Bn1/PPPB4/1K2R1R1 b - - 40 21',
+    '2r3k1/pp3ppp/4p3/3n4/3P4/P4N2/1P3PPP/2R3K1 b - - 0 25',
+    '6k1/6p1/6Pp/ppp5/3pn2P/1P3K2/1PP2P2/8 b - - 3 54',
+    '3b4/5kp1/1p1p1p1p/pP1PpP1P/P1P1P3/3KN3/8/8 w - - 0 1',
+    '2K5/p7/7P/5pR1/8/5k2/r7/8 w - - 0 1',
+    '8/6pk/1p6/8/PP3p1p/5P2/4KP1q/3Q4 w - - 0 1',
+    '7k/3p2pp/4q3/8/4Q3/5Kp1/P6b/8 w - - 0 1',
+    '8/2p5/8/2kPKp1p/2p4P/2P5/3P4/8 w - - 0 1',
+    '8/1p3pp1/7p/5P1P/2k3P1/8/2K2P2/8 w - - 0 1',
+    '8/pp2r1k1/2p1p3/3pP2p/1P1P1P1P/P5KR/8/8 w - - 0 1',
+    '5k2/7R/4P2p/5K2/p1r2P1p/8/8/8 b - - 0 1',
+    '6k1/6p1/P6p/r1N5/5p2/7P/1b3PP1/4R1K1 w - - 0 1',
+    '6k1/4pp1p/3p2p1/P1pPb3/R7/1r2P1PP/3B1P2/6K1 w - - 0 1',
+    '8/5pk1/6p1/8/3R4/6P1/5PK1/3r4 w - - 0 40',
+    '8/8/8/8/5kp1/P7/8/1K1N4 w - - 0 1',
+    '8/8/1P6/5pr1/8/4R3/7k/2K5 w - - 0 1',
+    '8/2p4P/8/kr6/6R1/8/8/1K6 w - - 0 1',
+    '8/8/3P3k/8/1p6/8/1P6/1K3n2 b - - 0 1',
+    'q3k3/8/8/1N6/8/8/8/4K3 w - - 0 1'
+]
+DEFAULT_DEPTH = 5
+DEFAULT_THRESHOLD = 15.0
+
+def bench_position(fen, backend, depth, time_ms, zobrist_hash, transposition_table):
+    all_pieces, side_to_move, has_moved, last_move = parse_fen(fen)
+    checks = in_check(all_pieces)
+    transposition_table.clear()
+    stats = {}
+    start = time.perf_counter()
+    move = iterative_deepening(all_pieces, checks, zobrist_hash, transposition_table, has_moved, last_move, side_to_move, time_ms, max_depth=depth, backend=backend, stats=stats)
+    elapsed = time.perf_counter() - start
+    return {
+        'fen': fen,
+        'move': move_name(move) if move else None,
+        'depth': stats['depth'],
+        'score': stats['score'],
+        'nodes': stats['nodes'],
+        'seconds': round(elapsed, 4),
+        'nps': round(stats['nodes'] / max(elapsed, 1e-9)),
+        'tt_hit_rate': round(transposition_table.hit_rate(), 4),
+        'depth_times': [round(seconds, 4) for seconds in stats['depth_times']]
+    }
+
+def run_bench(backend, depth, time_ms, size_mb):
+    time_limit_ms = 3600 * 1000 if time_ms is None else time_ms
+    zobrist_hash = ZobristHash()
+    transposition_table = TranspositionTable(size_mb)
+    results = []
+    for index, fen in enumerate(BENCH_POSITIONS, 1):
+        result = bench_position(fen, backend, depth, time_limit_ms, zobrist_hash, transposition_table)
+        results.append(result)
+        print(f"{index:3} {result['move'] or '-':6} depth {result['depth']:2}  nodes {result['nodes']:9,}  {result['seconds']:7.3f}s  nps {result['nps']:8,}  tt {result['tt_hit_rate']:6.1%}")
+    
+    nodes = sum(result['nodes'] for result in results)
+    seconds = sum(result['seconds'] for result in results)
+    max_depth = max(len(result['depth_times']) for result in results)
+    time_to_depth = {}
+    for reached in range(1, max_depth + 1):
+        times = [result['depth_times'][reached - 1] for result in results if len(result['depth_times']) >= reached]
+        time_to_depth[str(reached)] = round(sum(times) / len(times), 4)
+    
+    return {
+        'mode': 'depth' if time_ms is None else 'time',
+        'depth': depth,
+        'time_ms': time_ms,
+        'backend': backend,
+        'tt_size_mb': size_mb,
+        'python': platform.python_version(),
+        'positions': len(results),
+        'nodes': nodes,
+        'seconds': round(seconds, 4),
+        'nps': round(nodes / max(seconds, 1e-9)),
+        'tt_hit_rate': round(sum(result['tt_hit_rate'] for result in results) / len(results), 4),
+        'time_to_depth': time_to_depth,
+        'results': results
+    }
+
+def compare(report, baseline, threshold):
+    for key in ('mode', 'depth', 'time_ms', 'backend', 'positions'):
+        if report[key] != baseline.get(key):
+            print(f"warning: baseline {key} is {baseline.get(key)!r}, this run is {report[key]!r}")
+    
+    change = report['nps'] / baseline['nps'] - 1
+    print(f"nps: {report['nps']:,} vs baseline {baseline['nps']:,} ({change:+.1%})")
+    print(f"nodes: {report['nodes']:,} vs baseline {baseline['nodes']:,} ({report['nodes'] / baseline['nodes'] - 1:+.1%})")
+    
+    moves = [(index, result['move'], previous['move']) for index, (result, previous) in enumerate(zip(report['results'], baseline['results']), 1) if result['move'] != previous['move']]
+    for index, move, previous in moves:
+        print(f"position {index}: move {move} (baseline {previous})")
+    
+    if change < -threshold / 100:
+        print(f"REGRESSION: throughput dropped more than {threshold:g}%")
+        return False
+    return True
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m src.tools.bench', description='Search a fixed set of positions and report engine throughput.')
+    parser.add_argument('--depth', type=int, default=None, help=f'search every position to this depth (default {DEFAULT_DEPTH})')
+    parser.add_argument('--time', type=int, default=None, dest='time_ms', help='search every position for this many milliseconds instead')
+    parser.add_argument('--backend', choices=sorted(BOARD_BACKENDS), default=DEFAULT_BOARD_BACKEND)
+    parser.add_argument('--hash', type=int, default=16, dest='size_mb', help='transposition table size in MB')
+    parser.add_argument('--output', default='bench.json', help='write the results to this JSON file')
+    parser.add_argument('--baseline', default=None, help='compare against results written by an earlier run')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed nps drop against the baseline, in percent')
+    args = parser.parse_args(argv)
+    
+    if args.time_ms is None:
+        depth = args.depth or DEFAULT_DEPTH
+    else:
+        depth = args.depth or MAX_SEARCH_DEPTH
+    
+    print(f"positions: {len(BENCH_POSITIONS)}, " + (f"depth: {depth}" if args.time_ms is None else f"time: {args.time_ms} ms") + f", backend: {args.backend}")
+    report = run_bench(args.backend, depth, args.time_ms, args.size_mb)
+    
+    print(f"\nnodes: {report['nodes']:,}  time: {report['seconds']:.2f}s  nps: {report['nps']:,}  tt hit rate: {report['tt_hit_rate']:.1%}")
+    print('time to depth: ' + '  '.join(f"{depth}: {seconds:.3f}s" for depth, seconds in report['time_to_depth'].items()))
+    
+    with open(args.output, 'w') as output:
+        json.dump(report, output, indent=2)
+    print(f"results written to {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            if not compare(report, json.load(baseline), args.threshold):
+                return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
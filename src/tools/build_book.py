@@ -0,0 +1,119 @@
+import os
+import re
+import sys
+import argparse
+from ..ai.board import Board
+from ..ai.zobrist import ZobristHash
+from ..ai.opening_book import write_book, DEFAULT_BOOK_PATH
+from ..chess.fen import parse_fen, START_FEN
+
+SAN_PIECES = {'N': ('♘', '♞'), 'B': ('♗', '♝'), 'R': ('♖', '♜'), 'Q': ('♕', '♛'), 'K': ('♔', '♚')}
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+
+def read_games(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    text = re.sub(r'\{[^}]*\}|;[^\n]*', ' ', text)
+    games = []
+    tokens = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith('['):
+            if tokens:
+                games.append(tokens)
+                tokens = []
+            continue
+        tokens.extend(line.replace('(', ' ( ').replace(')', ' ) ').split())
+    if tokens:
+        games.append(tokens)
+    return [strip_variations(tokens) for tokens in games]
+
+def strip_variations(tokens):
+    moves = []
+    nesting = 0
+    for token in tokens:
+        if token == '(':
+            nesting += 1
+        elif token == ')':
+            nesting -= 1
+        elif nesting == 0 and token not in RESULTS and not token.startswith('$'):
+            token = re.sub(r'^\d+\.+', '', token)
+            if token:
+                moves.append(token)
+    return moves
+
+def parse_san(board, san):
+    color = board.side_to_move
+    side = 0 if color == 'white' else 1
+    san = san.rstrip('+#!?')
+    moves = board.generate_moves()
+    
+    if san in ('O-O', '0-0', 'O-O-O', '0-0-0'):
+        column = 6 if len(san) == 3 else 2
+        for move in moves:
+            if move[2] == SAN_PIECES['K'][side] and move[0][0] == 4 and move[1][0] == column:
+                return move
+        return None
+    
+    promotion = None
+    if '=' in san:
+        san, promoted = san.split('=')
+        promotion = SAN_PIECES[promoted[0]][side]
+    elif san[-1] in 'NBRQ':
+        promotion = SAN_PIECES[san[-1]][side]
+        san = san[:-1]
+    
+    piece_char = '♙' if color == 'white' else '♟'
+    if san[0] in SAN_PIECES:
+        piece_char = SAN_PIECES[san[0]][side]
+        san = san[1:]
+    dest = (ord(san[-2]) - ord('a'), 8 - int(san[-1]))
+    hint = san[:-2].replace('x', '')
+    
+    for move in moves:
+        if move[2] != piece_char or move[1] != dest:
+            continue
+        if (move[3] if len(move) > 3 else None) != promotion:
+            continue
+        if any(not ('a' <= symbol <= 'h' and move[0][0] == ord(symbol) - ord('a')) and not ('1' <= symbol <= '8' and move[0][1] == 8 - int(symbol)) for symbol in hint):
+            continue
+        return move
+    return None
+
+def build(games, max_plies, zobrist_hash):
+    start = parse_fen(START_FEN)
+    weights = {}
+    skipped = 0
+    for tokens in games:
+        board = Board(start[0], start[1], start[2], start[3], zobrist_hash)
+        for san in tokens[:max_plies]:
+            try:
+                move = parse_san(board, san)
+            except (ValueError, IndexError, KeyError):
+                move = None
+            if move is None:
+                skipped += 1
+                break
+            key = (board.hash, move)
+            weights[key] = weights.get(key, 0) + 1
+            board.make_move(move)
+    return weights, skipped
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m src.tools.build_book', description='Compile an opening book from a PGN file.')
+    parser.add_argument('pgn', help='games to read')
+    parser.add_argument('output', nargs='?', default=DEFAULT_BOOK_PATH, help=f"book file to write (default: {DEFAULT_BOOK_PATH})")
+    parser.add_argument('max_plies', nargs='?', type=int, default=20, help='plies of each game to add (default: 20)')
+    args = parser.parse_args(argv)
+    if not os.path.isfile(args.pgn):
+        parser.error(f"no such file: {args.pgn}")
+    
+    games = read_games(args.pgn)
+    weights, skipped = build(games, args.max_plies, ZobristHash())
+    write_book(args.output, weights)
+    positions = len({hash_key for hash_key, _ in weights})
+    print(f"games: {len(games)}, positions: {positions}, entries: {len(weights)}, unreadable games: {skipped}")
+    print(f"wrote {args.output}")
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
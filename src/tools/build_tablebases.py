@@ -0,0 +1,25 @@
+import sys
+import time
+from ..ai.tablebase import Tablebases, generate_table, write_table, build_order, mirrored_key, DEFAULT_TABLEBASE_DIR
+
+DEFAULT_TABLES = ['KQvK', 'KRvK', 'KPvK']
+
+def main(argv):
+    keys = argv or DEFAULT_TABLES
+    directory = DEFAULT_TABLEBASE_DIR
+    for key in build_order(keys):
+        start = time.perf_counter()
+        tablebases = Tablebases(directory)
+        if key not in keys and (key in tablebases.tables or mirrored_key(key) in tablebases.tables):
+            tablebases.close()
+            continue
+        values = generate_table(key, tablebases)
+        tablebases.close()
+        write_table(directory, key, values)
+        
+        wins = sum(1 for value in values if value and (value - 1) & 1)
+        longest = max((value - 1 for value in values if value), default=0)
+        print(f"{key}: {len(values):,} positions, {wins:,} wins for the side to move, longest mate {longest} plies, {time.perf_counter() - start:.1f}s")
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
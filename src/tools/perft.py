@@ -0,0 +1,94 @@
+import sys
+import time
+import argparse
+from ..ai.engine import BOARD_BACKENDS, DEFAULT_BOARD_BACKEND
+from ..ai.zobrist import ZobristHash
+from ..chess.fen import parse_fen, START_FEN
+
+REFERENCE_POSITIONS = [
+    ('start position', START_FEN, [20, 400, 8902, 197281, 4865609]),
+    ('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1', [48, 2039, 97862, 4085603]),
+    ('rook endgame', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', [14, 191, 2812, 43238, 674624]),
+    ('promotions', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1', [6, 264, 9467, 422333]),
+    ('discovered checks', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', [44, 1486, 62379, 2103487]),
+    ('middlegame', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10', [46, 2079, 89890, 3894594])
+]
+
+def perft(board, depth):
+    moves = board.generate_moves()
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+def divide(board, depth):
+    counts = []
+    for move in board.generate_moves():
+        board.make_move(move)
+        counts.append((move, perft(board, depth - 1)))
+        board.unmake_move()
+    return counts
+
+def move_name(move):
+    name = ''.join(chr(ord('a') + col) + str(8 - row) for col, row in move[:2])
+    if len(move) > 3:
+        name += {'♕': 'q', '♛': 'q', '♖': 'r', '♜': 'r', '♗': 'b', '♝': 'b', '♘': 'n', '♞': 'n'}[move[3]]
+    return name
+
+def load_board(fen, backend, zobrist_hash):
+    all_pieces, side_to_move, has_moved, last_move = parse_fen(fen)
+    return BOARD_BACKENDS[backend](all_pieces, side_to_move, has_moved, last_move, zobrist_hash)
+
+def run_suite(backend, max_depth, max_nodes):
+    zobrist_hash = ZobristHash()
+    total_nodes = 0
+    total_time = 0
+    failures = 0
+    for name, fen, expected in REFERENCE_POSITIONS:
+        board = load_board(fen, backend, zobrist_hash)
+        for depth, count in enumerate(expected[:max_depth], 1):
+            if count > max_nodes:
+                break
+            start = time.perf_counter()
+            nodes = perft(board, depth)
+            elapsed = time.perf_counter() - start
+            total_nodes += nodes
+            total_time += elapsed
+            status = 'ok' if nodes == count else f"FAIL (expected {count:,})"
+            failures += nodes != count
+            print(f"{name:18} depth {depth}  {nodes:>12,}  {nodes / max(elapsed, 1e-9):>10,.0f} nps  {status}")
+    print(f"{backend}: {total_nodes:,} nodes in {total_time:.2f}s, {total_nodes / max(total_time, 1e-9):,.0f} nps, {failures} failures")
+    return failures
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m src.tools.perft', description='Count leaf nodes of the legal move tree.')
+    parser.add_argument('depth', nargs='?', type=int, default=3)
+    parser.add_argument('--fen', default=None, help='position to count (default: run the reference suite)')
+    parser.add_argument('--divide', action='store_true', help='print the node count below each root move')
+    parser.add_argument('--backend', choices=sorted(BOARD_BACKENDS), default=DEFAULT_BOARD_BACKEND)
+    parser.add_argument('--max-nodes', type=int, default=1000000, help='skip suite depths with more nodes than this')
+    args = parser.parse_args(argv)
+    
+    if args.fen is None:
+        return 1 if run_suite(args.backend, args.depth, args.max_nodes) else 0
+    
+    board = load_board(args.fen, args.backend, ZobristHash())
+    start = time.perf_counter()
+    if args.divide:
+        counts = divide(board, args.depth)
+        for move, nodes in sorted(counts, key=lambda item: move_name(item[0])):
+            print(f"{move_name(move)}: {nodes}")
+        nodes = sum(nodes for _, nodes in counts)
+        print(f"\nmoves: {len(counts)}")
+    else:
+        nodes = perft(board, args.depth)
+    elapsed = time.perf_counter() - start
+    print(f"nodes: {nodes:,}  time: {elapsed:.2f}s  nps: {nodes / max(elapsed, 1e-9):,.0f}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
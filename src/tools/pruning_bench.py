@@ -0,0 +1,64 @@
+import sys
+import time
+from ..ai import minimax
+from ..ai.bitboard import BitBoard
+from ..ai.zobrist import ZobristHash
+from ..ai.move_picker import MoveOrdering
+from ..ai.transposition_table import TranspositionTable
+from ..chess.fen import parse_fen
+from .smp_bench import POSITIONS, in_check
+from .perft import move_name
+
+TACTICS = [
+    ('q3k3/8/8/1N6/8/8/8/4K3 w - - 0 1', 'b5c7'),
+    ('8/8/2n1k3/8/3PP3/8/8/4K3 w - - 0 1', 'd4d5'),
+    ('4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1', 'd2d5'),
+    ('4k3/8/8/8/8/4n3/8/R3K3 b - - 0 1', 'e3c2')
+]
+SWITCHES = ['NULL_MOVE_PRUNING', 'LATE_MOVE_REDUCTIONS', 'FUTILITY_PRUNING', 'RAZORING', 'DELTA_PRUNING', 'SEE_PRUNING']
+CONFIGURATIONS = [
+    ('full width', []),
+    ('null move', ['NULL_MOVE_PRUNING']),
+    ('LMR', ['LATE_MOVE_REDUCTIONS']),
+    ('futility', ['FUTILITY_PRUNING']),
+    ('razoring', ['RAZORING']),
+    ('delta', ['DELTA_PRUNING']),
+    ('SEE', ['SEE_PRUNING']),
+    ('all', SWITCHES)
+]
+
+def search(fen, depth, zobrist_hash):
+    all_pieces, side_to_move, has_moved, last_move = parse_fen(fen)
+    board = BitBoard(all_pieces, side_to_move, has_moved, last_move, zobrist_hash)
+    transposition_table = TranspositionTable(size_mb=16)
+    transposition_table.new_search()
+    ordering = MoveOrdering()
+    nodes_checked = [0]
+    score = None
+    for iteration in range(1, depth + 1):
+        score, pv = minimax.aspiration_search(board, iteration, score, in_check(all_pieces), nodes_checked, transposition_table, None, ordering)
+    return nodes_checked[0], move_name(pv[0]) if pv else None
+
+def main(argv):
+    depth = int(argv[0]) if argv else 5
+    zobrist_hash = ZobristHash()
+    reference = None
+    
+    print(f"positions: {len(POSITIONS)}, tactics: {len(TACTICS)}, depth: {depth}")
+    for name, enabled in CONFIGURATIONS:
+        for switch in SWITCHES:
+            setattr(minimax, switch, switch in enabled)
+        start = time.perf_counter()
+        results = [search(fen, depth, zobrist_hash) for fen in POSITIONS]
+        elapsed = time.perf_counter() - start
+        solved = sum(search(fen, depth, zobrist_hash)[1] == expected for fen, expected in TACTICS)
+        
+        nodes = sum(result[0] for result in results)
+        moves = [result[1] for result in results]
+        if reference is None:
+            reference = (nodes, moves)
+        agree = sum(move == expected for move, expected in zip(moves, reference[1]))
+        print(f"{name:16} nodes {nodes:9,}  ({nodes / reference[0]:5.1%})  {elapsed:6.2f}s  same move {agree}/{len(moves)}  tactics {solved}/{len(TACTICS)}")
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,111 @@
+import sys
+import time
+from ..core.kernel import Kernel
+from ..ui.renderer import WindowManager
+from ..ui.board_view import BoardView, board_layout
+from ..chess.fen import parse_fen
+from ..chess.move_validation import get_king_pos
+from ..ai.evaluation import calculate_material_advantage
+
+SIZES = [(80, 24), (240, 60)]
+SCENE_FEN = 'r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4'
+MARKED_CELLS = [(5, 7)]
+POSSIBLE_MOVES = [(4, 6), (5, 6), (6, 6), (7, 5)]
+MENU_OPTIONS = ["Resume", "Restart", "Game Mode", "FPS Select", "Exit"]
+
+def draw_board(wm, kernel, all_pieces, all_pieces_map, player_col, player_row, is_in_check, colors):
+    wm.clear_buffers(kernel)
+    
+    box_w, box_h, start_x, start_y = board_layout(kernel.width, kernel.height)
+    white, grey, dark_green, light_yellow, red, cursor_highlight = colors
+    
+    for row in range(8):
+        for col in range(8):
+            color = white if (row + col) % 2 == 0 else grey
+            if (is_in_check['white'] and (col, row) == get_king_pos('white', all_pieces_map)) or (is_in_check['black'] and (col, row) == get_king_pos('black', all_pieces_map)):
+                color = red
+            elif row == player_row and col == player_col:
+                color = cursor_highlight
+            elif (col, row) in MARKED_CELLS:
+                color = dark_green
+            elif (col, row) in POSSIBLE_MOVES:
+                color = light_yellow
+            
+            draw_x, draw_y = start_x + col * box_w, start_y + row * box_h
+            if (col, row) in POSSIBLE_MOVES:
+                wm.draw_bordered_box(kernel, draw_x, draw_y, box_w, box_h, light_yellow, color, color)
+            elif (col, row) in MARKED_CELLS:
+                wm.draw_bordered_box(kernel, draw_x, draw_y, box_w, box_h, dark_green, color, color)
+            else:
+                wm.draw_filled_box(kernel, draw_x, draw_y, box_w, box_h, color, color)
+    
+    for color, piece_set in all_pieces.items():
+        for char, positions in piece_set.items():
+            for col, row in positions:
+                square_color = white if (row + col) % 2 == 0 else grey
+                piece_color = square_color if color == 'white' else 0x0000
+                wm.draw_text(kernel, start_x + col * box_w + (box_w - 1) // 2, start_y + row * box_h + (box_h - 1) // 2, char, piece_color, 0, transparent_bg=True)
+
+def draw_scene(wm, kernel, all_pieces, all_pieces_map, player_col, player_row, is_in_check, menu_open=False, board_view=None):
+    white, grey = (0x0070 if menu_open else 0x00F0), 0x0080
+    colors = (white, grey, 0x0020, 0x0080 if menu_open else 0x00E0, 0x00C0, 0x00A0)
+    if board_view is None:
+        draw_board(wm, kernel, all_pieces, all_pieces_map, player_col, player_row, is_in_check, colors)
+    else:
+        board_view.draw(kernel, all_pieces_map, (player_col, player_row), MARKED_CELLS, POSSIBLE_MOVES, [], colors)
+    
+    box_w, box_h, start_x, start_y = board_layout(kernel.width, kernel.height)
+    wm.draw_bordered_box(kernel, start_x - box_w * 2 - box_w // 2 - 5, start_y + 4 * box_h, box_w * 2, box_h, grey, grey, grey)
+    wm.draw_text(kernel, start_x - box_w * 2 - box_w // 2 - 5 + (box_w * 2 - 12) // 2, start_y + 4 * box_h + box_h // 2, "CB Mode: OFF", grey, 0, transparent_bg=True)
+    
+    white_bar_height = int(8 * box_h * (calculate_material_advantage(all_pieces, is_in_check, all_pieces_map) + 1) / 2)
+    wm.draw_filled_box(kernel, start_x - 5, start_y + 8 * box_h - white_bar_height, 3, white_bar_height, white, white)
+    wm.draw_filled_box(kernel, start_x - 5, start_y, 3, 8 * box_h - white_bar_height, grey, grey)
+    
+    button_x = start_x + 8 * box_w + box_w // 2
+    wm.draw_bordered_box(kernel, button_x, start_y + 4 * box_h, box_w * 2, box_h, grey, grey, grey)
+    wm.draw_text(kernel, button_x + (box_w * 2 - 8) // 2, start_y + 4 * box_h + box_h // 2, "Takeback", grey, 0, transparent_bg=True)
+    wm.draw_text(kernel, (kernel.width - 13) // 2, 1, "White's Turn", white, 0, transparent_bg=True)
+    
+    wm.draw_filled_box(kernel, 1, 1, 20, 3, grey, grey)
+    wm.draw_text(kernel, 2, 1, "Captured by Black:", 0, 0, transparent_bg=True)
+    wm.draw_filled_box(kernel, kernel.width - 20, kernel.height - 4, 20, 3, grey, grey)
+    wm.draw_text(kernel, kernel.width - 19, kernel.height - 4, "Captured by White:", 0, 0, transparent_bg=True)
+    
+    if menu_open:
+        wm.draw_menu(kernel, MENU_OPTIONS, 0)
+
+def measure(width, height, frames, menu_open, cached):
+    kernel = Kernel(width, height, console=False)
+    wm = WindowManager()
+    board_view = BoardView() if cached else None
+    all_pieces, _, _, _ = parse_fen(SCENE_FEN)
+    all_pieces_map = {pos: (char, color) for color, piece_set in all_pieces.items() for char, positions in piece_set.items() for pos in positions}
+    is_in_check = {'white': False, 'black': False}
+    
+    start = time.perf_counter()
+    for frame in range(frames):
+        draw_scene(wm, kernel, all_pieces, all_pieces_map, frame % 8, frame // 8 % 8, is_in_check, menu_open, board_view)
+    build = time.perf_counter() - start
+    
+    kernel.presented = False
+    start = time.perf_counter()
+    for frame in range(frames):
+        draw_scene(wm, kernel, all_pieces, all_pieces_map, frame % 8, frame // 8 % 8, is_in_check, menu_open, board_view)
+        kernel.draw_buffer()
+    present = time.perf_counter() - start
+    return frames / build, frames / present, kernel.total_cells_written / frames
+
+def main(argv):
+    frames = int(argv[0]) if argv else 500
+    
+    print(f"frames: {frames}")
+    for width, height in SIZES:
+        for menu_open in (False, True):
+            for cached in (False, True):
+                build_fps, frame_fps, cells = measure(width, height, frames, menu_open, cached)
+                scene = ('board + menu' if menu_open else 'board') + (', cached' if cached else '')
+                print(f"{width:3}x{height:<3} {scene:21} build {build_fps:8,.0f} fps  build + diff {frame_fps:8,.0f} fps  {cells:7,.0f} cells written per frame")
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
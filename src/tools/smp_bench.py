@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+from ..ai.engine import iterative_deepening
+from ..ai.smp import HelperPool
+from ..ai.zobrist import ZobristHash
+from ..ai.transposition_table import SharedTranspositionTable
+from ..chess.attack import is_square_attacked
+from ..chess.fen import parse_fen, START_FEN
+
+POSITIONS = [
+    START_FEN,
+    'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3',
+    'r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4',
+    'rnbqkb1r/pp2pppp/3p1n2/8/3NP3/8/PPP2PPP/RNBQKB1R w KQkq - 1 5',
+    'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+    'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+    '2r3k1/pp3ppp/4p3/3n4/3P4/P4N2/1P3PPP/2R3K1 b - - 0 25',
+    '8/5pk1/6p1/8/3R4/6P1/5PK1/3r4 w - - 0 40'
+]
+WORKER_COUNTS = [1, 2, 4, 8]
+
+def build_map(all_pieces):
+    return {pos: (piece_char, color) for color, piece_set in all_pieces.items() for piece_char, positions in piece_set.items() for pos in positions}
+
+def in_check(all_pieces):
+    all_pieces_map = build_map(all_pieces)
+    checks = {}
+    for color, king_char in (('white', '♔'), ('black', '♚')):
+        opponent = 'black' if color == 'white' else 'white'
+        checks[color] = is_square_attacked(all_pieces[color][king_char][0], opponent, all_pieces_map)
+    return checks
+
+def available_cpus():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count()
+
+def time_to_depth(workers, depth, size_mb):
+    zobrist_hash = ZobristHash()
+    transposition_table = SharedTranspositionTable(size_mb)
+    helpers = HelperPool(transposition_table, workers - 1) if workers > 1 else None
+    elapsed = []
+    try:
+        for fen in POSITIONS:
+            all_pieces, side_to_move, has_moved, last_move = parse_fen(fen)
+            transposition_table.clear()
+            start = time.perf_counter()
+            iterative_deepening(all_pieces, in_check(all_pieces), zobrist_hash, transposition_table, has_moved, last_move, side_to_move, 3600 * 1000, max_depth=depth, helpers=helpers)
+            elapsed.append(time.perf_counter() - start)
+            if helpers is not None and helpers.last_error:
+                print(helpers.take_error())
+    finally:
+        if helpers is not None:
+            helpers.close()
+        transposition_table.close()
+    return elapsed
+
+def main(argv):
+    depth = int(argv[0]) if argv else 4
+    counts = [int(count) for count in argv[1].split(',')] if len(argv) > 1 else WORKER_COUNTS
+    size_mb = 16
+    
+    cpus = available_cpus()
+    print(f"positions: {len(POSITIONS)}, depth: {depth}, cpus: {cpus}")
+    if cpus < max(counts):
+        print(f"warning: fewer CPUs than search processes; speedups above {cpus} workers are not meaningful here")
+    baseline = None
+    for workers in counts:
+        elapsed = time_to_depth(workers, depth, size_mb)
+        total = sum(elapsed)
+        if baseline is None:
+            baseline = total
+        print(f"workers {workers}: {total:8.2f}s  speedup {baseline / total:5.2f}x")
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
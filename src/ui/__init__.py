@@ -1,3 +1,4 @@
 from .renderer import WindowManager
+from .board_view import BoardView, board_layout
 
-__all__ = ['WindowManager']
\ No newline at end of file
+__all__ = ['WindowManager', 'BoardView', 'board_layout']
\ No newline at end of file
@@ -0,0 +1,119 @@
+from ..core.kernel import Kernel
+from .renderer import WindowManager
+
+BOARD_SQUARES = [(col, row) for row in range(8) for col in range(8)]
+
+def board_layout(width, height):
+    box_h = height // 8
+    box_w = box_h * 2
+    return box_w, box_h, (width - 8 * box_w) // 2, (height - 8 * box_h) // 2
+
+class BoardView:
+    def __init__(self):
+        self.wm = WindowManager()
+        self.static_layers = {}
+        self.layer = None
+        self.layout = None
+        self.key = None
+        self.squares = {}
+        self.cursor = None
+        self.marked = frozenset()
+        self.possible = frozenset()
+        self.checked = frozenset()
+        self.pieces = {}
+        self.squares_drawn = 0
+    
+    def static_layer(self, width, height, colors):
+        key = (width, height, colors[0], colors[1])
+        if key not in self.static_layers:
+            layer = Kernel(width, height, console=False)
+            self.wm.clear_buffers(layer)
+            box_w, box_h, start_x, start_y = board_layout(width, height)
+            for col, row in BOARD_SQUARES:
+                color = colors[0] if (row + col) % 2 == 0 else colors[1]
+                self.wm.draw_filled_box(layer, start_x + col * box_w, start_y + row * box_h, box_w, box_h, color, color)
+            self.static_layers[key] = layer
+        return self.static_layers[key]
+    
+    def square_state(self, square, colors):
+        white, grey, dark_green, light_yellow, red, cursor_highlight = colors
+        base = white if (square[0] + square[1]) % 2 == 0 else grey
+        color = base
+        if square in self.checked:
+            color = red
+        elif square == self.cursor:
+            color = cursor_highlight
+        elif square in self.marked:
+            color = dark_green
+        elif square in self.possible:
+            color = light_yellow
+        
+        border = light_yellow if square in self.possible else dark_green if square in self.marked else None
+        piece = self.pieces.get(square)
+        if piece is None:
+            return color, border, None, None
+        piece_color = color if piece[1] == 'white' or color != base else 0x0000
+        return color, border, piece[0], piece_color
+    
+    def draw_square(self, square, state, static, colors):
+        layer = self.layer
+        box_w, box_h, start_x, start_y = self.layout
+        x, y = start_x + square[0] * box_w, start_y + square[1] * box_h
+        left, right = max(x, 0), min(x + box_w, layer.width)
+        for offset in range(max(y, 0) * layer.width, min(y + box_h, layer.height) * layer.width, layer.width):
+            layer.attribute_view[offset + left:offset + right] = static.attribute_view[offset + left:offset + right]
+            layer.char_view[offset + left:offset + right] = static.char_view[offset + left:offset + right]
+        
+        color, border, glyph, glyph_color = state
+        if border is not None:
+            self.wm.draw_bordered_box(layer, x, y, box_w, box_h, border, color, color)
+        elif color != (colors[0] if (square[0] + square[1]) % 2 == 0 else colors[1]):
+            self.wm.draw_filled_box(layer, x, y, box_w, box_h, color, color)
+        if glyph is not None:
+            self.wm.draw_text(layer, x + (box_w - 1) // 2, y + (box_h - 1) // 2, glyph, glyph_color, 0, transparent_bg=True)
+        self.squares_drawn += 1
+    
+    def dirty_squares(self, all_pieces_map, cursor, marked, possible, checked):
+        dirty = set()
+        if cursor != self.cursor:
+            dirty.update((self.cursor, cursor))
+        if marked != self.marked:
+            dirty.update(marked ^ self.marked)
+        if possible != self.possible:
+            dirty.update(possible ^ self.possible)
+        if checked != self.checked:
+            dirty.update(checked ^ self.checked)
+        if all_pieces_map != self.pieces:
+            dirty.update(square for square in self.pieces.keys() | all_pieces_map.keys() if self.pieces.get(square) != all_pieces_map.get(square))
+        return dirty
+    
+    def draw(self, kernel, all_pieces_map, cursor, marked_cells, possible_moves, checked_kings, colors):
+        marked, possible, checked = frozenset(marked_cells), frozenset(possible_moves), frozenset(checked_kings)
+        static = self.static_layer(kernel.width, kernel.height, colors)
+        key = (kernel.width, kernel.height, colors)
+        if key != self.key:
+            if self.layer is None or (self.layer.width, self.layer.height) != (kernel.width, kernel.height):
+                self.layer = Kernel(kernel.width, kernel.height, console=False)
+            self.layer.attribute_buffer[:] = static.attribute_buffer
+            self.layer.char_buffer[:] = static.char_buffer
+            self.layout = board_layout(kernel.width, kernel.height)
+            self.key = key
+            self.squares = {square: (colors[0] if (square[0] + square[1]) % 2 == 0 else colors[1], None, None, None) for square in BOARD_SQUARES}
+            dirty = BOARD_SQUARES
+        else:
+            dirty = self.dirty_squares(all_pieces_map, cursor, marked, possible, checked)
+        
+        self.cursor, self.marked, self.possible, self.checked = cursor, marked, possible, checked
+        if all_pieces_map != self.pieces:
+            self.pieces = dict(all_pieces_map)
+        
+        for square in dirty:
+            if square not in self.squares:
+                continue
+            state = self.square_state(square, colors)
+            if self.squares[square] != state:
+                self.draw_square(square, state, static, colors)
+                self.squares[square] = state
+        
+        kernel.attribute_buffer[:] = self.layer.attribute_buffer
+        kernel.char_buffer[:] = self.layer.char_buffer
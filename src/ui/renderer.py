@@ -1,43 +1,62 @@
+from array import array
+from ..core.kernel import BLANK_CHAR
+
 class WindowManager:
+    def __init__(self):
+        self.fills = {}
+    
+    def fill(self, value, length):
+        fill = self.fills.get((value, length))
+        if fill is None:
+            fill = self.fills[(value, length)] = array('H', [value]) * length
+        return fill
+    
     def clear_buffers(self, kernel):
-        for r in range(kernel.height):
-            for c in range(kernel.width):
-                kernel.attribute_buffer[r][c] = kernel.background_color
-                kernel.char_buffer[r][c] = ' '
+        kernel.attribute_buffer[:] = self.fill(kernel.background_color, kernel.size)
+        kernel.char_buffer[:] = self.fill(BLANK_CHAR, kernel.size)
 
+    def fill_rect(self, kernel, x, y, width, height, attribute, char=BLANK_CHAR):
+        left, right = max(x, 0), min(x + width, kernel.width)
+        top, bottom = max(y, 0), min(y + height, kernel.height)
+        if left >= right or top >= bottom:
+            return
+        attributes = self.fill(attribute, right - left)
+        chars = self.fill(char, right - left)
+        for offset in range(top * kernel.width, bottom * kernel.width, kernel.width):
+            kernel.attribute_buffer[offset + left:offset + right] = attributes
+            kernel.char_buffer[offset + left:offset + right] = chars
+    
     def draw_text(self, kernel, x, y, text, fg_color, bg_color, transparent_bg=False):
-        for i, char in enumerate(text):
-            if 0 <= x + i < kernel.width and 0 <= y < kernel.height:
-                if transparent_bg:
-                    existing_bg = kernel.attribute_buffer[y][x + i] & 0xFFF0
-                    kernel.attribute_buffer[y][x + i] = fg_color | existing_bg
-                else:
-                    kernel.attribute_buffer[y][x + i] = fg_color | (bg_color << 4)
-                kernel.char_buffer[y][x + i] = char
+        left, right = max(x, 0), min(x + len(text), kernel.width)
+        if not 0 <= y < kernel.height or left >= right:
+            return
+        offset = y * kernel.width
+        if transparent_bg:
+            attributes = kernel.attribute_buffer
+            for i in range(offset + left, offset + right):
+                attributes[i] = fg_color | (attributes[i] & 0xFFF0)
+        else:
+            kernel.attribute_buffer[offset + left:offset + right] = self.fill(fg_color | (bg_color << 4), right - left)
+        kernel.char_buffer[offset + left:offset + right] = array('H', map(ord, text[left - x:right - x]))
     
     def draw_window(self, kernel, x, y, width, height, bg_color):
-        for r in range(height):
-            for c in range(width):
-                if 0 <= x + c < kernel.width and 0 <= y + r < kernel.height:
-                    kernel.attribute_buffer[y + r][x + c] = bg_color
-                    kernel.char_buffer[y + r][x + c] = ' '
+        if width <= 0 or height <= 0:
+            return
+        self.fill_rect(kernel, x, y, width, height, bg_color)
         
-        border_char_map = {'tl': '╔', 'tr': '╗', 'bl': '╚', 'br': '╝', 'h': '═', 'v': '║'}
         border_color = 0x00F0
-        for r in range(height):
-            for c in range(width):
-                if not (0 < c < width - 1 and 0 < r < height - 1):
-                    char = ''
-                    if r == 0 and c == 0: char = border_char_map['tl']
-                    elif r == 0 and c == width - 1: char = border_char_map['tr']
-                    elif r == height - 1 and c == 0: char = border_char_map['bl']
-                    elif r == height - 1 and c == width - 1: char = border_char_map['br']
-                    elif r == 0 or r == height - 1: char = border_char_map['h']
-                    elif c == 0 or c == width - 1: char = border_char_map['v']
-                    
-                    if char and 0 <= x + c < kernel.width and 0 <= y + r < kernel.height:
-                        kernel.attribute_buffer[y + r][x + c] = border_color
-                        kernel.char_buffer[y + r][x + c] = char
+        self.fill_rect(kernel, x, y + 1, 1, height - 2, border_color, ord('║'))
+        if width > 1:
+            self.fill_rect(kernel, x + width - 1, y + 1, 1, height - 2, border_color, ord('║'))
+        
+        if width > 1:
+            self.draw_text(kernel, x, y, '╔' + '═' * (width - 2) + '╗', border_color, 0)
+            if height > 1:
+                self.draw_text(kernel, x, y + height - 1, '╚' + '═' * (width - 2) + '╝', border_color, 0)
+        else:
+            self.draw_text(kernel, x, y, '╔', border_color, 0)
+            if height > 1:
+                self.draw_text(kernel, x, y + height - 1, '╚', border_color, 0)
 
     def draw_menu(self, kernel, options, selection, title=None):
         menu_width = max(len(o) for o in options) + 6
@@ -74,15 +93,9 @@ class WindowManager:
             self.draw_text(kernel, text_x, line_y, option, fg_color, bg_color)
 
     def draw_filled_box(self, kernel, x, y, width, height, fg_color, bg_color=None):
-        char = ' '
         if bg_color is None:
             bg_color = fg_color
-        
-        for r in range(height):
-            for c in range(width):
-                 if 0 <= x + c < kernel.width and 0 <= y + r < kernel.height:
-                    kernel.attribute_buffer[y + r][x + c] = fg_color | (bg_color << 4)
-                    kernel.char_buffer[y + r][x + c] = char
+        self.fill_rect(kernel, x, y, width, height, fg_color | (bg_color << 4))
 
     def draw_wireframe_box(self, kernel, x, y, width, height, color):
         bg_color = kernel.background_color
@@ -0,0 +1,46 @@
+import random
+import pytest
+from src.ai import ZobristHash, Board
+from src.ai.evaluation import score_pieces
+from src.ai.engine import BOARD_BACKENDS
+from src.chess.fen import parse_fen, START_FEN
+
+ZOBRIST = ZobristHash()
+NOT_IN_CHECK = {'white': False, 'black': False}
+GAME_FENS = [
+    START_FEN,
+    'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+    'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1'
+]
+
+def full_scores(board):
+    if isinstance(board, Board):
+        return score_pieces(board.all_pieces)
+    return board.score_pieces()
+
+def assert_matches_recompute(board):
+    assert (board.midgame, board.endgame, board.phase) == full_scores(board)
+    assert board.evaluate(NOT_IN_CHECK) == board.evaluate_full(NOT_IN_CHECK)
+
+@pytest.mark.parametrize('backend', sorted(BOARD_BACKENDS))
+@pytest.mark.parametrize('fen', GAME_FENS)
+def test_incremental_evaluation_matches_recompute(backend, fen):
+    rng = random.Random(7)
+    for _ in range(6):
+        board = BOARD_BACKENDS[backend](*parse_fen(fen), ZOBRIST)
+        played = 0
+        for _ in range(80):
+            moves = board.generate_moves()
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+            played += 1
+            assert_matches_recompute(board)
+        for _ in range(played):
+            board.unmake_move()
+            assert_matches_recompute(board)
+
+@pytest.mark.parametrize('fen', GAME_FENS)
+def test_backends_evaluate_alike(fen):
+    boards = [backend(*parse_fen(fen), ZOBRIST) for backend in BOARD_BACKENDS.values()]
+    assert len({board.evaluate(NOT_IN_CHECK) for board in boards}) == 1
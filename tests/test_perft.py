@@ -0,0 +1,16 @@
+import pytest
+from src.ai import ZobristHash
+from src.ai.engine import BOARD_BACKENDS
+from src.tools.perft import REFERENCE_POSITIONS, perft, load_board
+
+ZOBRIST = ZobristHash()
+MAX_NODES = 10000
+
+@pytest.mark.parametrize('backend', sorted(BOARD_BACKENDS))
+@pytest.mark.parametrize('name, fen, expected', REFERENCE_POSITIONS)
+def test_perft(backend, name, fen, expected):
+    board = load_board(fen, backend, ZOBRIST)
+    for depth, count in enumerate(expected, 1):
+        if count > MAX_NODES:
+            break
+        assert perft(board, depth) == count, (name, depth)
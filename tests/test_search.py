@@ -0,0 +1,62 @@
+import time
+import pytest
+from src.ai import ZobristHash, TranspositionTable
+from src.ai.engine import BOARD_BACKENDS, iterative_deepening
+from src.ai.minimax import negamax, MATE, INFINITY
+from src.chess.fen import parse_fen, START_FEN
+from src.tools.perft import move_name
+
+ZOBRIST = ZobristHash()
+NOT_IN_CHECK = {'white': False, 'black': False}
+MIDDLEGAME_FEN = 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10'
+
+MATE_IN_ONE = [
+    ('rnbqkbnr/pppp1ppp/8/4p3/6P1/5P2/PPPPP2P/RNBQKBNR b KQkq g3 0 2', 'd8h4'),
+    ('6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1', 'a1a8'),
+    ('r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 2 3', 'f3f7'),
+    ('7k/8/6K1/8/8/8/8/R7 w - - 0 1', 'a1a8')
+]
+
+def search(fen, time_limit_ms, backend='bitboard', transposition_table=None, **kwargs):
+    all_pieces, side_to_move, has_moved, last_move = parse_fen(fen)
+    if transposition_table is None:
+        transposition_table = TranspositionTable(size_mb=1)
+    stats = {}
+    move = iterative_deepening(all_pieces, NOT_IN_CHECK, ZOBRIST, transposition_table, has_moved, last_move, side_to_move, time_limit_ms, backend=backend, stats=stats, **kwargs)
+    return move, stats
+
+@pytest.mark.parametrize('backend', sorted(BOARD_BACKENDS))
+def test_completes_each_depth_up_to_max_depth(backend):
+    move, stats = search(START_FEN, 60000, backend, max_depth=3)
+    assert stats['depth'] == 3
+    assert len(stats['depth_times']) == 3
+    assert stats['depth_times'] == sorted(stats['depth_times'])
+    assert move in BOARD_BACKENDS[backend](*parse_fen(START_FEN), ZOBRIST).generate_moves()
+
+def test_returns_a_legal_move_within_the_time_budget():
+    start = time.perf_counter()
+    move, stats = search(MIDDLEGAME_FEN, 200)
+    elapsed = time.perf_counter() - start
+    assert move in BOARD_BACKENDS['bitboard'](*parse_fen(MIDDLEGAME_FEN), ZOBRIST).generate_moves()
+    assert stats['depth'] >= 1
+    assert elapsed < 1.0
+
+def test_root_best_move_is_left_in_the_transposition_table():
+    transposition_table = TranspositionTable(size_mb=1)
+    move, _ = search(MIDDLEGAME_FEN, 60000, transposition_table=transposition_table, max_depth=3)
+    board = BOARD_BACKENDS['bitboard'](*parse_fen(MIDDLEGAME_FEN), ZOBRIST)
+    assert transposition_table.probe(board.hash, 0, -999999, 999999)[1] == move
+
+@pytest.mark.parametrize('backend', sorted(BOARD_BACKENDS))
+@pytest.mark.parametrize('fen, expected', MATE_IN_ONE)
+def test_finds_mate_in_one(backend, fen, expected):
+    move, stats = search(fen, 10000, backend, max_depth=3)
+    assert move_name(move) == expected
+    assert stats['score'] == MATE - 1
+
+@pytest.mark.parametrize('backend', sorted(BOARD_BACKENDS))
+@pytest.mark.parametrize('fen, expected', [('Q6k/8/6K1/8/8/8/8/8 b - - 0 1', -MATE), ('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1', 0)])
+def test_scores_checkmate_and_stalemate(backend, fen, expected):
+    board = BOARD_BACKENDS[backend](*parse_fen(fen), ZOBRIST)
+    score, pv = negamax(board, 2, -INFINITY, INFINITY, NOT_IN_CHECK, [0], float('inf'), TranspositionTable(size_mb=1))
+    assert (score, pv) == (expected, [])
@@ -0,0 +1,68 @@
+import random
+import pytest
+from src.ai import Board, BitBoard, ZobristHash
+from src.chess.fen import parse_fen, START_FEN
+
+ZOBRIST = ZobristHash()
+NO_CASTLING = {key: True for key in ('white_king', 'black_king', 'white_rook_a', 'white_rook_h', 'black_rook_a', 'black_rook_h')}
+NO_LAST_MOVE = {'piece': None, 'start': None, 'end': None, 'turn': 0}
+PIECE_KINDS = {'white': ['♙', '♘', '♗', '♖', '♕'], 'black': ['♟', '♞', '♝', '♜', '♛']}
+
+SEE_CASES = [
+    ('8/8/4k3/3p4/8/1B6/8/3R2K1 w - - 0 1', ((3, 7), (3, 3), '♖'), 100),
+    ('8/8/4k3/3p4/8/8/8/3R2K1 w - - 0 1', ((3, 7), (3, 3), '♖'), -400),
+    ('8/8/4k3/3p4/8/8/3R4/3R2K1 w - - 0 1', ((3, 6), (3, 3), '♖'), 100),
+    ('1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1', ((4, 7), (4, 3), '♖'), 100),
+    ('1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1', ((3, 5), (4, 3), '♘'), -200),
+    ('4k3/8/8/3q4/4P3/8/8/4K3 w - - 0 1', ((4, 4), (3, 3), '♙'), 900),
+    ('q7/6rb/4Q1Q1/7K/2Q3r1/4r2k/B1n1Q1r1/3b1r1B w - - 0 1', ((2, 4), (6, 4), '♕'), 100),
+    ('q7/6rb/4Q1Q1/7K/2Q3r1/4r2k/B1n1Q1r1/3b1r1B w - - 0 1', ((4, 2), (6, 4), '♕'), -300),
+    ('q7/6rb/4Q1Q1/7K/2Q3r1/4r2k/B1n1Q1r1/3b1r1B w - - 0 1', ((6, 2), (6, 4), '♕'), -300)
+]
+
+def random_position(rng):
+    squares = rng.sample([(col, row) for col in range(8) for row in range(8)], rng.randint(8, 22))
+    all_pieces = {color: {piece_char: [] for piece_char in kinds + [king]} for (color, kinds), king in zip(PIECE_KINDS.items(), ('♔', '♚'))}
+    all_pieces['white']['♔'].append(squares[0])
+    all_pieces['black']['♚'].append(squares[1])
+    for square in squares[2:]:
+        color = rng.choice(('white', 'black'))
+        piece_char = rng.choice(PIECE_KINDS[color])
+        if piece_char in ('♙', '♟') and square[1] in (0, 7):
+            piece_char = PIECE_KINDS[color][3]
+        all_pieces[color][piece_char].append(square)
+    return all_pieces
+
+@pytest.mark.parametrize('fen, move, expected', SEE_CASES)
+def test_see_values(fen, move, expected):
+    for backend in (Board, BitBoard):
+        assert backend(*parse_fen(fen), ZOBRIST).see(move) == expected, backend.__name__
+
+def test_backends_agree_on_random_positions():
+    rng = random.Random(3)
+    compared = 0
+    while compared < 2000:
+        all_pieces = random_position(rng)
+        bitboard = BitBoard(all_pieces, 'white', NO_CASTLING, NO_LAST_MOVE, ZOBRIST)
+        black_king = all_pieces['black']['♚'][0]
+        if bitboard.is_square_attacked(black_king[1] * 8 + black_king[0], 0):
+            continue
+        board = Board(all_pieces, 'white', NO_CASTLING, NO_LAST_MOVE, ZOBRIST)
+        for move in bitboard.generate_captures():
+            assert board.see(move) == bitboard.see(move), (all_pieces, move)
+            compared += 1
+
+def test_backends_agree_in_played_games():
+    rng = random.Random(5)
+    for _ in range(4):
+        board = Board(*parse_fen(START_FEN), ZOBRIST)
+        bitboard = BitBoard(*parse_fen(START_FEN), ZOBRIST)
+        for _ in range(60):
+            moves = bitboard.generate_moves()
+            if not moves:
+                break
+            for move in moves:
+                assert board.see(move) == bitboard.see(move), move
+            move = rng.choice(moves)
+            board.make_move(move)
+            bitboard.make_move(move)
@@ -0,0 +1,61 @@
+import pytest
+from src.ai import ZobristHash
+from src.ai.engine import BOARD_BACKENDS
+from src.ai.tablebase import Tablebases, generate_table, write_table, build_order
+from src.chess.fen import parse_fen
+from src.tools.perft import move_name
+
+ZOBRIST = ZobristHash()
+TABLES = ['KQvK', 'KRvK']
+
+TABLEBASE_CASES = [
+    ('Q6k/8/6K1/8/8/8/8/8 b - - 0 1', 1),
+    ('7k/8/6K1/8/8/8/8/1Q6 w - - 0 1', 2),
+    ('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1', 0),
+    ('7k/6Q1/8/8/8/8/8/K7 b - - 0 1', 0),
+    ('q6K/8/6k1/8/8/8/8/8 w - - 0 1', 1),
+    ('R6k/8/6K1/8/8/8/8/8 b - - 0 1', 1),
+    ('7k/8/6K1/8/8/8/8/R7 w - - 0 1', 2),
+    ('7k/6R1/8/8/8/8/8/K7 b - - 0 1', 0),
+    ('8/8/8/8/8/8/1r6/k1K5 w - - 0 1', 15),
+    ('k7/8/8/8/8/8/1r6/2K5 w - - 0 1', 0)
+]
+LONGEST_MATES = {'KQvK': 20, 'KRvK': 32}
+
+@pytest.fixture(scope='module')
+def tablebase_dir(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('tablebases'))
+    for key in build_order(TABLES):
+        tablebases = Tablebases(directory)
+        values = generate_table(key, tablebases)
+        tablebases.close()
+        write_table(directory, key, values)
+    return directory
+
+@pytest.fixture
+def tablebases(tablebase_dir):
+    tablebases = Tablebases(tablebase_dir)
+    yield tablebases
+    tablebases.close()
+
+@pytest.mark.parametrize('fen, expected', TABLEBASE_CASES)
+def test_tablebase_values(tablebases, fen, expected):
+    for backend in BOARD_BACKENDS.values():
+        assert tablebases.probe(backend(*parse_fen(fen), ZOBRIST)) == expected, backend.__name__
+
+@pytest.mark.parametrize('key', TABLES)
+def test_longest_mates(tablebase_dir, key):
+    with open(f"{tablebase_dir}/{key}.tb", 'rb') as f:
+        values = f.read()
+    assert max(values) - 1 == LONGEST_MATES[key]
+
+def test_best_move_mates(tablebases):
+    board = BOARD_BACKENDS['bitboard'](*parse_fen('7k/8/6K1/8/8/8/8/R7 w - - 0 1'), ZOBRIST)
+    assert move_name(tablebases.best_move(board)) == 'a1a8'
+
+def test_build_order_puts_dependencies_first():
+    assert build_order(['KPvK']) == ['KQvK', 'KRvK', 'KPvK']
+
+def test_missing_child_table_raises():
+    with pytest.raises(ValueError, match='needs the KQvK table'):
+        generate_table('KPvK', Tablebases(None))
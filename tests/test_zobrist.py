@@ -0,0 +1,46 @@
+import random
+import pytest
+from src.ai import ZobristHash, Board, BitBoard
+from src.ai.engine import BOARD_BACKENDS
+from src.chess.fen import parse_fen, START_FEN
+
+ZOBRIST = ZobristHash()
+GAME_FENS = [
+    START_FEN,
+    'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+    'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1'
+]
+
+@pytest.mark.parametrize('backend', sorted(BOARD_BACKENDS))
+@pytest.mark.parametrize('fen', GAME_FENS)
+def test_incremental_hash_matches_recompute(backend, fen):
+    rng = random.Random(7)
+    for _ in range(6):
+        board = BOARD_BACKENDS[backend](*parse_fen(fen), ZOBRIST)
+        hashes = [board.hash]
+        for _ in range(80):
+            moves = board.generate_moves()
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+            assert board.hash == board.compute_hash()
+            hashes.append(board.hash)
+        while len(hashes) > 1:
+            board.unmake_move()
+            hashes.pop()
+            assert board.hash == hashes[-1] == board.compute_hash()
+
+@pytest.mark.parametrize('fen', GAME_FENS)
+def test_backends_share_hashes(fen):
+    rng = random.Random(11)
+    board = Board(*parse_fen(fen), ZOBRIST)
+    bitboard = BitBoard(*parse_fen(fen), ZOBRIST)
+    assert board.hash == bitboard.hash == ZOBRIST.compute_hash(*parse_fen(fen))
+    for _ in range(80):
+        moves = bitboard.generate_moves()
+        if not moves:
+            break
+        move = rng.choice(moves)
+        board.make_move(move)
+        bitboard.make_move(move)
+        assert board.hash == bitboard.hash